@@ -1,29 +1,33 @@
 from crewai import Agent, Task, Crew
 from crewai.tools import BaseTool
-from crewai_tools import DirectoryReadTool, FileReadTool, SerperDevTool, ScrapeWebsiteTool
+from crewai_tools import SerperDevTool, ScrapeWebsiteTool
 import os
+from templates import TEMPLATES, classify_practice_size, with_template
+from tone import score
+from crew_memory import MEMORY_BACKEND, with_memory
+from search_cache import cached_search
 from utils import get_openai_api_key, get_serper_api_key
+from llm_cache import chat_model, install_llm_cache
 
 openai_api_key = get_openai_api_key()
 os.environ["OPENAI_MODEL_NAME"] = 'gpt-4-turbo'
 os.environ["SERPER_API_KEY"] = get_serper_api_key()
+# Opt-in completion cache (LLM_CACHE_MODE=read-through / record / replay)
+install_llm_cache()
 
 # —───────────── Define Custom Tools ─────────────—
 class SentimentAnalysisTool(BaseTool):
   name: str ="Sentiment Analysis Tool"
   description: str = ("Checks tone to ensure the email is "
-        "positive, professional, and engaging.")
+        "positive, professional, and engaging. Pass the full email text; returns positivity, "
+        "professionalism and pushiness scores, a pass/revise verdict and the sentences to rework.")
   
   def _run(self, text: str) -> str:
-      # Your custom code tool goes here
-      return "positive"
+      # Local lexicon scoring (tone.py), no extra LLM or network call
+      return score(text).summary()
     
 sentiment_tool = SentimentAnalysisTool()
 
-# Tools to read your instruction files and templates
-directory_read_tool = DirectoryReadTool(directory='./instructions')
-file_read_tool = FileReadTool()
-
 # Scraper that pulls content from all the relevant Sikka pages
 scrape_tool = ScrapeWebsiteTool(
     name="Sikka Website Scraper",
@@ -38,11 +42,13 @@ scrape_tool = ScrapeWebsiteTool(
     ]
 )
 
-search_tool = SerperDevTool()
+# Leads from the same company repeat searches; serve those from the search cache
+search_tool = cached_search(SerperDevTool())
 
 # ────────────── Agents ──────────────
 prospect_profiling_agent = Agent(
     role="Business Development Intelligence Analyst",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal=(
         "Identify and validate key company and decision-maker information "
         "for targeted outreach; when specifics are unavailable, "
@@ -63,6 +69,7 @@ prospect_profiling_agent = Agent(
 
 sikka_web_analysis_agent = Agent(
     role="Market Intelligence Analyst",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Extract, validate, and structure Sikka.ai’s online product and brand intelligence to inform our outreach strategy.",
     backstory=(
         "You are a Senior Market Intelligence Analyst on the Strategy & Insights team at Sikka.ai. "
@@ -77,6 +84,7 @@ sikka_web_analysis_agent = Agent(
 
 email_agent = Agent(
     role="Marketing Communications Manager",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Craft data-driven, personalized email campaigns that align Sikka.ai’s value proposition with each prospect’s needs.",
     backstory=(
         "As Marketing Communications Manager at Sikka.ai, you translate strategic insights into compelling narratives. "
@@ -90,6 +98,15 @@ email_agent = Agent(
 
 # ────────────── Tasks ──────────────
 
+# The instruction templates are parsed once (templates.py); the one matching
+# the dossier's practice size is handed to the email task as soon as
+# profiling finishes, instead of the agent looking it up with file tools
+def attach_template(output) -> None:
+    dossier = getattr(output, "raw", None) or getattr(output, "raw_output", "") or ""
+    template = TEMPLATES[classify_practice_size(dossier)]
+    sikka_outreach_task.description = with_template(sikka_outreach_task.description, template)
+
+
 # 1) Profile the prospect via search
 customer_profiling_task = Task(
     description=(
@@ -111,6 +128,7 @@ customer_profiling_task = Task(
     ),
     tools=[search_tool],
     agent=prospect_profiling_agent,
+    callback=attach_template,
 )
 
 
@@ -134,16 +152,16 @@ sikka_analysis_task = Task(
 # 3) Generate the actual outreach emails
 sikka_outreach_task = Task(
     description=(
-        "From the prospect dossier produced by customer_profiling_task, infer the practice’s scale (solo, group, or enterprise) based on provider count, locations, or other indicators. "
-        "Load the matching template file from `./instructions` (solo_practice.txt, group_practice.txt, or enterprise_practice.txt). "
-        "Then, using that template plus:\n"
+        "Write the outreach emails from the selected outreach template below, which already matches the "
+        "practice’s scale (solo, group, or enterprise) from the prospect dossier produced by customer_profiling_task. "
+        "Using that template plus:\n"
         "  • Prospect dossier (company overview, key decision-makers, recent milestones)\n"
         "  • Sikka.ai summary (from sikka_analysis_task)\n"
         "  • Inputs: {lead_name}, {industry}, {recipient_name}, {recipient_position}, {recent_event}, {core_feature}\n"
         "Populate every placeholder in the template. Ensure each draft:\n"
         "  - Opens with a personalized reference to {recent_event} or a dossier insight\n"
         "  - Weaves in Sikka’s core value proposition in context of the inferred practice size\n"
-        "  - Preserves all section headings and structure from the template file\n"
+        "  - Preserves all section headings and structure from the template\n"
         "  - Concludes with a clear, role-appropriate call to action\n"
         "  - Passes through SentimentAnalysisTool for a positive, on-brand tone"
     ),
@@ -153,12 +171,14 @@ sikka_outreach_task = Task(
         "• All template sections filled with tailored content\n"
         "• Confirmation that tone checks passed"
     ),
-    tools=[directory_read_tool, file_read_tool, sentiment_tool],
+    tools=[sentiment_tool],
+    context=[customer_profiling_task, sikka_analysis_task],
     agent=email_agent,
 )
 
 # ────────────── Crew & Helper ──────────────
-crew = Crew(
+# Memory in a bounded in-process store, one namespace per lead (see crew_memory.py)
+crew = with_memory(Crew(
     agents=[
         prospect_profiling_agent,
         sikka_web_analysis_agent,
@@ -166,8 +186,8 @@ crew = Crew(
     ],
     tasks=[customer_profiling_task, sikka_analysis_task, sikka_outreach_task],
     verbose=True,
-    memory=True
-)
+    memory=MEMORY_BACKEND == "crewai",
+))
 
 def generate_personalized_email(
     lead_name: str,
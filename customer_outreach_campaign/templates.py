@@ -0,0 +1,121 @@
+"""
+Outreach email templates, parsed once and selected in code.
+
+The instruction files (solo_practice.txt, group_practice.txt,
+enterprise_practice.txt) are parsed at import into their sections. The
+practice size is read from the prospect dossier, so the email agent gets the
+matching template in its prompt. It no longer spends tool calls finding and
+reading the file.
+"""
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Tuple
+
+SIZES = ("solo", "group", "enterprise")
+DEFAULT_SIZE = "solo"
+INSTRUCTIONS = Path(__file__).parent / "instructions"
+
+# Marks where a rendered template starts, so it can be replaced on the next run
+MARKER = "Selected outreach template"
+
+
+@dataclass(frozen=True)
+class OutreachTemplate:
+    size: str
+    title: str
+    introduction: str
+    key_points: Tuple[str, ...]
+    message: str
+
+    def render(self) -> str:
+        points = "\n".join(f"- {point}" for point in self.key_points)
+        return (
+            f"{MARKER} ({self.size} practice): {self.title}\n\n"
+            f"Introduction:\n{self.introduction}\n\n"
+            f"Key Points to Address:\n{points}\n\n"
+            f"Template Message (keep its structure and fill every [placeholder]):\n{self.message}"
+        )
+
+
+def parse_template(text: str, size: str) -> OutreachTemplate:
+    """Split an instruction file into its `## title` and `### section` parts."""
+    title = re.search(r"^##\s+(?:\d+\.\s*)?(.+?)\s*$", text, re.M)
+    sections: Dict[str, str] = {}
+    for block in re.split(r"^###\s+", text, flags=re.M)[1:]:
+        heading, _, body = block.partition("\n")
+        sections[heading.strip().lower()] = body.strip()
+    missing = [name for name in ("introduction", "key points to address", "template message") if name not in sections]
+    if missing:
+        raise ValueError(f"{size} template is missing sections: {', '.join(missing)}")
+    message = sections["template message"]
+    # The message sits in a ```text fence, which some files never close
+    message = re.sub(r"^```\w*\s*\n", "", message)
+    message = re.sub(r"\n```\s*$", "", message)
+    key_points = tuple(
+        line.strip()[2:].strip() for line in sections["key points to address"].splitlines() if line.strip().startswith("- ")
+    )
+    return OutreachTemplate(
+        size=size,
+        title=title.group(1) if title else size,
+        introduction=" ".join(sections["introduction"].split()),
+        key_points=key_points,
+        message="\n".join(line.rstrip() for line in message.splitlines()).strip(),
+    )
+
+
+def load_templates(directory: Path = INSTRUCTIONS) -> Dict[str, OutreachTemplate]:
+    return {
+        size: parse_template((directory / f"{size}_practice.txt").read_text(encoding="utf-8"), size) for size in SIZES
+    }
+
+
+# ── Practice size ──────────────────────────────────────────────────
+# The profiling task's expected output lists the choices; dossiers often echo it
+_CHOICES = re.compile(r"\(?`?solo`?,\s*`?group`?,?\s*(?:or|and)\s*`?enterprise`?\)?", re.I)
+_EXPLICIT = re.compile(
+    r"(?:classif\w*|practice size|practice scale|scale)\W{0,4}(?:[^\n]{0,60}?\W)?(solo|group|enterprise)\b", re.I
+)
+_COUNT = re.compile(
+    r"\b(\d{1,4})\+?\s+(?:[a-z-]+\s+){0,2}?"
+    r"(locations|offices|clinics|practices|sites|dentists|providers|doctors|hygienists)\b",
+    re.I,
+)
+_ENTERPRISE_WORDS = re.compile(r"\b(dso|dental (?:service|support) organi[sz]ation|nationwide|enterprise)\b", re.I)
+_GROUP_WORDS = re.compile(r"\b(group practice|multi-(?:location|site|specialty)|several (?:locations|offices))\b", re.I)
+
+
+def classify_practice_size(dossier: str) -> str:
+    """
+    `solo`, `group` or `enterprise` for a prospect dossier: the dossier's own
+    classification if it states one, else location/provider counts, else
+    telling phrases ("DSO", "multi-location"). Defaults to `solo`.
+    """
+    dossier = _CHOICES.sub("", dossier or "")
+    explicit = _EXPLICIT.search(dossier)
+    if explicit:
+        return explicit.group(1).lower()
+    size = None
+    for count, unit in _COUNT.findall(dossier):
+        count, unit = int(count), unit.lower()
+        sites = unit in ("locations", "offices", "clinics", "practices", "sites")
+        if count >= (10 if sites else 20):
+            return "enterprise"
+        if count >= (2 if sites else 3):
+            size = "group"
+    if size:
+        return size
+    if _ENTERPRISE_WORDS.search(dossier):
+        return "enterprise"
+    if _GROUP_WORDS.search(dossier):
+        return "group"
+    return DEFAULT_SIZE
+
+
+def with_template(text: str, template: OutreachTemplate) -> str:
+    """`text` followed by the rendered template, replacing one appended earlier."""
+    base = text.split(f"\n\n{MARKER}", 1)[0]
+    return f"{base}\n\n{template.render()}" if base else template.render()
+
+
+TEMPLATES = load_templates()
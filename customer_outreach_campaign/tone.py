@@ -0,0 +1,204 @@
+"""
+Local tone scoring for outreach drafts: positivity, professionalism, pushiness.
+
+A lexicon and rule model, no network and no model download. Each sentence is
+tokenized and its words, plus multi-word phrases such as "act now", are
+looked up in one weight matrix. Each word or phrase has four columns:
+positive, negative, unprofessional, pushy. A word within four tokens after
+a negation ("not", "without", "don't") swaps its positive and negative
+weights, so "without adding admin burden" reads as positive. Sentence and
+email scores are then sums over that matrix, done with NumPy for a whole
+batch at once:
+
+  positivity       -1..1  tanh of net positive weight per sentence
+  professionalism   0..1  1 / (1 + slang, shouting and "!!" penalties)
+  pushiness         0..1  1 - exp(-pressure phrases)
+
+`score_batch` scores many drafts at once and `score` scores one. Each report
+lists the sentences that made a draft negative, unprofessional or pushy.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+POSITIVE, NEGATIVE, UNPROFESSIONAL, PUSHY = range(4)
+
+_POSITIVE = """
+appreciate benefit benefits best better boost confident congrats congratulations delighted easy effortless
+efficiency efficient enjoy excellence excellent excited glad great grow growth happy help helping helps
+impressive improve improved improves innovation innovative insight insights leading love opportunities
+opportunity outstanding partner partnering pleased recognized reliable robust save saving savings seamless
+seamlessly simple simplify success successful support thank thanks trusted valuable value welcome
+well-deserved
+"""
+_NEGATIVE = """
+bad behind broken burden complicated complexity costly difficult disappointed disappointing error errors
+expensive fail failed failing failure frustrated frustrating frustration hassle lose losing loss losses
+outdated pain painful poor problem problems risk risky slow sorry struggle struggling threat unfortunately
+waste wasted worse worst
+"""
+_UNPROFESSIONAL = """
+btw cool crazy dude gonna gotta guys hey insane kinda lol nope omg sorta stuff super totally wanna ya yeah yep
+"""
+# Strong pressure tactics weigh 1.0, milder urgency 0.5
+_PUSHY = {
+    **dict.fromkeys(
+        (
+            "act now", "buy now", "call now", "order now", "respond now", "sign up now", "don't miss", "do not miss",
+            "limited time", "last chance", "final notice", "only today", "hurry", "once in a lifetime",
+            "before it's too late", "what are you waiting for", "spots left", "exclusive deal", "guaranteed",
+            "guarantee", "risk-free", "no obligation",
+        ),
+        1.0,
+    ),
+    **dict.fromkeys(("urgent", "urgently", "immediately", "must", "deadline", "expires", "asap"), 0.5),
+}
+_NEGATORS = frozenset(
+    "not no never without nor cannot can't don't doesn't didn't won't isn't aren't wasn't shouldn't wouldn't".split()
+)
+# All-caps words that are names, not shouting
+_ACRONYMS = frozenset("API CEO CFO COO CTO DDS DMD DSO EHR HIPAA HR IT KPI PMS ROI SaaS US USA AI".split())
+
+_SENTENCE = re.compile(r"[^.!?\n]+[.!?]*")
+_WORD = re.compile(r"[a-z][a-z'-]*")
+_SHOUTED = re.compile(r"\b[A-Z][A-Z'’-]{2,}\b")
+_PHRASES = re.compile(
+    r"\b(" + "|".join(re.escape(phrase) for phrase in sorted(_PUSHY, key=len, reverse=True) if " " in phrase) + r")\b"
+)
+NEGATION_SCOPE = 4
+NEGATOR = -2
+
+
+def _build_lexicon() -> Tuple[Dict[str, int], np.ndarray]:
+    entries: Dict[str, List[float]] = {}
+    for words, column, weight in (
+        (_POSITIVE.split(), POSITIVE, 1.0),
+        (_NEGATIVE.split(), NEGATIVE, 1.0),
+        (_UNPROFESSIONAL.split(), UNPROFESSIONAL, 1.0),
+    ):
+        for word in words:
+            entries.setdefault(word, [0.0] * 4)[column] = weight
+    for phrase, weight in _PUSHY.items():
+        entries.setdefault(phrase, [0.0] * 4)[PUSHY] = weight
+    vocabulary = {term: i for i, term in enumerate(entries)}
+    return vocabulary, np.array(list(entries.values()), dtype=np.float32)
+
+
+VOCABULARY, WEIGHTS = _build_lexicon()
+# Word -> lexicon row, or NEGATOR; phrases are matched by _PHRASES instead
+_CODES = {**{term: i for term, i in VOCABULARY.items() if " " not in term}, **dict.fromkeys(_NEGATORS, NEGATOR)}
+# Same rows with positive and negative swapped, for negated words
+NEGATED_WEIGHTS = WEIGHTS[:, [NEGATIVE, POSITIVE, UNPROFESSIONAL, PUSHY]]
+
+
+@dataclass
+class FlaggedSentence:
+    text: str
+    reasons: List[str]
+
+
+@dataclass
+class ToneReport:
+    positivity: float
+    professionalism: float
+    pushiness: float
+    flagged: List[FlaggedSentence] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return self.positivity >= 0 and self.professionalism >= 0.6 and self.pushiness < 0.5
+
+    def summary(self) -> str:
+        """Tool-friendly text: the scores, a verdict and any flagged sentences."""
+        lines = [
+            f"Tone: positivity {self.positivity:.2f}, professionalism {self.professionalism:.2f}, "
+            f"pushiness {self.pushiness:.2f} - {'passed' if self.passed else 'needs revision'}."
+        ]
+        lines += [f"- [{', '.join(f.reasons)}] {f.text}" for f in self.flagged]
+        return "\n".join(lines)
+
+
+def _split(texts: Sequence[str]):
+    """Sentences of every text, with their words, phrase hits and rule counts."""
+    sentences: List[str] = []
+    email_of: List[int] = []
+    words: List[str] = []
+    lengths: List[int] = []
+    phrase_rows: List[Tuple[int, int]] = []
+    rules: List[Tuple[int, int]] = []
+    for e, text in enumerate(texts):
+        for match in _SENTENCE.finditer(text or ""):
+            sentence = match.group().strip()
+            lowered = sentence.lower().replace("’", "'")
+            found = _WORD.findall(lowered)
+            if not found:
+                continue
+            s = len(sentences)
+            phrase_rows += [(s, VOCABULARY[phrase]) for phrase in _PHRASES.findall(lowered)]
+            shouted = sum(1 for word in _SHOUTED.findall(sentence) if word not in _ACRONYMS)
+            rules.append((sentence.count("!"), shouted))
+            words += found
+            lengths.append(len(found))
+            email_of.append(e)
+            sentences.append(sentence)
+    return sentences, email_of, words, lengths, phrase_rows, rules
+
+
+def score_batch(texts: Sequence[str]) -> List[ToneReport]:
+    """Score every draft in `texts`; one ToneReport each, in order."""
+    sentences, email_of, words, lengths, phrase_rows, rules = _split(texts)
+    count = len(sentences)
+
+    # Token arrays: lexicon code, sentence, and distance to the last negator
+    codes = np.array([_CODES.get(word, -1) for word in words], dtype=np.int64)
+    sentence_of = np.repeat(np.arange(count), lengths)
+    sentence_start = np.repeat(np.cumsum([0] + lengths)[:-1], lengths)
+    positions = np.arange(len(codes))
+    last_negator = np.maximum.accumulate(np.where(codes == NEGATOR, positions, -1)) if len(codes) else positions
+    negated = (last_negator >= sentence_start) & (positions - last_negator <= NEGATION_SCOPE)
+
+    hits = codes >= 0
+    phrases = np.asarray(phrase_rows, dtype=np.int64).reshape(-1, 2)
+    rows = np.concatenate([
+        np.where(negated[hits][:, None], NEGATED_WEIGHTS[codes[hits]], WEIGHTS[codes[hits]]),
+        WEIGHTS[phrases[:, 1]],
+    ])
+    row_sentence = np.concatenate([sentence_of[hits], phrases[:, 0]])
+    # Sentence x column sums of the lexicon weights
+    features = np.stack(
+        [np.bincount(row_sentence, weights=rows[:, k], minlength=count) for k in range(4)], axis=1
+    )
+    rules_array = np.asarray(rules, dtype=np.float64).reshape(-1, 2)
+    exclamations, shouting = rules_array[:, 0], rules_array[:, 1]
+
+    net = features[:, POSITIVE] - features[:, NEGATIVE]
+    unprofessional = features[:, UNPROFESSIONAL] + 0.5 * np.maximum(exclamations - 1, 0) + 0.5 * shouting
+    # An exclamation mark on a pressure line makes it pushier still
+    pushy = features[:, PUSHY] * (1 + 0.5 * (exclamations > 0))
+
+    # Per-email totals
+    emails = np.asarray(email_of, dtype=np.int64)
+    totals = [np.bincount(emails, weights=column, minlength=len(texts)) for column in (net, unprofessional, pushy)]
+    per_email = np.bincount(emails, minlength=len(texts))
+    positivity = np.tanh(totals[0] / np.sqrt(np.maximum(per_email, 1)))
+    professionalism = 1 / (1 + totals[1])
+    pushiness = 1 - np.exp(-totals[2])
+
+    reports = [
+        ToneReport(round(float(p), 3), round(float(q), 3), round(float(r), 3))
+        for p, q, r in zip(positivity, professionalism, pushiness)
+    ]
+    for s in np.flatnonzero((net < 0) | (unprofessional > 0) | (pushy > 0)):
+        reasons = [
+            reason
+            for reason, hit in (("negative", net[s] < 0), ("unprofessional", unprofessional[s] > 0), ("pushy", pushy[s] > 0))
+            if hit
+        ]
+        reports[email_of[s]].flagged.append(FlaggedSentence(sentences[s], reasons))
+    return reports
+
+
+def score(text: str) -> ToneReport:
+    return score_batch([text])[0]
@@ -0,0 +1,313 @@
+"""
+Bounded in-process vector store for crew memory, one namespace per lead.
+
+crewai's `memory=True` keeps short-term and entity memories in Chroma
+collections shared by every crew in the process, with no size limit and no
+separation between leads. Long-term memories go to a SQLite file. This store
+replaces all three (see crew_memory.py):
+
+  namespaces   each lead's memories are searched only by that lead's runs
+  eviction     a namespace keeps its newest `max_items_per_namespace` items,
+               items older than `ttl_seconds` are dropped, and past
+               `max_items` in total the least recently used namespaces go
+  batching     saves are queued and embedded `batch_size` at a time, or when
+               a search needs them
+  metrics      items, bytes, evictions and search latency (`stats`)
+
+Vectors come from a local hashing embedder by default (content words
+hashed into `dim` buckets), so memory needs no API calls and no
+model download. MEMORY_EMBEDDER=openai uses OpenAI embeddings instead.
+This module doesn't import crewai, so main.py can report the store.
+
+Settings (read by `install_memory`):
+  MEMORY_EMBEDDER                 hashing (default) or openai
+  MEMORY_EMBEDDING_MODEL          text-embedding-3-small (openai embedder)
+  MEMORY_MAX_ITEMS                20000 across all namespaces
+  MEMORY_MAX_ITEMS_PER_NAMESPACE  200
+  MEMORY_TTL_SECONDS              24 hours
+  MEMORY_BATCH_SIZE               16 queued saves per embedding call
+"""
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+KINDS = ("short_term", "entities", "long_term")
+DEFAULT_NAMESPACE = "default"
+
+_TOKEN = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or our that the their "
+    "this to was we were will with you your".split()
+)
+
+
+def namespace_key(value: Any) -> str:
+    """Fold case and whitespace, so "Acme  Dental" and "acme dental" share a namespace."""
+    key = " ".join(str(value or "").casefold().split())
+    return key or DEFAULT_NAMESPACE
+
+
+# ── Embedders ──────────────────────────────────────────────────────
+class HashingEmbedder:
+    """Signed feature hashing of content words, L2-normalized."""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        buckets: List[int] = []
+        for row, text in enumerate(texts):
+            for word in _TOKEN.findall(str(text).casefold()):
+                if word not in _STOPWORDS:
+                    rows.append(row)
+                    buckets.append(zlib.crc32(word.encode("utf-8")))
+        hashed = np.asarray(buckets, dtype=np.int64)
+        # Low bits pick the bucket, bit 31 the sign
+        signs = np.where(hashed & (1 << 31), -1.0, 1.0)
+        flat = np.asarray(rows, dtype=np.int64) * self.dim + hashed % self.dim
+        vectors = np.bincount(flat, weights=signs, minlength=len(texts) * self.dim).reshape(len(texts), self.dim)
+        # Repeated words count sublinearly
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return (vectors / np.maximum(norms, 1e-9)).astype(np.float32)
+
+
+def openai_embedder(model: str = "text-embedding-3-small") -> Callable[[Sequence[str]], np.ndarray]:
+    """Batched OpenAI embeddings (one API call per flushed batch)."""
+    from langchain_openai import OpenAIEmbeddings
+
+    client = OpenAIEmbeddings(model=model)
+
+    def embed(texts: Sequence[str]) -> np.ndarray:
+        vectors = np.asarray(client.embed_documents([str(text) for text in texts]), dtype=np.float32)
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+    return embed
+
+
+# ── Store ──────────────────────────────────────────────────────────
+class _Namespace:
+    __slots__ = ("vectors", "texts", "metadata", "kinds", "stored_at")
+
+    def __init__(self, dim: int):
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.texts: List[str] = []
+        self.metadata: List[Dict[str, Any]] = []
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.stored_at = np.zeros(0, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def keep(self, mask: np.ndarray) -> int:
+        """Drop the items where `mask` is False; returns how many went."""
+        dropped = int(len(mask) - mask.sum())
+        if dropped:
+            self.vectors = self.vectors[mask]
+            self.texts = [text for text, kept in zip(self.texts, mask) if kept]
+            self.metadata = [meta for meta, kept in zip(self.metadata, mask) if kept]
+            self.kinds = self.kinds[mask]
+            self.stored_at = self.stored_at[mask]
+        return dropped
+
+    def nbytes(self) -> int:
+        return self.vectors.nbytes + sum(len(text) for text in self.texts)
+
+
+class VectorMemory:
+    """Namespaced, bounded vector store (see the module docstring)."""
+
+    def __init__(
+        self,
+        embedder: Optional[Callable[[Sequence[str]], np.ndarray]] = None,
+        max_items: int = 20_000,
+        max_items_per_namespace: int = 200,
+        ttl_seconds: float = 24 * 3600,
+        batch_size: int = 16,
+    ):
+        self.embedder = embedder or HashingEmbedder()
+        self.max_items = max_items
+        self.max_items_per_namespace = max_items_per_namespace
+        self.ttl_seconds = ttl_seconds
+        self.batch_size = batch_size
+        self.writes = 0
+        self.embed_batches = 0
+        self.searches = 0
+        self.evictions = {"size": 0, "age": 0, "namespace": 0}
+        self._namespaces: "OrderedDict[str, _Namespace]" = OrderedDict()
+        self._pending: List[tuple] = []
+        self._latencies: deque = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        # One embedding call at a time; saves keep queueing meanwhile
+        self._flush_lock = threading.Lock()
+
+    # ── Writes ─────────────────────────────────────────────────────
+    def add(self, namespace: str, kind: str, text: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Queue a memory; it is embedded with the next batch."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown memory kind {kind!r} (expected one of {', '.join(KINDS)})")
+        with self._lock:
+            self._pending.append((namespace_key(namespace), KINDS.index(kind), str(text), dict(metadata or {}), time.time()))
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Embed and store every queued memory; returns how many were stored."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            vectors = self.embedder([item[2] for item in batch])
+            with self._lock:
+                self.embed_batches += 1
+                self.writes += len(batch)
+                by_namespace: Dict[str, List[int]] = {}
+                for i, item in enumerate(batch):
+                    by_namespace.setdefault(item[0], []).append(i)
+                for key, rows in by_namespace.items():
+                    space = self._namespace(key, vectors.shape[1])
+                    space.vectors = np.vstack([space.vectors, vectors[rows]])
+                    space.texts += [batch[i][2] for i in rows]
+                    space.metadata += [batch[i][3] for i in rows]
+                    space.kinds = np.append(space.kinds, [batch[i][1] for i in rows]).astype(np.int8)
+                    space.stored_at = np.append(space.stored_at, [batch[i][4] for i in rows])
+                    if len(space) > self.max_items_per_namespace:
+                        mask = np.zeros(len(space), dtype=bool)
+                        mask[-self.max_items_per_namespace:] = True
+                        self.evictions["size"] += space.keep(mask)
+                self._evict_namespaces()
+            return len(batch)
+
+    def _namespace(self, key: str, dim: int) -> _Namespace:
+        space = self._namespaces.get(key)
+        if space is None:
+            space = self._namespaces[key] = _Namespace(dim)
+        self._namespaces.move_to_end(key)
+        return space
+
+    def _evict_namespaces(self) -> None:
+        total = sum(len(space) for space in self._namespaces.values())
+        while total > self.max_items and len(self._namespaces) > 1:
+            _, space = self._namespaces.popitem(last=False)
+            total -= len(space)
+            self.evictions["namespace"] += len(space)
+
+    def _expire(self, space: _Namespace, now: float) -> None:
+        if self.ttl_seconds and len(space):
+            self.evictions["age"] += space.keep(space.stored_at >= now - self.ttl_seconds)
+
+    # ── Reads ──────────────────────────────────────────────────────
+    def search(
+        self, namespace: str, kind: str, query: str, limit: int = 3, score_threshold: float = 0.35
+    ) -> List[Dict[str, Any]]:
+        """
+        The `limit` most similar `kind` memories of `namespace`, best first, as
+        crewai's RAG storage returns them: {"context", "metadata": {..., "score"}}.
+        """
+        started = time.perf_counter()
+        self.flush()
+        query_vector = self.embedder([query])[0]
+        with self._lock:
+            space = self._namespaces.get(namespace_key(namespace))
+            results = []
+            if space is not None:
+                self._namespaces.move_to_end(namespace_key(namespace))
+                self._expire(space, time.time())
+                rows = np.flatnonzero(space.kinds == KINDS.index(kind))
+                if len(rows):
+                    scores = space.vectors[rows] @ query_vector
+                    top = np.argsort(-scores)[:limit]
+                    results = [
+                        {"context": space.texts[rows[i]], "metadata": {**space.metadata[rows[i]], "score": float(scores[i])}}
+                        for i in top
+                        if scores[i] >= score_threshold
+                    ]
+            self.searches += 1
+            self._latencies.append(time.perf_counter() - started)
+        return results
+
+    def recent(self, namespace: str, kind: str, text: str, latest_n: int) -> List[Dict[str, Any]]:
+        """The newest `latest_n` `kind` memories of `namespace` stored under exactly `text`."""
+        self.flush()
+        with self._lock:
+            space = self._namespaces.get(namespace_key(namespace))
+            if space is None:
+                return []
+            self._namespaces.move_to_end(namespace_key(namespace))
+            self._expire(space, time.time())
+            rows = [
+                i for i in range(len(space) - 1, -1, -1) if space.kinds[i] == KINDS.index(kind) and space.texts[i] == text
+            ]
+            return [dict(space.metadata[i]) for i in rows[:latest_n]]
+
+    def drop(self, namespace: str) -> int:
+        """Forget a namespace; returns how many items it held."""
+        self.flush()
+        with self._lock:
+            space = self._namespaces.pop(namespace_key(namespace), None)
+            return len(space) if space is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            return {
+                "namespaces": len(self._namespaces),
+                "items": sum(len(space) for space in self._namespaces.values()),
+                "bytes": sum(space.nbytes() for space in self._namespaces.values()),
+                "pending": len(self._pending),
+                "writes": self.writes,
+                "embed_batches": self.embed_batches,
+                "searches": self.searches,
+                "search_ms_p50": round(_percentile(latencies, 0.5) * 1000, 3),
+                "search_ms_p95": round(_percentile(latencies, 0.95) * 1000, 3),
+                "evicted_size": self.evictions["size"],
+                "evicted_age": self.evictions["age"],
+                "evicted_namespace": self.evictions["namespace"],
+            }
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, math.ceil(q * len(values)) - 1)]
+
+
+# ── Process-wide store ─────────────────────────────────────────────
+_memory: Optional[VectorMemory] = None
+_install_lock = threading.Lock()
+
+
+def install_memory() -> VectorMemory:
+    """The process-wide store, built from the MEMORY_* settings on first use."""
+    global _memory
+    with _install_lock:
+        if _memory is None:
+            embedder_name = os.getenv("MEMORY_EMBEDDER", "hashing").strip().lower() or "hashing"
+            if embedder_name not in ("hashing", "openai"):
+                raise RuntimeError(f"Unknown MEMORY_EMBEDDER {embedder_name!r} (expected hashing or openai)")
+            _memory = VectorMemory(
+                embedder=(
+                    openai_embedder(os.getenv("MEMORY_EMBEDDING_MODEL", "text-embedding-3-small"))
+                    if embedder_name == "openai"
+                    else HashingEmbedder()
+                ),
+                max_items=int(os.getenv("MEMORY_MAX_ITEMS", 20_000)),
+                max_items_per_namespace=int(os.getenv("MEMORY_MAX_ITEMS_PER_NAMESPACE", 200)),
+                ttl_seconds=float(os.getenv("MEMORY_TTL_SECONDS", 24 * 3600)),
+                batch_size=int(os.getenv("MEMORY_BATCH_SIZE", 16)),
+            )
+        return _memory
+
+
+def memory_stats() -> Optional[Dict[str, Any]]:
+    return _memory.stats() if _memory is not None else None
@@ -0,0 +1,166 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_inquiry(text: str) -> str:
+    """Fold case, punctuation and whitespace so trivially different phrasings share a key."""
+    text = _PUNCTUATION.sub(" ", text.casefold())
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def answer_key(inquiry: str, customer: str = "") -> str:
+    """
+    Cache key for `inquiry` asked by `customer`. The support prompts address
+    the customer by name, so an answer drafted for one is never served to another.
+    """
+    return f"{normalize_inquiry(customer)}\x1f{normalize_inquiry(inquiry)}"
+
+
+# ── Backends ───────────────────────────────────────────────────────
+class MemoryBackend:
+    """LRU dict of key -> (stored_at, value), bounded by `max_entries`."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, stored_at: float, value: str) -> int:
+        with self._lock:
+            self._entries[key] = (stored_at, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskBackend:
+    """SQLite-backed store with the same LRU semantics, so answers survive restarts."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS answers ("
+                " key TEXT PRIMARY KEY, stored_at REAL, accessed_at REAL, value TEXT)"
+            )
+
+    def get(self, key: str) -> Optional[tuple]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE answers SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+            return row
+
+    def set(self, key: str, stored_at: float, value: str) -> int:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?)",
+                (key, stored_at, time.time(), value),
+            )
+            cursor = self._conn.execute(
+                "DELETE FROM answers WHERE key IN ("
+                " SELECT key FROM answers ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            return cursor.rowcount
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+# ── Cache ──────────────────────────────────────────────────────────
+class AnswerCache:
+    """
+    TTL cache of final crew answers keyed on the customer and the normalized
+    inquiry. DiskBackend does SQLite I/O, so async callers should go through
+    `run_in_threadpool`.
+    """
+
+    def __init__(self, backend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, inquiry: str, customer: str = "") -> Optional[str]:
+        key = answer_key(inquiry, customer)
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl_seconds:
+            self.backend.delete(key)
+            self.expired += 1
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, inquiry: str, answer: str, customer: str = "") -> None:
+        self.evictions += self.backend.set(answer_key(inquiry, customer), time.time(), answer)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_answer_cache(backend: str, ttl_seconds: float, max_entries: int, path: str) -> Optional[AnswerCache]:
+    """Return a cache for `backend` ("memory", "disk" or "off")."""
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return AnswerCache(MemoryBackend(max_entries), ttl_seconds)
+    if backend == "disk":
+        return AnswerCache(DiskBackend(path, max_entries), ttl_seconds)
+    raise RuntimeError(f"Unknown answer cache backend {backend!r} (expected memory, disk or off)")
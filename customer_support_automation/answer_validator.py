@@ -0,0 +1,125 @@
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+APOLOGY = "I’m sorry, I couldn’t find that information on the Sikka.ai pages."
+CLOSING = "Do you have any other questions I can help with?"
+SOURCE_PATHS = {"", "/about-us", "/oneapi", "/sikka-prime"}
+
+_GREETING = re.compile(r"^(hi|hello|hey|thanks|thank you|greetings|dear)\b", re.IGNORECASE)
+_PLURAL_VOICE = re.compile(r"\b(we|we're|we’re|our|us|ours)\b", re.IGNORECASE)
+_HEADING = re.compile(r"^(\*\*Key points:\*\*|Key points:)$")
+_SOURCE = re.compile(r"^Source:\s*<?(\S+?)>?$")
+_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'", " ": " "})
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.translate(_QUOTES).casefold().split())
+
+
+@dataclass
+class ValidationResult:
+    violations: List[str] = field(default_factory=list)
+    unverified_bullets: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.violations and not self.unverified_bullets
+
+
+def validate_answer(answer: str, page_texts: Iterable[str]) -> ValidationResult:
+    """
+    Check a draft against the inquiry_resolution template.
+
+    The template is: intro sentence / blank / **Key points:** / 1–5 `- `
+    bullets quoted verbatim from the pages / blank / `Source: <URL>` / blank /
+    the closing question. The "not found" variant starts with the apology.
+    """
+    result = ValidationResult()
+    text = answer.replace("\r\n", "\n").strip().strip('"“”')
+    if text.startswith("```"):
+        result.violations.append("code_fence")
+        return result
+    blocks = [block.strip() for block in re.split(r"\n\s*\n", text) if block.strip()]
+    if len(blocks) < 4:
+        result.violations.append("missing_sections")
+        return result
+
+    intro, closing = blocks[0], blocks[-1]
+    source_block = blocks[-2]
+    body = "\n".join(blocks[1:-2])
+
+    if not _normalize(intro).startswith(_normalize(APOLOGY)):
+        if _GREETING.match(intro):
+            result.violations.append("greeting")
+        if not _PLURAL_VOICE.search(intro):
+            result.violations.append("intro_not_plural")
+        if "\n" in intro:
+            result.violations.append("intro_multiline")
+
+    lines = [line.strip() for line in body.split("\n") if line.strip()]
+    if not lines or not _HEADING.match(lines[0]):
+        result.violations.append("key_points_heading")
+    bullets = [line[2:].strip() for line in lines[1:] if line.startswith("- ")]
+    if len(bullets) != len(lines[1:]):
+        result.violations.append("non_bullet_line")
+    if not 1 <= len(bullets) <= 5:
+        result.violations.append("bullet_count")
+
+    source = _SOURCE.match(source_block)
+    if not source or urlparse(source.group(1)).path.rstrip("/") not in SOURCE_PATHS:
+        result.violations.append("source_line")
+
+    if closing != CLOSING:
+        result.violations.append("closing_question")
+
+    corpus = [_normalize(page) for page in page_texts]
+    for bullet in bullets:
+        quoted = _normalize(bullet.strip('"\'“”‘’ '))
+        candidates = {quoted, quoted.rstrip(".")}
+        if not any(candidate and candidate in page for candidate in candidates for page in corpus):
+            result.unverified_bullets.append(bullet)
+    return result
+
+
+class QAGate:
+    """Decides whether the QA review can be skipped, and counts the decisions."""
+
+    def __init__(self, page_store, enabled: bool = True):
+        self.page_store = page_store
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.skipped = 0
+        self.ran = 0
+        self.violations: Counter = Counter()
+
+    def should_skip(self, draft: Optional[str]) -> bool:
+        if not self.enabled or not draft:
+            with self._lock:
+                self.ran += 1
+            return False
+        pages = [snapshot.text for snapshot in self.page_store.snapshots().values()]
+        result = validate_answer(draft, pages)
+        with self._lock:
+            self.violations.update(result.violations)
+            if result.unverified_bullets:
+                self.violations["unverified_bullet"] += 1
+            if result.ok:
+                self.skipped += 1
+            else:
+                self.ran += 1
+        return result.ok
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decided = self.skipped + self.ran
+            return {
+                "enabled": self.enabled,
+                "skipped": self.skipped,
+                "ran": self.ran,
+                "skip_rate": round(self.skipped / decided, 4) if decided else 0.0,
+                "violations": dict(self.violations),
+            }
@@ -0,0 +1,243 @@
+"""
+OpenAI-compatible stand-in for load tests: no API key, no cost, seeded latency.
+
+Serves the two endpoints the crews call:
+
+  POST /v1/chat/completions   streaming and non-streaming
+  POST /v1/embeddings         deterministic vectors (crew memory)
+
+Each completion sleeps for a time-to-first-token drawn from `--latency` (see
+bench.latency) and then `--token-latency` per streamed token. Answers are
+picked from the agent's role in the prompt ("You are {role}.") so the API's
+parsers and the support QA gate see realistic output; a seeded fraction of
+first steps (`--tool-rate`, decided by a hash of the prompt) call one of the
+agent's tools first.
+
+    python -m bench.fake_openai --port 8767 --latency lognormal:0.8,0.4
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import re
+import struct
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from bench.latency import parse_latency
+
+_ROLE = re.compile(r"You are (.+?)\.")
+_TOOL_NAMES = re.compile(r"only one name of \[(.*?)\]")
+_COWORKERS = re.compile(r"one of the following co-workers: (.+)")
+
+FINAL = "Thought: I now know the final answer\nFinal Answer: "
+
+# Quotes the fixture pages in bench/fixtures/sikka verbatim, so the QA gate
+# can skip the review step just as it does for a well-formed live answer.
+SUPPORT_ANSWER = (
+    "We offer Sikka ONE API as a single API for reading and writing practice management data.\n\n"
+    "**Key points:**\n"
+    "- One integration covers many practice management systems.\n"
+    "- Secure, permission-based access approved by each practice.\n\n"
+    "Source: https://www.sikka.ai/oneapi\n\n"
+    "Do you have any other questions I can help with?"
+)
+
+VENUE = {
+    "name": "Harborview Conference Center",
+    "address": "100 Pier Street",
+    "capacity": 450,
+    "booking_status": "Available",
+}
+
+FILLER = (
+    "Based on the research so far, the plan balances cost, timing and audience fit. "
+    "Each recommendation below is grounded in the available sources and notes any gaps. "
+)
+
+
+def final_answer(role: str, words: int) -> str:
+    """The agent's final answer, chosen by role."""
+    body = " ".join((FILLER * (words // len(FILLER.split()) + 1)).split()[:words])
+    if "Support Specialist" in role or "QA Specialist" in role:
+        return FINAL + SUPPORT_ANSWER
+    if role == "Venue Coordinator":
+        return FINAL + json.dumps(VENUE)
+    if role == "Marketing and Communications Agent":
+        report = f"# Marketing report\n\n{body}\n\n- Email campaign\n- Partner outreach"
+        return FINAL + json.dumps({"venueDetails": VENUE, "marketingReport": report})
+    return FINAL + body
+
+
+def tool_call(prompt: str, role: str, site_url: str) -> Optional[str]:
+    """A first-step Action for one of the agent's tools, if it has any."""
+    names = _TOOL_NAMES.search(prompt)
+    # The scratchpad (earlier Actions and Observations) follows "Begin!"
+    if not names or "Observation" in prompt.rsplit("Begin!", 1)[-1]:
+        return None
+    tools = [name.strip() for name in names.group(1).split(",") if name.strip()]
+    if not tools:
+        return None
+    tool = tools[int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % len(tools)]
+    # crewai describes each tool as "Name(arg: 'type', ...) - description"
+    signature = re.search(re.escape(tool) + r"\((.*?)\) - ", prompt)
+    names = re.findall(r"(\w+):", signature.group(1)) if signature else []
+    arguments: Dict[str, Any] = {
+        name: f"{site_url}/" if "url" in name else f"{role} research" for name in names
+    }
+    coworkers = _COWORKERS.search(prompt)
+    if "coworker" in arguments and coworkers:
+        # Delegation tools only accept a role from the crew
+        roles = [name.strip() for name in coworkers.group(1).strip("[]").split(",") if name.strip()]
+        arguments["coworker"] = roles[int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % len(roles)]
+    return f"Thought: I should gather more information first.\nAction: {tool}\nAction Input: {json.dumps(arguments)}"
+
+
+class FakeOpenAI:
+    def __init__(
+        self,
+        latency: Callable[[], float],
+        token_latency: float,
+        tool_rate: float,
+        words: int,
+        seed: int,
+        site_url: str,
+    ):
+        self.latency = latency
+        self.token_latency = token_latency
+        self.tool_rate = tool_rate
+        self.words = words
+        self.site_url = site_url.rstrip("/")
+        self.seed = seed
+        self.requests = 0
+
+    def completion(self, body: Dict[str, Any]) -> str:
+        messages = body.get("messages") or []
+        prompt = "\n".join(str(message.get("content") or "") for message in messages)
+        role_match = _ROLE.search(prompt)
+        role = role_match.group(1) if role_match else ""
+        self.requests += 1
+        # Decided by the prompt, not arrival order, so runs are reproducible under concurrency
+        draw = int(hashlib.sha256(f"{self.seed}:{prompt}".encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+        if draw < self.tool_rate:
+            action = tool_call(prompt, role, self.site_url)
+            if action:
+                return action
+        return final_answer(role, self.words)
+
+
+def embedding(text: str, dimensions: int = 1536) -> List[float]:
+    rng = random.Random(hashlib.sha256(text.encode()).digest())
+    return [rng.uniform(-1, 1) for _ in range(dimensions)]
+
+
+def handler_for(fake: FakeOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _json(self, payload: Dict[str, Any], status: int = 200) -> None:
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _chunk(self, payload: Any) -> None:
+            data = f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.endswith("/embeddings"):
+                return self._embeddings(body)
+            if self.path.endswith("/chat/completions"):
+                return self._chat(body)
+            self._json({"error": {"message": f"Unknown path {self.path}"}}, status=404)
+
+        def _embeddings(self, body: Dict[str, Any]) -> None:
+            inputs = body.get("input")
+            inputs = inputs if isinstance(inputs, list) else [inputs]
+            data = []
+            for index, text in enumerate(inputs):
+                vector = embedding(str(text))
+                if body.get("encoding_format") == "base64":
+                    vector = base64.b64encode(struct.pack(f"{len(vector)}f", *vector)).decode()
+                data.append({"object": "embedding", "index": index, "embedding": vector})
+            self._json({"object": "list", "data": data, "model": body.get("model"), "usage": {"prompt_tokens": 0, "total_tokens": 0}})
+
+        def _chat(self, body: Dict[str, Any]) -> None:
+            content = fake.completion(body)
+            model = body.get("model", "gpt-3.5-turbo")
+            time.sleep(fake.latency())
+            if not body.get("stream"):
+                prompt_tokens = sum(len(str(m.get("content") or "").split()) for m in body.get("messages", []))
+                completion_tokens = len(content.split())
+                return self._json({
+                    "id": "chatcmpl-bench",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    },
+                })
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            chunk = {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            for index, token in enumerate(re.findall(r"\S+\s*|\s+", content)):
+                if index and fake.token_latency:
+                    time.sleep(fake.token_latency)
+                delta = {"content": token, **({"role": "assistant"} if index == 0 else {})}
+                self._chunk({**chunk, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+            self._chunk({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            self._chunk("[DONE]")
+            self.wfile.write(b"0\r\n\r\n")
+
+    return Handler
+
+
+def serve(port: int, fake: FakeOpenAI) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler_for(fake))
+    server.daemon_threads = True
+    return server
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", default="lognormal:0.8,0.4", help="time to first token, e.g. fixed:0.5")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="seconds per streamed token")
+    parser.add_argument("--tool-rate", type=float, default=0.3, help="share of completions that call a tool first")
+    parser.add_argument("--words", type=int, default=120, help="length of generic final answers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--site-url", default="http://127.0.0.1:8765", help="site the scrape tools are sent to")
+
+
+def from_arguments(args: argparse.Namespace) -> FakeOpenAI:
+    return FakeOpenAI(
+        latency=parse_latency(args.latency, seed=args.seed),
+        token_latency=args.token_latency,
+        tool_rate=args.tool_rate,
+        words=args.words,
+        seed=args.seed,
+        site_url=args.site_url,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8767)
+    add_arguments(parser)
+    args = parser.parse_args()
+    print(f"fake OpenAI on http://127.0.0.1:{args.port}/v1", file=sys.stderr)
+    serve(args.port, from_arguments(args)).serve_forever()
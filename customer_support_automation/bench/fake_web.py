@@ -0,0 +1,103 @@
+"""
+Fake Serper search API and Sikka site for load tests.
+
+  POST /search                 Serper-style organic results (SERPER_SEARCH_URL)
+  GET  /, /about-us, /oneapi,  fixture copies of the Sikka pages in
+       /sikka-prime            bench/fixtures/sikka (SIKKA_BASE_URL)
+  GET  anything else           a small generic page (scrape tools)
+
+    python -m bench.fake_web --port 8765 --latency uniform:0.1,0.4
+"""
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict
+
+from bench.latency import parse_latency
+
+FIXTURES = Path(__file__).parent / "fixtures" / "sikka"
+PAGES: Dict[str, str] = {
+    "/": "index.html",
+    "/about-us": "about-us.html",
+    "/oneapi": "oneapi.html",
+    "/sikka-prime": "sikka-prime.html",
+}
+
+GENERIC_PAGE = (
+    "<html><head><title>{path}</title></head><body><main>"
+    "<h1>{path}</h1><p>Placeholder page served by the offline benchmark suite. "
+    "It lists a venue, a schedule and a short company profile for agents to read.</p>"
+    "</main></body></html>"
+)
+
+
+def search_results(query: str, site_url: str) -> Dict:
+    return {
+        "searchParameters": {"q": query, "type": "search", "engine": "google"},
+        "organic": [
+            {
+                "title": f"{query} — result {position}",
+                "link": f"{site_url}/result-{position}",
+                "snippet": f"Background on {query}, from a fixture search result.",
+                "position": position,
+            }
+            for position in range(1, 6)
+        ],
+    }
+
+
+def handler_for(latency: Callable[[], float], search_latency: Callable[[], float], site_url: str):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, data: bytes, content_type: str, status: int = 200) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            time.sleep(latency())
+            path = self.path.split("?", 1)[0].rstrip("/") or "/"
+            if path in PAGES:
+                return self._send((FIXTURES / PAGES[path]).read_bytes(), "text/html; charset=utf-8")
+            self._send(GENERIC_PAGE.format(path=path).encode(), "text/html; charset=utf-8")
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if not self.path.startswith("/search"):
+                return self._send(b'{"message": "Not found"}', "application/json", status=404)
+            time.sleep(search_latency())
+            self._send(json.dumps(search_results(str(body.get("q", "")), site_url)).encode(), "application/json")
+
+    return Handler
+
+
+def serve(port: int, latency: Callable[[], float], search_latency: Callable[[], float]) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", port), handler_for(latency, search_latency, f"http://127.0.0.1:{port}")
+    )
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="uniform:0.05,0.2", help="page fetch latency")
+    parser.add_argument("--search-latency", default="lognormal:0.4,0.3", help="Serper latency")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(f"fake Serper on http://127.0.0.1:{args.port}/search, site on http://127.0.0.1:{args.port}/", file=sys.stderr)
+    serve(
+        args.port,
+        parse_latency(args.latency, seed=args.seed),
+        parse_latency(args.search_latency, seed=args.seed + 1),
+    ).serve_forever()
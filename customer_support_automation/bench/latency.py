@@ -0,0 +1,40 @@
+"""Seeded latency distributions for the benchmark stand-in servers."""
+import math
+import random
+import threading
+from typing import Callable
+
+
+def parse_latency(spec: str, seed: int = 0) -> Callable[[], float]:
+    """
+    Build a sampler (seconds) from a spec string:
+
+        fixed:0.5            always 0.5s
+        uniform:0.2,1.5      uniform between 0.2s and 1.5s
+        normal:0.8,0.2       mean 0.8s, stddev 0.2s (clipped at 0)
+        lognormal:0.8,0.5    median 0.8s, sigma 0.5 (long right tail, like real LLM APIs)
+        exp:0.8              exponential with mean 0.8s
+    """
+    kind, _, args = spec.partition(":")
+    params = [float(arg) for arg in args.split(",") if arg]
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    if kind == "fixed":
+        draw = lambda: params[0]
+    elif kind == "uniform":
+        draw = lambda: rng.uniform(params[0], params[1])
+    elif kind == "normal":
+        draw = lambda: rng.gauss(params[0], params[1])
+    elif kind == "lognormal":
+        draw = lambda: rng.lognormvariate(math.log(params[0]), params[1])
+    elif kind == "exp":
+        draw = lambda: rng.expovariate(1 / params[0])
+    else:
+        raise ValueError(f"Unknown latency distribution {spec!r}")
+
+    def sample() -> float:
+        with lock:
+            return max(0.0, draw())
+
+    return sample
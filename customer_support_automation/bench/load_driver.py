@@ -0,0 +1,245 @@
+"""
+Load driver for the API routes.
+
+Two scenarios:
+
+  closed  `--concurrency` workers send requests back to back until
+          `--requests` have been sent (fixed concurrency)
+  open    requests arrive as a Poisson process at `--rate` per second for
+          `--duration` seconds, whether or not earlier ones have finished
+          (open loop: queueing shows up as latency and 429s)
+
+The route mix, payloads and arrival times all come from `--seed`, so two runs
+send the same requests in the same order. The report (JSON on stdout) has
+per-route counts, errors by status, latency percentiles and throughput, plus
+the server's /stats before and after.
+
+    python -m bench.load_driver --base-url http://127.0.0.1:8000 \\
+        --mix chat=4,generate-post=1,plan-event=1,outreach-email=1 \\
+        --scenario closed --concurrency 8 --requests 200
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# ── Payloads ───────────────────────────────────────────────────────
+CUSTOMERS = ["Maple Grove Dental", "Bright Smiles Ortho", "Cedar Vet Clinic", "Lakeside Family Dentistry"]
+INQUIRIES = [
+    "What is Sikka ONE API?",
+    "Which practice management systems does ONE API support?",
+    "Tell me about Sikka Prime.",
+    "How does your company protect practice data?",
+    "Does ONE API support writeback for scheduling?",
+]
+TOPICS = ["AI-driven threat detection", "Dental practice analytics", "Healthcare API integrations", "Patient engagement"]
+CITIES = ["San Francisco", "Austin", "Chicago", "Boston"]
+LEADS = [
+    ("Bright Smiles Dental Group", "Dental", "Dr. Ana Ruiz", "Owner"),
+    ("Cedar Veterinary Partners", "Veterinary", "Sam Lee", "Operations Director"),
+    ("Clearview Optometry", "Optometry", "Jordan Patel", "Practice Manager"),
+]
+
+
+def make_payload(route: str, rng: random.Random) -> Dict[str, Any]:
+    if route == "chat":
+        return {"customer": rng.choice(CUSTOMERS), "inquiry": rng.choice(INQUIRIES)}
+    if route == "generate-post":
+        return {"topic": rng.choice(TOPICS)}
+    if route == "plan-event":
+        return {
+            "event_topic": rng.choice(TOPICS),
+            "event_description": "A one-day conference for practice owners and IT leads.",
+            "event_city": rng.choice(CITIES),
+            "tentative_date": "2025-06-15",
+            "expected_participants": rng.choice([50, 150, 400]),
+            "budget": float(rng.choice([10_000, 25_000, 60_000])),
+            "venue_type": rng.choice(["Conference Hall", "Hotel Ballroom"]),
+        }
+    if route == "outreach-email":
+        lead_name, industry, recipient_name, recipient_position = rng.choice(LEADS)
+        return {
+            "lead_name": lead_name,
+            "industry": industry,
+            "recipient_name": recipient_name,
+            "recipient_position": recipient_position,
+            "recent_event": "opened a second location",
+        }
+    raise ValueError(f"Unknown route {route!r}")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        route, _, weight = part.partition("=")
+        weights[route.strip()] = float(weight or 1)
+    return weights
+
+
+def plan_requests(mix: Dict[str, float], count: int, seed: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """The same `count` (route, payload) pairs for the same mix and seed."""
+    rng = random.Random(seed)
+    routes = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    return [(route, make_payload(route, rng)) for route in routes]
+
+
+# ── Running ────────────────────────────────────────────────────────
+Result = Dict[str, Any]
+
+
+async def send(client: httpx.AsyncClient, route: str, payload: Dict[str, Any]) -> Result:
+    sent = time.perf_counter()
+    try:
+        response = await client.post(f"/{route}", json=payload)
+        status = response.status_code
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    return {"route": route, "status": status, "seconds": time.perf_counter() - sent}
+
+
+async def run_closed(client: httpx.AsyncClient, plan: List[Tuple[str, Dict[str, Any]]], concurrency: int) -> List[Result]:
+    queue = list(reversed(plan))
+    results: List[Result] = []
+
+    async def worker() -> None:
+        while queue:
+            route, payload = queue.pop()
+            results.append(await send(client, route, payload))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+async def run_open(client: httpx.AsyncClient, mix: Dict[str, float], rate: float, duration: float, seed: int) -> List[Result]:
+    rng = random.Random(seed)
+    arrivals = []
+    at = rng.expovariate(rate)
+    while at < duration:
+        arrivals.append(at)
+        at += rng.expovariate(rate)
+    plan = plan_requests(mix, len(arrivals), seed)
+    started_at = time.perf_counter()
+
+    async def arrive(at: float, route: str, payload: Dict[str, Any]) -> Result:
+        await asyncio.sleep(max(0.0, started_at + at - time.perf_counter()))
+        return await send(client, route, payload)
+
+    return list(await asyncio.gather(*(arrive(at, *request) for at, request in zip(arrivals, plan))))
+
+
+# ── Report ─────────────────────────────────────────────────────────
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(results: List[Result], wall_seconds: float) -> Dict[str, Any]:
+    ok = [r["seconds"] for r in results if r["status"] == 200]
+    errors = Counter(str(r["status"]) for r in results if r["status"] != 200)
+    return {
+        "requests": len(results),
+        "ok": len(ok),
+        "errors": dict(sorted(errors.items())),
+        "error_rate": round(1 - len(ok) / len(results), 4) if results else 0.0,
+        "throughput_rps": round(len(ok) / wall_seconds, 3) if wall_seconds else 0.0,
+        "latency_seconds": {
+            "p50": _round(percentile(ok, 50)),
+            "p90": _round(percentile(ok, 90)),
+            "p99": _round(percentile(ok, 99)),
+            "max": _round(max(ok) if ok else None),
+            "mean": _round(statistics.fmean(ok) if ok else None),
+        },
+    }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
+
+
+def report(results: List[Result], wall_seconds: float) -> Dict[str, Any]:
+    routes = sorted({r["route"] for r in results})
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "total": summarize(results, wall_seconds),
+        "routes": {route: summarize([r for r in results if r["route"] == route], wall_seconds) for route in routes},
+    }
+
+
+async def run_scenario(
+    base_url: str,
+    mix: Dict[str, float],
+    scenario: str,
+    seed: int = 0,
+    concurrency: int = 4,
+    requests: int = 40,
+    rate: float = 1.0,
+    duration: float = 30.0,
+    timeout: float = 600.0,
+) -> Dict[str, Any]:
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        stats_before = (await client.get("/stats")).json()
+        started = time.perf_counter()
+        if scenario == "closed":
+            results = await run_closed(client, plan_requests(mix, requests, seed), concurrency)
+            params: Dict[str, Any] = {"concurrency": concurrency, "requests": requests}
+        elif scenario == "open":
+            results = await run_open(client, mix, rate, duration, seed)
+            params = {"rate": rate, "duration": duration}
+        else:
+            raise ValueError(f"Unknown scenario {scenario!r} (expected closed or open)")
+        wall_seconds = time.perf_counter() - started
+        stats_after = (await client.get("/stats")).json()
+    return {
+        "scenario": scenario,
+        **params,
+        "mix": mix,
+        "seed": seed,
+        **report(results, wall_seconds),
+        "stats_before": stats_before,
+        "stats_after": stats_after,
+    }
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--mix", default="chat=4,generate-post=1,plan-event=1,outreach-email=1", help="route=weight,...")
+    parser.add_argument("--timeout", type=float, default=600.0, help="per request")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenario", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--rate", type=float, default=1.0, help="open loop: arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="open loop: seconds of arrivals")
+    parser.add_argument("--seed", type=int, default=0)
+    add_arguments(parser)
+    args = parser.parse_args()
+    result = asyncio.run(
+        run_scenario(
+            args.base_url,
+            parse_mix(args.mix),
+            args.scenario,
+            seed=args.seed,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            rate=args.rate,
+            duration=args.duration,
+            timeout=args.timeout,
+        )
+    )
+    print(json.dumps(result["total"]), file=sys.stderr)
+    print(json.dumps(result, indent=2))
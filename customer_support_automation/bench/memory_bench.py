@@ -0,0 +1,94 @@
+"""
+Memory footprint and retrieval latency of the crew memory store (vector_memory.py).
+
+Replays the memory traffic of `--kickoffs` outreach runs spread over
+`--leads` leads. Each task of a run does what crewai does with
+`memory=True`: it searches short-term and entity memory and loads long-term
+memory, then saves its answer, a long-term evaluation and a few entities.
+The bounded store (the MEMORY_* defaults) is compared with an unbounded one
+that keeps everything in one namespace, which is how Chroma and SQLite
+behave; it slows down as it grows, so it only replays the first
+`--unbounded-kickoffs` runs. The report has items, bytes, peak RSS and
+search latency at `--checkpoints` points.
+
+    python -m bench.memory_bench --kickoffs 3000 --leads 400
+"""
+import argparse
+import json
+import random
+import resource
+import sys
+import time
+from typing import Any, Dict, List
+
+from vector_memory import VectorMemory
+
+TASKS = ("profile the prospect", "analyze the Sikka pages", "write the outreach email")
+WORDS = (
+    "practice dental billing claims scheduling recall insurance patients hygiene locations providers revenue "
+    "analytics integration api pms dentrix eaglesoft open dental collections growth onboarding team office "
+    "manager owner expansion acquisition software workflow reporting fee survey benchmark"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def run_kickoff(store: VectorMemory, rng: random.Random, lead: str, namespaced: bool) -> None:
+    namespace = lead if namespaced else "all"
+    for task in TASKS:
+        description = f"{task} for {lead}"
+        store.search(namespace, "short_term", f"{description} {_text(rng, 40)}")
+        store.search(namespace, "entities", f"{description} {_text(rng, 40)}")
+        store.recent(namespace, "long_term", description, 2)
+        store.add(namespace, "short_term", _text(rng, 150), {"observation": description})
+        store.add(namespace, "long_term", description, {"metadata": {"suggestions": [_text(rng, 12)]}, "score": 8})
+        for _ in range(3):
+            store.add(namespace, "entities", f"{lead}(company): {_text(rng, 30)}")
+
+
+def measure(store: VectorMemory, kickoffs: int, leads: int, checkpoints: int, namespaced: bool, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    names = [f"Lead {i}" for i in range(leads)]
+    every = max(1, kickoffs // checkpoints)
+    rows = []
+    started = time.perf_counter()
+    for i in range(1, kickoffs + 1):
+        run_kickoff(store, rng, rng.choice(names), namespaced)
+        if i % every == 0 or i == kickoffs:
+            store.flush()
+            stats = store.stats()
+            rows.append({
+                "kickoffs": i,
+                "items": stats["items"],
+                "store_mb": round(stats["bytes"] / 1e6, 2),
+                # ru_maxrss is in KiB on Linux
+                "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+                "search_ms_p50": stats["search_ms_p50"],
+                "search_ms_p95": stats["search_ms_p95"],
+                "elapsed_s": round(time.perf_counter() - started, 2),
+            })
+            # Latency percentiles per checkpoint, not cumulative
+            store._latencies.clear()
+            print(json.dumps(rows[-1]), file=sys.stderr)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--kickoffs", type=int, default=3000)
+    parser.add_argument("--leads", type=int, default=400)
+    parser.add_argument("--checkpoints", type=int, default=6)
+    parser.add_argument("--unbounded-kickoffs", type=int, default=1000, help="0 skips the unbounded store")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = {"bounded": measure(VectorMemory(), args.kickoffs, args.leads, args.checkpoints, True, args.seed)}
+    if args.unbounded_kickoffs:
+        kickoffs = min(args.kickoffs, args.unbounded_kickoffs)
+        report["unbounded"] = measure(
+            VectorMemory(max_items=10**9, max_items_per_namespace=10**9, ttl_seconds=0),
+            kickoffs, args.leads, max(1, args.checkpoints * kickoffs // args.kickoffs), False, args.seed,
+        )
+    print(json.dumps({"kickoffs": args.kickoffs, "leads": args.leads, **report}, indent=2))
@@ -0,0 +1,165 @@
+"""
+Fuzz and benchmark suite for eventPlanner.output_parser.
+
+Generates marketing-task answers, mangles them the way agents do (fences,
+prose around the JSON, raw newlines and unescaped quotes in the report,
+CRLF, trailing commas, numeric/dict capacity, stringified venueDetails),
+and checks the parser recovers the original fields. Then times the parser
+against the find/rfind + regex approach it replaced.
+
+    python -m bench.plan_event_parser --cases 5000 --seed 7
+"""
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from eventPlanner.output_parser import AgentOutputError, parse_marketing_bundle
+
+WORDS = [
+    "summit", "developers", "OneAPI", "LinkedIn", "ads", "email", "“early-bird”", "tickets",
+    "50%", "off", "C:\\path", "{braces}", "[brackets]", "naïve", "über", "Q&A", "—", "ballroom",
+]
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 12))]
+    if rng.random() < 0.4:
+        i = rng.randrange(len(words))
+        words[i] = f'"{words[i]}"'  # quoted phrase inside the Markdown
+    if rng.random() < 0.2:
+        words.insert(rng.randrange(len(words)), "Key:")
+    return " ".join(words) + rng.choice([".", "!", ":", ""])
+
+
+def make_report(rng: random.Random, paragraphs: int) -> str:
+    lines = ["# Marketing Activities"]
+    for i in range(paragraphs):
+        if i % 4 == 0:
+            lines.append(f"## Section {i // 4 + 1}")
+        lines.append(f"- {_sentence(rng)}")
+    return "\n".join(lines)
+
+
+def make_case(rng: random.Random, paragraphs: int) -> Tuple[Dict, str]:
+    venue = {
+        "name": rng.choice(["Fairmont San Jose", 'The "Grand" Hall', "Signia by Hilton"]),
+        "address": f"{rng.randint(1, 999)} S Market St, San Jose, CA",
+        "capacity": str(rng.randint(50, 2000)),
+        "booking_status": rng.choice(["Available", "Tentative hold", "Booked"]),
+    }
+    report = make_report(rng, paragraphs)
+    expected = {"venueDetails": venue, "marketingReport": report}
+
+    venue_out: object = dict(venue)
+    if rng.random() < 0.3:
+        venue_out["capacity"] = int(venue["capacity"])
+    if rng.random() < 0.15:
+        venue_out = json.dumps(venue_out)
+
+    report_out = json.dumps(report, ensure_ascii=rng.random() < 0.5)
+    raw_report = rng.random() < 0.6
+    if raw_report:
+        report_out = f'"{report}"'  # raw newlines and unescaped quotes
+    pieces = [f'"venueDetails": {json.dumps(venue_out, indent=rng.choice([None, 2]))}', f'"marketingReport": {report_out}']
+    if rng.random() < 0.3:
+        pieces.reverse()
+    body = "{\n  " + ",\n  ".join(pieces) + ("," if rng.random() < 0.2 else "") + "\n}"
+
+    if rng.random() < 0.5:
+        body = f"```json\n{body}\n```"
+    if rng.random() < 0.4:
+        body = "Final Answer: Here is the JSON you asked for.\n" + body
+    if rng.random() < 0.3:
+        body += "\n\nLet me know if you need any changes!"
+    if rng.random() < 0.2:
+        body = body.replace("\n", "\r\n")
+        if raw_report:
+            expected["marketingReport"] = report.replace("\n", "\r\n")
+    return expected, body
+
+
+def legacy_parse(raw: str) -> Dict:
+    """The find/rfind + regex repair /plan-event used before output_parser."""
+    start, end = raw.find("{"), raw.rfind("}")
+    if start == -1 or end == -1:
+        raise ValueError("no JSON")
+    body = raw[start : end + 1]
+    if body.startswith("```"):
+        body = "\n".join(body.splitlines()[1:-1])
+
+    def _escape_report(match):
+        report = match.group(2).replace("\\", "\\\\").replace('"', '\\"')
+        report = report.replace("\r\n", "\\n").replace("\n", "\\n")
+        return f"{match.group(1)}{report}{match.group(3)}"
+
+    body = re.sub(r'("marketingReport"\s*:\s*")([\s\S]*?)(")', _escape_report, body, flags=re.MULTILINE)
+    return json.loads(body)
+
+
+def _matches(expected: Dict, venue: Dict, report: str) -> bool:
+    return venue == expected["venueDetails"] and report.strip() == expected["marketingReport"].strip()
+
+
+def fuzz(cases: int, seed: int) -> Dict[str, int]:
+    rng = random.Random(seed)
+    failures: List[str] = []
+    legacy_ok = 0
+    for _ in range(cases):
+        expected, raw = make_case(rng, rng.randint(1, 12))
+        try:
+            bundle = parse_marketing_bundle(raw)
+            if not _matches(expected, bundle.venueDetails.model_dump(), bundle.marketingReport):
+                failures.append(raw)
+        except AgentOutputError:
+            failures.append(raw)
+        try:
+            data = legacy_parse(raw)
+            venue = data["venueDetails"]
+            venue = {**venue, "capacity": str(venue["capacity"])} if isinstance(venue, dict) else venue
+            legacy_ok += _matches(expected, venue, data["marketingReport"])
+        except Exception:
+            pass
+    for raw in failures[:3]:
+        print("--- failed to recover ---")
+        print(raw[:800])
+    return {"cases": cases, "parser_failures": len(failures), "legacy_recovered": legacy_ok}
+
+
+def _time(fn: Callable[[str], object], raw: str, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(raw)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000
+
+
+def bench(seed: int, repeat: int) -> None:
+    rng = random.Random(seed)
+    print(f"{'report lines':>12} {'bytes':>9} {'parser ms':>10} {'legacy ms':>10} {'tolerant ms':>12}")
+    for paragraphs in (10, 100, 1000, 5000):
+        venue = {"name": "Fairmont", "address": "170 S Market St", "capacity": "1200", "booking_status": "Available"}
+        report = make_report(rng, paragraphs).replace('"', "'")  # keep it parseable by the legacy regex
+        raw = "```json\n" + json.dumps({"venueDetails": venue, "marketingReport": report}, indent=2) + "\n```"
+        # Same report with raw newlines and unescaped quotes: only the tolerant reader handles it
+        quoted = report.replace("'", '"')
+        mangled = f'{{"venueDetails": {json.dumps(venue)}, "marketingReport": "{quoted}"}}'
+        print(
+            f"{paragraphs:>12} {len(raw):>9} "
+            f"{_time(parse_marketing_bundle, raw, repeat):>10.3f} {_time(legacy_parse, raw, repeat):>10.3f} "
+            f"{_time(parse_marketing_bundle, mangled, repeat):>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(fuzz(args.cases, args.seed)))
+    bench(args.seed, args.repeat)
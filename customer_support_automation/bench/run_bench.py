@@ -0,0 +1,144 @@
+"""
+Offline latency benchmark: the API against local stand-ins for OpenAI, Serper
+and the Sikka site, so runs cost nothing and are comparable across changes.
+
+Starts bench.fake_openai and bench.fake_web in-process, a `uvicorn main:app`
+pointed at them (chat and LLM caches off, so every request runs its crew),
+waits for the crew warm-up, then runs each scenario with bench.load_driver:
+
+  closed:N   N concurrent clients, `--requests` requests in total
+  open:R     Poisson arrivals at R requests/second for `--duration` seconds
+
+Run from customer_support_automation/:
+
+    python -m bench.run_bench --scenarios closed:1,closed:8,open:2 --out bench-report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+
+from bench import fake_openai, fake_web, load_driver
+from bench.latency import parse_latency
+from bench.startup_bench import _free_port
+
+
+def start_in_thread(server) -> None:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def start_api(port: int, openai_url: str, web_url: str, timeout: float, extra_env: Dict[str, str]) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OTEL_SDK_DISABLED": "true",
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "bench",
+        "SERPER_API_KEY": os.getenv("SERPER_API_KEY") or "bench",
+        "OPENAI_API_BASE": openai_url,
+        "OPENAI_BASE_URL": openai_url,
+        "SERPER_SEARCH_URL": f"{web_url}/search",
+        "SIKKA_BASE_URL": web_url,
+        "CHAT_CACHE_BACKEND": "off",
+        "LLM_CACHE_MODE": "off",
+        **extra_env,
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,  # verbose crew logs
+    )
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+        try:
+            startup = requests.get(base + "/stats", timeout=5).json()["startup"]
+            if startup.get("warm_seconds") is not None or startup.get("warmup") == "lazy":
+                return proc
+        except requests.RequestException:
+            pass
+        time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"API not warm after {timeout}s")
+
+
+def parse_env(pairs: str) -> Dict[str, str]:
+    return dict(pair.split("=", 1) for pair in pairs.split(",") if pair)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenarios", default="closed:1,closed:4,open:1")
+    parser.add_argument("--requests", type=int, default=40, help="closed loop: requests per scenario")
+    parser.add_argument("--duration", type=float, default=30.0, help="open loop: seconds of arrivals")
+    parser.add_argument("--web-latency", default="uniform:0.05,0.2", help="fake Sikka page latency")
+    parser.add_argument("--search-latency", default="lognormal:0.4,0.3", help="fake Serper latency")
+    parser.add_argument("--api-env", default="", help="extra API settings, e.g. CREW_POOL_SIZE=4,SUPPORT_QA_GATE=off")
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--out", help="write the JSON report here as well as to stdout")
+    fake_openai.add_arguments(parser)
+    load_driver.add_arguments(parser)
+    args = parser.parse_args()
+
+    web_port, openai_port, api_port = _free_port(), _free_port(), _free_port()
+    web_url = f"http://127.0.0.1:{web_port}"
+    openai_url = f"http://127.0.0.1:{openai_port}/v1"
+    args.site_url = web_url
+    start_in_thread(
+        fake_web.serve(
+            web_port,
+            parse_latency(args.web_latency, seed=args.seed),
+            parse_latency(args.search_latency, seed=args.seed + 1),
+        )
+    )
+    start_in_thread(fake_openai.serve(openai_port, fake_openai.from_arguments(args)))
+
+    report: Dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "settings": {
+            key: getattr(args, key)
+            for key in ("latency", "token_latency", "tool_rate", "words", "web_latency", "search_latency", "api_env", "seed")
+        },
+        "scenarios": [],
+    }
+    mix = load_driver.parse_mix(args.mix)
+    api = start_api(api_port, openai_url, web_url, args.startup_timeout, parse_env(args.api_env))
+    try:
+        for spec in args.scenarios.split(","):
+            scenario, _, value = spec.partition(":")
+            options: Dict[str, Any] = (
+                {"concurrency": int(value), "requests": args.requests}
+                if scenario == "closed"
+                else {"rate": float(value), "duration": args.duration}
+            )
+            result = asyncio.run(
+                load_driver.run_scenario(
+                    f"http://127.0.0.1:{api_port}", mix, scenario, seed=args.seed, timeout=args.timeout, **options
+                )
+            )
+            report["scenarios"].append(result)
+            total = result["total"]
+            print(
+                f"{spec:<12} ok {total['ok']:>4}/{total['requests']:<4} {total['throughput_rps']:>7.3f} req/s "
+                f"p50 {total['latency_seconds']['p50']}s p99 {total['latency_seconds']['p99']}s errors {total['errors']}",
+                file=sys.stderr,
+            )
+    finally:
+        api.terminate()
+        api.wait(timeout=30)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    print(output)
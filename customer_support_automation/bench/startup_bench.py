@@ -0,0 +1,118 @@
+"""
+Startup-time benchmark for the API.
+
+1. Import time per module, each measured in a fresh interpreter with
+   `python -X importtime` (cumulative microseconds of the module's own line).
+2. Time until a `uvicorn main:app` process answers GET /, and until its
+   background crew warm-up finishes (from /stats), for each CREW_WARMUP mode.
+
+Run from customer_support_automation/ with the usual .env (or
+OPENAI_API_KEY/SERPER_API_KEY exported):
+
+    python -m bench.startup_bench --repeat 3
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import requests
+
+MODULES = [
+    "main",
+    "sikka_site",
+    "metrics",
+    "customer_support",
+    "linkedin.linkedin_crew",
+    "eventPlanner.planner_crew",
+    "outreach.outreach_crew",
+    "crewai",
+    "crewai_tools",
+]
+
+_IMPORTTIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_seconds(module: str) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "OTEL_SDK_DISABLED": "true"},
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match and match.group(3) == module and not match.group(2):
+            return int(match.group(1)) / 1e6
+    return 0.0  # already imported by the interpreter itself
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_startup(warmup: str, timeout: float) -> Dict[str, Optional[float]]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env={**os.environ, "CREW_WARMUP": warmup, "OTEL_SDK_DISABLED": "true"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    result: Dict[str, Optional[float]] = {"ready_seconds": None, "warm_seconds": None}
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode} (CREW_WARMUP={warmup})")
+            try:
+                if result["ready_seconds"] is None and requests.get(base + "/", timeout=1).ok:
+                    result["ready_seconds"] = round(time.perf_counter() - started, 3)
+                if result["ready_seconds"] is not None:
+                    stats = requests.get(base + "/stats", timeout=5).json()
+                    if warmup == "lazy" or stats["startup"]["warm_seconds"] is not None:
+                        result["warm_seconds"] = round(time.perf_counter() - started, 3)
+                        break
+            except requests.RequestException:
+                pass
+            time.sleep(0.05)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+    return result
+
+
+def _median(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=180.0)
+    parser.add_argument("--modes", default="startup,background,lazy", help="CREW_WARMUP modes to start the server in")
+    parser.add_argument("--skip-server", action="store_true", help="only measure import times")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "repeat": args.repeat, "import_seconds": {}, "server": {}}
+    for module in MODULES:
+        report["import_seconds"][module] = _median([import_seconds(module) for _ in range(args.repeat)])
+        print(f"import {module:<28} {report['import_seconds'][module]:>7.3f}s", file=sys.stderr)
+    if not args.skip_server:
+        for mode in args.modes.split(","):
+            runs = [server_startup(mode, args.timeout) for _ in range(args.repeat)]
+            report["server"][mode] = {key: _median([run[key] for run in runs]) for key in runs[0]}
+            print(f"CREW_WARMUP={mode:<11} {report['server'][mode]}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,85 @@
+"""
+Throughput of the local tone scorer (tone.py).
+
+Scores a seeded corpus of outreach drafts built from the instruction
+templates, with pushy, negative and slangy sentences mixed into some. Each
+batch size is timed `--repeat` times and the median is reported as
+microseconds per email, along with how many drafts passed.
+
+    python -m bench.tone_bench --emails 2000 --batch-sizes 1,10,100,1000
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from outreach.templates import TEMPLATES
+from tone import score_batch
+
+EXTRA_SENTENCES = [
+    "This is a limited time offer, so act now!",
+    "Unfortunately most practices struggle with outdated, frustrating billing.",
+    "Hey guys, this stuff is totally gonna change everything!!!",
+    "We guarantee results and the deadline expires Friday.",
+    "Our customers appreciate the seamless onboarding and reliable support.",
+    "It is not a hassle to get started.",
+]
+
+FILL = {
+    "[Practice Name]": "Maple Grove Dental",
+    "[Organization Name]": "Heartland Dental",
+    "[LastName]": "Chang",
+    "[Recipient Name]": "Dr. Chang",
+    "[Your Name]": "Alex Morgan",
+    "[Title]": "Account Executive",
+    "[X]": "120",
+}
+
+
+def corpus(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    messages = [template.message for template in TEMPLATES.values()]
+    drafts = []
+    for _ in range(count):
+        text = rng.choice(messages)
+        for placeholder, value in FILL.items():
+            text = text.replace(placeholder, value)
+        paragraphs = text.split("\n\n")
+        for sentence in rng.sample(EXTRA_SENTENCES, rng.randint(0, 2)):
+            paragraphs.insert(rng.randint(1, len(paragraphs) - 1), sentence)
+        drafts.append("\n\n".join(paragraphs))
+    return drafts
+
+
+def time_batches(drafts: List[str], batch_size: int) -> float:
+    """Seconds to score every draft, `batch_size` drafts per call."""
+    started = time.perf_counter()
+    for i in range(0, len(drafts), batch_size):
+        score_batch(drafts[i:i + batch_size])
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--batch-sizes", default="1,10,100,1000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    drafts = corpus(args.emails, args.seed)
+    score_batch(drafts[:10])  # warm up NumPy and the regexes
+    report: Dict[str, object] = {
+        "emails": args.emails,
+        "mean_words": round(statistics.mean(len(draft.split()) for draft in drafts), 1),
+        "passed": sum(report.passed for report in score_batch(drafts)),
+        "us_per_email": {},
+    }
+    for batch_size in (int(size) for size in args.batch_sizes.split(",")):
+        seconds = statistics.median(time_batches(drafts, batch_size) for _ in range(args.repeat))
+        report["us_per_email"][batch_size] = round(seconds / len(drafts) * 1e6, 1)
+        print(f"batch {batch_size:>5}  {report['us_per_email'][batch_size]:>8.1f} us/email", file=sys.stderr)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,126 @@
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Iterator, List
+
+Listener = Callable[[Dict[str, Any]], None]
+
+_TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+def _excerpt(text: str, limit: int = 200) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+class EventRelay:
+    """
+    Turns a crew's step/task callbacks into progress events for subscribers.
+
+    crewai 0.28 has no "task started" hook, so the relay tracks the sequential
+    task order itself: `begin()` announces the first task and each finished
+    task announces the next one. A parallel DagCrew announces each task itself
+    through `task_started`. The current task is kept per thread, so steps of
+    overlapping tasks are attributed to the right one.
+    """
+
+    def __init__(self, crew):
+        self._tasks = crew.tasks
+        self._parallel = bool(getattr(crew, "parallel", False))
+        self._local = threading.local()
+        self._listeners: List[Listener] = []
+        self._lock = threading.Lock()
+
+    @property
+    def _current(self) -> int:
+        return getattr(self._local, "task", 0)
+
+    def subscribe(self, listener: Listener) -> Callable[[], None]:
+        with self._lock:
+            self._listeners.append(listener)
+
+        def unsubscribe():
+            with self._lock:
+                if listener in self._listeners:
+                    self._listeners.remove(listener)
+
+        return unsubscribe
+
+    def _emit(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+
+    def _agent_role(self, index: int) -> str:
+        agent = self._tasks[index].agent if index < len(self._tasks) else None
+        return agent.role if agent is not None else "None"
+
+    def task_started(self, index: int) -> None:
+        """Make `index` this thread's current task and announce it."""
+        self._local.task = index
+        if index < len(self._tasks):
+            self._emit({
+                "type": "task_start",
+                "task": index,
+                "agent": self._agent_role(index),
+                "summary": _excerpt(self._tasks[index].description, 120),
+            })
+
+    def begin(self) -> None:
+        """Call from the kickoff thread right before `crew.kickoff`."""
+        if not self._parallel:
+            self.task_started(0)
+
+    def on_step(self, step_output: Any) -> None:
+        event = {"type": "step", "task": self._current, "agent": self._agent_role(self._current)}
+        if isinstance(step_output, list):
+            # [(AgentAction, observation), ...] for a tool-using step
+            for action, observation in step_output:
+                self._emit({
+                    **event,
+                    "tool": getattr(action, "tool", None),
+                    "thought": _excerpt(getattr(action, "log", "").split("Action:")[0]),
+                    "observation_chars": len(str(observation)),
+                })
+        else:
+            # AgentFinish: the agent produced its answer for this task
+            self._emit({**event, "final": True, "thought": _excerpt(getattr(step_output, "log", ""))})
+
+    def on_task(self, task_output: Any) -> None:
+        self._emit({
+            "type": "task_end",
+            "task": self._current,
+            "agent": self._agent_role(self._current),
+            "output_chars": len(getattr(task_output, "raw_output", "") or ""),
+        })
+        if not self._parallel:
+            self.task_started(self._current + 1)
+
+
+def install_relay(crew):
+    """Route every step/task callback of `crew` through a new EventRelay."""
+    relay = EventRelay(crew)
+    crew.step_callback = relay.on_step
+    crew.task_callback = relay.on_task
+    for agent in crew.agents:
+        # kickoff only copies the crew callback onto agents that have none
+        agent.step_callback = relay.on_step
+    if hasattr(crew, "task_start_callback"):
+        crew.task_start_callback = relay.task_started
+    return crew
+
+
+def relay_for(crew) -> EventRelay:
+    """The relay installed on `crew` (its task callback is bound to it)."""
+    return crew.task_callback.__self__
+
+
+# ── SSE helpers ────────────────────────────────────────────────────
+def format_sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def answer_tokens(text: str) -> Iterator[str]:
+    """Split an answer into whitespace-preserving word chunks ("".join restores it)."""
+    return iter(_TOKEN.findall(text))
@@ -0,0 +1,155 @@
+"""
+Plug vector_memory.VectorMemory into a crew's short-term, long-term and entity memory.
+
+`with_memory(crew)` gives a crew built with `memory=False` crewai's memory
+objects backed by the process-wide store instead of Chroma/SQLite. Each
+kickoff works in the namespace of its `lead_name` input, so pooled crews
+never see another lead's memories.
+
+crewai saves long-term and entity memories on a background thread after
+each task, which can finish after the kickoff returned and the pool handed
+the crew to the next lead. Those saves are matched to their kickoff by the
+task description, which has that kickoff's inputs interpolated into it.
+
+MEMORY_BACKEND picks the backend for the crews that use memory:
+  vector   this module (default)
+  crewai   crewai's own Chroma/SQLite memory (`memory=True`)
+  off      no memory
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from crewai.memory import EntityMemory, LongTermMemory, ShortTermMemory
+from crewai.memory.memory import Memory
+from crewai.memory.storage.interface import Storage
+
+from vector_memory import DEFAULT_NAMESPACE, VectorMemory, install_memory, namespace_key
+
+logger = logging.getLogger("uvicorn.error")
+
+BACKENDS = ("vector", "crewai", "off")
+MEMORY_BACKEND = os.getenv("MEMORY_BACKEND", "vector").strip().lower() or "vector"
+if MEMORY_BACKEND not in BACKENDS:
+    raise RuntimeError(f"Unknown MEMORY_BACKEND {MEMORY_BACKEND!r} (expected vector, crewai or off)")
+
+
+class _Binding:
+    """Which namespace a crew's memory saves and searches go to."""
+
+    def __init__(self, max_descriptions: int = 64):
+        self.namespace: Optional[str] = None
+        self._descriptions: "OrderedDict[str, str]" = OrderedDict()
+        self._max_descriptions = max_descriptions
+        # Set by the long-term save, for the entity saves that follow it on the same thread
+        self._thread = threading.local()
+        self._lock = threading.Lock()
+
+    def bind(self, description: str, namespace: str) -> None:
+        with self._lock:
+            self._descriptions[description] = namespace
+            self._descriptions.move_to_end(description)
+            while len(self._descriptions) > self._max_descriptions:
+                self._descriptions.popitem(last=False)
+
+    def for_task(self, description: str) -> str:
+        with self._lock:
+            namespace = self._descriptions.get(description)
+        namespace = namespace or self.current()
+        self._thread.namespace = namespace
+        return namespace
+
+    def current(self) -> str:
+        return getattr(self._thread, "namespace", None) or self.namespace or DEFAULT_NAMESPACE
+
+
+class VectorRAGStorage(Storage):
+    """crewai RAGStorage interface (short-term and entity memory) over the vector store."""
+
+    def __init__(self, store: VectorMemory, kind: str, binding: _Binding):
+        self.store = store
+        self.kind = kind
+        self.binding = binding
+
+    def save(self, value: Any, metadata: Dict[str, Any]) -> None:
+        try:
+            self.store.add(self.binding.current(), self.kind, value, metadata)
+        except Exception:
+            logger.warning("Could not save %s memory", self.kind, exc_info=True)
+
+    def search(
+        self, query: str, limit: int = 3, filter: dict = None, score_threshold: float = 0.35
+    ) -> List[Dict[str, Any]]:
+        try:
+            return self.store.search(self.binding.current(), self.kind, query, limit, score_threshold)
+        except Exception:
+            logger.warning("Could not search %s memory", self.kind, exc_info=True)
+            return []
+
+
+class VectorLTMStorage:
+    """crewai LTMSQLiteStorage interface (long-term memory) over the vector store."""
+
+    def __init__(self, store: VectorMemory, binding: _Binding):
+        self.store = store
+        self.binding = binding
+
+    def save(self, task_description: str, metadata: Dict[str, Any], datetime: str, score: float) -> None:
+        try:
+            self.store.add(
+                self.binding.for_task(task_description),
+                "long_term",
+                task_description,
+                {"metadata": metadata, "datetime": datetime, "score": score},
+            )
+        except Exception:
+            logger.warning("Could not save long-term memory", exc_info=True)
+
+    def load(self, task_description: str, latest_n: int) -> Optional[List[Dict[str, Any]]]:
+        try:
+            rows = self.store.recent(self.binding.current(), "long_term", task_description, latest_n)
+        except Exception:
+            logger.warning("Could not load long-term memory", exc_info=True)
+            return None
+        # Like the SQLite storage: None rather than an empty list
+        return rows or None
+
+
+def _memory(cls, storage) -> Memory:
+    # The memory classes' __init__ builds crewai's own storage; skip it
+    memory = cls.__new__(cls)
+    Memory.__init__(memory, storage)
+    return memory
+
+
+def attach_memory(crew, store: Optional[VectorMemory] = None, namespace_input: str = "lead_name"):
+    """Back `crew`'s memory with `store` (the process-wide one by default), namespaced by `namespace_input`."""
+    store = store or install_memory()
+    binding = _Binding()
+    crew._short_term_memory = _memory(ShortTermMemory, VectorRAGStorage(store, "short_term", binding))
+    crew._entity_memory = _memory(EntityMemory, VectorRAGStorage(store, "entities", binding))
+    crew._long_term_memory = _memory(LongTermMemory, VectorLTMStorage(store, binding))
+    crew.memory = True
+    kickoff = crew.kickoff
+
+    def namespaced_kickoff(inputs: Optional[Dict[str, Any]] = None):
+        inputs = inputs or {}
+        binding.namespace = namespace_key(inputs.get(namespace_input))
+        try:
+            return kickoff(inputs)
+        finally:
+            # kickoff interpolated this run's inputs into the descriptions
+            for task in crew.tasks:
+                binding.bind(task.description, binding.namespace)
+            binding.namespace = None
+
+    # Crew is a pydantic model; bypass field validation
+    object.__setattr__(crew, "kickoff", namespaced_kickoff)
+    return crew
+
+
+def with_memory(crew, namespace_input: str = "lead_name"):
+    """Apply MEMORY_BACKEND "vector" to a crew; build crews with `memory=MEMORY_BACKEND == "crewai"`."""
+    return attach_memory(crew, namespace_input=namespace_input) if MEMORY_BACKEND == "vector" else crew
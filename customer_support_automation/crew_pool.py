@@ -0,0 +1,228 @@
+import asyncio
+import functools
+import logging
+import math
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Optional
+
+import anyio.to_thread
+from anyio import CapacityLimiter
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger("uvicorn.error")
+
+# Crew construction isn't thread-safe (memory-enabled crews initialise
+# embedchain/chromadb/alembic state), so builds from every pool run one at a time.
+_build_lock = threading.Lock()
+
+
+def _build_serialized(factory: Callable[[], Any]):
+    with _build_lock:
+        return factory()
+
+
+class PoolSaturated(Exception):
+    """Raised instead of queueing when a pool's wait queue is full."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"Too many queued requests for {name!r}; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class PoolUnavailable(Exception):
+    """Raised to a queued request when the crew it was waiting for could not be rebuilt."""
+
+    def __init__(self, name: str, retry_after: int):
+        super().__init__(f"No crew available for {name!r}: rebuilding one failed; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+# Put in the idle queue in place of a crew that could not be rebuilt; wakes one waiter
+_BUILD_FAILED = object()
+
+
+class CrewPool:
+    """
+    Bounded pool of independent crew instances for one route.
+
+    crewai interpolates inputs into the task/agent objects in place, so a crew
+    can only serve one kickoff at a time. Each request leases its own instance
+    and hands it back when the kickoff is done; up to `size` instances are
+    built, `prewarm` of them before the first request arrives.
+
+    `size` is also the route's concurrency limit. At most `max_waiting`
+    requests queue for a crew (None = unbounded); beyond that `lease()`
+    raises PoolSaturated. Kickoffs go through `run()`, which uses a thread
+    limiter of its own so one busy route can't exhaust the shared threadpool.
+
+    A crew whose kickoff raised goes back to the pool. One whose kickoff was
+    cancelled (the client went away) may still be running in its worker
+    thread, so it is discarded and rebuilt for the requests waiting on it.
+    The rebuild is retried `rebuild_attempts` times with exponential backoff
+    from `rebuild_backoff` seconds; if every attempt fails, one waiter gets
+    PoolUnavailable instead of waiting forever.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        size: int,
+        prewarm: int = None,
+        max_waiting: Optional[int] = None,
+        rebuild_attempts: int = 3,
+        rebuild_backoff: float = 0.5,
+    ):
+        if size < 1:
+            raise ValueError(f"Pool {name!r} needs at least one crew, got size={size}")
+        self.name = name
+        self.size = size
+        self.prewarm = size if prewarm is None else min(prewarm, size)
+        self.max_waiting = max_waiting
+        self.rebuild_attempts = max(1, rebuild_attempts)
+        self.rebuild_backoff = rebuild_backoff
+        self._factory = factory
+        self._idle: asyncio.Queue = None
+        self._limiter: CapacityLimiter = None
+        self._created = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._leases = 0
+        self._discarded = 0
+        self._rebuild_failures = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._rejected = 0
+        self._busy_total = 0.0
+        self._finished = 0
+
+    def _queue(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue(maxsize=self.size)
+        return self._idle
+
+    async def _build(self):
+        # Reserve the slot before awaiting so concurrent callers can't overshoot `size`
+        self._created += 1
+        try:
+            return await run_in_threadpool(_build_serialized, self._factory)
+        except Exception:
+            self._created -= 1
+            raise
+
+    async def warm(self) -> None:
+        idle = self._queue()
+        while self._created < self.prewarm:
+            idle.put_nowait(await self._build())
+        logger.info("Crew pool %r warmed with %d instance(s)", self.name, self._created)
+
+    async def _replace(self) -> None:
+        """Rebuild a discarded crew for the waiters; on final failure wake one of them with an error."""
+        for attempt in range(self.rebuild_attempts):
+            if attempt:
+                await asyncio.sleep(self.rebuild_backoff * 2 ** (attempt - 1))
+            if not self._waiting:
+                # Everyone left; the next request builds the crew itself
+                return
+            try:
+                self._queue().put_nowait(await self._build())
+                return
+            except Exception as e:
+                self._rebuild_failures += 1
+                logger.error(
+                    "Rebuilding a crew for pool %r failed (attempt %d/%d)",
+                    self.name, attempt + 1, self.rebuild_attempts, exc_info=e,
+                )
+        if self._waiting:
+            self._queue().put_nowait(_BUILD_FAILED)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait: roughly one average lease."""
+        if not self._finished:
+            return 30
+        return min(120, max(1, math.ceil(self._busy_total / self._finished)))
+
+    def check_admission(self) -> None:
+        """Raise PoolSaturated if a lease taken now would overflow the wait queue."""
+        idle = self._queue()
+        if not idle.empty() or self._created < self.size:
+            return
+        if self.max_waiting is not None and self._waiting >= self.max_waiting:
+            self._rejected += 1
+            raise PoolSaturated(self.name, self.retry_after())
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking call (a kickoff) on a worker thread bounded by this pool's size."""
+        if self._limiter is None:
+            self._limiter = CapacityLimiter(self.size)
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args), limiter=self._limiter)
+
+    async def _acquire(self):
+        idle = self._queue()
+        if idle.empty() and self._created < self.size:
+            return await self._build()
+        self.check_admission()
+        self._waiting += 1
+        try:
+            crew = await idle.get()
+        finally:
+            self._waiting -= 1
+        if crew is _BUILD_FAILED:
+            raise PoolUnavailable(self.name, self.retry_after())
+        return crew
+
+    @asynccontextmanager
+    async def lease(self):
+        started = time.perf_counter()
+        crew = await self._acquire()
+        waited = time.perf_counter() - started
+        self._leases += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._in_use += 1
+        leased_at = time.perf_counter()
+        try:
+            yield crew
+        except Exception:
+            # An ordinary kickoff error (LLM/HTTP failure): the kickoff has
+            # returned, so the instance is fine to reuse.
+            self._release(leased_at)
+            self._queue().put_nowait(crew)
+            raise
+        except BaseException:
+            # Cancelled or disconnected: the kickoff may still be running in
+            # its worker thread, so never hand this instance out again.
+            self._release(leased_at)
+            self._created -= 1
+            self._discarded += 1
+            if self._waiting:
+                asyncio.ensure_future(self._replace())
+            raise
+        else:
+            self._release(leased_at)
+            self._queue().put_nowait(crew)
+
+    def _release(self, leased_at: float) -> None:
+        self._in_use -= 1
+        self._busy_total += time.perf_counter() - leased_at
+        self._finished += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._queue().qsize(),
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "max_waiting": self.max_waiting,
+            "rejected": self._rejected,
+            "leases": self._leases,
+            "discarded": self._discarded,
+            "rebuild_failures": self._rebuild_failures,
+            "wait_seconds_total": round(self._wait_total, 6),
+            "wait_seconds_max": round(self._wait_max, 6),
+            "busy_seconds_total": round(self._busy_total, 6),
+            "retry_after_seconds": self.retry_after(),
+        }
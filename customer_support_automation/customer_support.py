@@ -1,90 +1,77 @@
 from crewai import Agent, Task, Crew
-from crewai_tools import ScrapeWebsiteTool, SeleniumScrapingTool
-import os
+from crewai.tasks.task_output import TaskOutput
+from typing import Any, Optional
+from page_tools import PageSearchTool, SnapshotPageTool
+from sikka_site import SUPPORT_RETRIEVAL, SUPPORT_RETRIEVAL_TOP_K, qa_gate, sikka_index, sikka_pages
+from model_routing import llm_for
 from utils import get_openai_api_key
 
 openai_api_key = get_openai_api_key()
-os.environ["OPENAI_MODEL_NAME"] = 'gpt-3.5-turbo'
-
-# ── Agent Definitions ───────────────────────────────────────────────
-
-# Business support specialist: explains Sikka's offerings using marketing copy
-support_agent = Agent(
-    role="Sikka Business Support Specialist",
-    goal=(
-        "Provide concise, accurate explanations of Sikka.ai's services, features, "
-        "and OneAPI value proposition as described on the website, without fabricating details."
-    ),
-    backstory=(
-        "You are the lead business support specialist at Sikka.ai. "
-        "Customers (like {customer}) ask questions about Sikka's offerings, pricing, and use cases "
-        "based solely on the content at https://www.sikka.ai/, https://www.sikka.ai/about-us, "
-        "https://www.sikka.ai/oneapi, and https://www.sikka.ai/sikka-prime. "
-        "Use only the marketing copy and high-level descriptions from those pages. "
-        "If the information is not found, respond: "
-        "‘I’m sorry, I couldn’t find that information on the Sikka.ai pages.’"
-    ),
-    allow_delegation=False,
-    verbose=True
-)
-
-# QA specialist: verifies all business statements match the website content
-support_qa_agent = Agent(
-    role="Sikka Business QA Specialist",
-    goal=(
-        "Ensure each business support response strictly reflects the marketing and product descriptions "
-        "from the Sikka.ai landing, About-Us, OneAPI, and Sikka-Prime pages."
-    ),
-    backstory=(
-        "You are the QA lead for business support at Sikka.ai. "
-        "After the Business Support Specialist drafts an answer for {customer}, "
-        "you review to confirm all feature descriptions, benefits, and claims exactly match "
-        "the content on https://www.sikka.ai/, https://www.sikka.ai/about-us, "
-        "https://www.sikka.ai/oneapi, and https://www.sikka.ai/sikka-prime. "
-        "If any detail cannot be verified, instruct to reply: "
-        "‘I’m sorry, I couldn’t find that information on the Sikka.ai pages.’"
-    ),
-    allow_delegation=False,
-    verbose=True
-)
 
 # ── Tool Definitions ───────────────────────────────────────────────
+# Page tools read the snapshots kept by sikka_site.sikka_pages.
+def _page_tool(page: str, title: str) -> SnapshotPageTool:
+    url = sikka_pages.pages[page]
+    return SnapshotPageTool(
+        store=sikka_pages,
+        page=page,
+        name=f"Read the Sikka.ai {title} page",
+        description=f"A tool that can be used to read {url}'s content.",
+    )
+
 # 1) Root homepage only
-landing_tool = ScrapeWebsiteTool(
-    website_url="https://www.sikka.ai",
-    path_regex=r"^/$",        # only “/”
-    crawl=False
-)
+landing_tool = _page_tool("landing", "landing")
 
 # 2) /about-us only
-about_tool = ScrapeWebsiteTool(
-    website_url="https://www.sikka.ai",
-    path_regex=r"^/about-us$",
-    crawl=False
-)
+about_tool = _page_tool("about", "About-Us")
 
 # 3) /oneapi only
-oneapi_tool = ScrapeWebsiteTool(
-    website_url="https://www.sikka.ai",
-    path_regex=r"^/oneapi$",
-    crawl=False
-)
-prime_tool = ScrapeWebsiteTool(
-    website_url="https://www.sikka.ai",
-    path_regex=r"^/sikka-prime$",
-    crawl=False
-)
+oneapi_tool = _page_tool("oneapi", "OneAPI")
+prime_tool = _page_tool("prime", "Sikka-Prime")
 
 
 # Order matters: more specific tools first
-tools = [prime_tool, oneapi_tool, about_tool, landing_tool]
+page_tools = [prime_tool, oneapi_tool, about_tool, landing_tool]
 
-# ── Task Definitions ───────────────────────────────────────────────
-
-# Task 1: draft a business-focused answer without fences and with real new-lines
-inquiry_resolution = Task(
+# Top-k verbatim passages from all four pages, with their URLs
+search_tool = PageSearchTool(
+    index=sikka_index,
+    top_k=SUPPORT_RETRIEVAL_TOP_K,
+    name="Search the Sikka.ai pages",
     description=(
-        """You are a Sikka.ai live support chat agent.
+        "Returns the passages from the Sikka.ai landing, About-Us, OneAPI and Sikka-Prime "
+        "pages that best match a query, each with its source URL. Quote passages verbatim."
+    ),
+)
+
+# Retrieval keeps whole pages out of the prompt; SUPPORT_RETRIEVAL=off restores the page tools
+tools = [search_tool] if SUPPORT_RETRIEVAL else page_tools
+
+
+# ── QA Gate ────────────────────────────────────────────────────────
+class GatedTask(Task):
+    """
+    A Task that passes its context through unchanged when `gate.should_skip(context)` is true.
+
+    Used for the QA review: a draft that already passes the deterministic
+    checks doesn't need another LLM pass.
+    """
+
+    gate: Optional[Any] = None
+
+    def execute(self, agent=None, context: Optional[str] = None, tools=None) -> str:
+        if self.gate is not None and self.gate.should_skip(context):
+            self.output = TaskOutput(description=self.description, exported_output=context, raw_output=context)
+            if self.callback:
+                self.callback(self.output)
+            return context
+        return super().execute(agent=agent, context=context, tools=tools)
+
+
+# ── Prompt Templates ───────────────────────────────────────────────
+
+# Task 1 prompt; main.py renders it up front to reject requests with missing keys
+INQUIRY_RESOLUTION_DESCRIPTION = """You are a Sikka.ai live support chat agent.
 
         Answer every question using *only* the exact marketing copy and feature names found on these pages:
           • https://www.sikka.ai/
@@ -95,11 +82,14 @@ inquiry_resolution = Task(
         INPUT:
         - customer: {customer}
         - inquiry:  {inquiry}
+        - conversation so far: {conversation}
 
         === HOW TO ANSWER ===
         1. **Understand Intent:** Identify the core concept(s) in the user’s inquiry—even if their wording doesn’t exactly match the site.
-        2. **Find Source Text:** Search _all_ scraped content for any sentence(s) or phrase(s) that define or describe those concepts.  
+          - For a follow-up ("it", "that plan", "tell me more"), resolve what it refers to from the conversation so far.
+        2. **Find Source Text:** Use your tools to search the page content for any sentence(s) or phrase(s) that define or describe those concepts.  
           - You may match synonyms or rephrased versions as long as the meaning aligns.
+          - Passages already retrieved in this conversation can be quoted as they are; search only for what they don't cover.
         3. **If you find ≥1 relevant passage:**
           a. **No greetings or pleasantries:** Start with a plural-voice sentence that directly answers the question.
           b. **Intro:** Write one first-person plural sentence that directly answers the question.  
@@ -121,26 +111,77 @@ inquiry_resolution = Task(
 
         Do you have any other questions I can help with?"
         """
-    ),
-    expected_output=(
-        "A raw Markdown response with:\n"
-        "- One plural-voice intro sentence\n"
-        "- One sentence on why it matters\n"
-        "- **Key points:** + 3–5 verbatim bullets\n"
-        "- A **Use case example** sentence\n"
-        "- A **Source:** line\n"
-        "- The closing question\n"
-        "- Or just the apology if info is missing"
-    ),
-    tools=tools,
-    agent=support_agent,
-)
 
 
-# Task 2: QA review of the Markdown formatting and content
-quality_assurance_review = Task(
-    description=(
-        """You are the QA lead for Sikka.ai live support chat.  
+# ── Crew Factory ───────────────────────────────────────────────────
+def build_crew() -> Crew:
+    """Build an independent support crew (fresh agents and tasks, shared tools)."""
+
+    # Business support specialist: explains Sikka's offerings using marketing copy
+    support_agent = Agent(
+        role="Sikka Business Support Specialist",
+        llm=llm_for("support", "agent"),
+        goal=(
+            "Provide concise, accurate explanations of Sikka.ai's services, features, "
+            "and OneAPI value proposition as described on the website, without fabricating details."
+        ),
+        backstory=(
+            "You are the lead business support specialist at Sikka.ai. "
+            "Customers (like {customer}) ask questions about Sikka's offerings, pricing, and use cases "
+            "based solely on the content at https://www.sikka.ai/, https://www.sikka.ai/about-us, "
+            "https://www.sikka.ai/oneapi, and https://www.sikka.ai/sikka-prime. "
+            "Use only the marketing copy and high-level descriptions from those pages. "
+            "If the information is not found, respond: "
+            "‘I’m sorry, I couldn’t find that information on the Sikka.ai pages.’"
+        ),
+        allow_delegation=False,
+        verbose=True
+    )
+
+    # QA specialist: verifies all business statements match the website content
+    support_qa_agent = Agent(
+        role="Sikka Business QA Specialist",
+        llm=llm_for("support", "qa"),
+        goal=(
+            "Ensure each business support response strictly reflects the marketing and product descriptions "
+            "from the Sikka.ai landing, About-Us, OneAPI, and Sikka-Prime pages."
+        ),
+        backstory=(
+            "You are the QA lead for business support at Sikka.ai. "
+            "After the Business Support Specialist drafts an answer for {customer}, "
+            "you review to confirm all feature descriptions, benefits, and claims exactly match "
+            "the content on https://www.sikka.ai/, https://www.sikka.ai/about-us, "
+            "https://www.sikka.ai/oneapi, and https://www.sikka.ai/sikka-prime. "
+            "If any detail cannot be verified, instruct to reply: "
+            "‘I’m sorry, I couldn’t find that information on the Sikka.ai pages.’"
+        ),
+        allow_delegation=False,
+        verbose=True
+    )
+
+    # Task 1: draft a business-focused answer without fences and with real new-lines
+    inquiry_resolution = Task(
+        description=INQUIRY_RESOLUTION_DESCRIPTION,
+        expected_output=(
+            "A raw Markdown response with:\n"
+            "- One plural-voice intro sentence\n"
+            "- One sentence on why it matters\n"
+            "- **Key points:** + 3–5 verbatim bullets\n"
+            "- A **Use case example** sentence\n"
+            "- A **Source:** line\n"
+            "- The closing question\n"
+            "- Or just the apology if info is missing"
+        ),
+        tools=tools,
+        agent=support_agent,
+    )
+
+
+    # Task 2: QA review of the Markdown formatting and content (skipped when the draft passes qa_gate)
+    quality_assurance_review = GatedTask(
+        gate=qa_gate,
+        description=(
+            """You are the QA lead for Sikka.ai live support chat.  
 Your job is to take the **full** Markdown reply from the Business Support Specialist and make sure it:
 
 1. Follows the template (intro, **Key points:**, bullets, Source line, closing question).  
@@ -151,28 +192,26 @@ Your job is to take the **full** Markdown reply from the Business Support Specia
 **Remove** any bullet point that cannot be verified on the specified pages.  
 **Do not** ever replace the entire reply with an apology—that’s only for the support agent itself.  
 Always return the **complete** corrected response as raw Markdown."""
-    ),
-    expected_output=(
-        "A raw Markdown string containing:\n"
-        "- The original or corrected intro\n"
-        "- A **Key points:** section with only verified bullets\n"
-        "- A correct Source line\n"
-        "- The closing question like Do you have any other questions I can help with?"
-    ),
-    tools=tools,
-    agent=support_qa_agent,
-)
-
+        ),
+        expected_output=(
+            "A raw Markdown string containing:\n"
+            "- The original or corrected intro\n"
+            "- A **Key points:** section with only verified bullets\n"
+            "- A correct Source line\n"
+            "- The closing question like Do you have any other questions I can help with?"
+        ),
+        tools=tools,
+        agent=support_qa_agent,
+    )
+
+    return Crew(
+        agents=[support_agent, support_qa_agent],
+        tasks=[inquiry_resolution, quality_assurance_review],
+        verbose=True,
+        memory=False 
+    )
 
 
-# ── Crew Assembly & Execution ──────────────────────────────────────
-crew = Crew(
-    agents=[support_agent, support_qa_agent],
-    tasks=[inquiry_resolution, quality_assurance_review],
-    verbose=True,
-    memory=False 
-)
-
 # # Sample inquiry input
 # inputs = {
 #     "customer": "AcmeHealth",
@@ -184,7 +223,7 @@ crew = Crew(
 
 # if __name__ == "__main__":
 #     # Kick off the multi-agent workflow and print the result
-#     result = crew.kickoff(inputs=inputs)
+#     result = build_crew().kickoff(inputs=inputs)
 #     print(result)
 
 # - What services does Sikka.ai offer for dental practices?
@@ -0,0 +1,37 @@
+from typing import Any, Callable, Optional
+
+from crewai import Crew
+from crewai.tools.agent_tools import AgentTools
+
+from dag_runner import run_dag
+
+
+class DagCrew(Crew):
+    """
+    A Crew whose tasks can run as a dependency graph (see dag_runner.py).
+
+    With `parallel=True`, tasks run by their `context` declarations and
+    independent ones overlap. The crew's result is still the last task's
+    output. `task_start_callback(index)` is called on the worker thread as each
+    task starts, since crewai has no such hook of its own.
+    """
+
+    parallel: bool = True
+    max_parallel_tasks: int = 4
+    task_start_callback: Optional[Callable[[int], Any]] = None
+    last_run: Optional[Any] = None
+
+    def _run_sequential_process(self) -> str:
+        if not self.parallel:
+            return super()._run_sequential_process()
+        for task in self.tasks:
+            # Same delegation tools the sequential process hands out, once per pooled crew
+            if task.agent.allow_delegation and not getattr(task, "_delegation_tools", False):
+                others = [agent for agent in self.agents if agent != task.agent]
+                if len(self.agents) > 1 and others:
+                    task.tools += AgentTools(agents=others).tools()
+                object.__setattr__(task, "_delegation_tools", True)
+        self.last_run = run_dag(self.tasks, self.max_parallel_tasks, on_start=self.task_start_callback)
+        output = self.tasks[-1].output.raw_output
+        self._finish_execution(output)
+        return self._format_output(output)
@@ -0,0 +1,24 @@
+import json
+from pydantic import BaseModel, field_validator
+
+# Pydantic model for structured output, ensuring capacity is always a string
+default_capacity = "Not specified"
+class VenueDetails(BaseModel):
+    name: str
+    address: str
+    capacity: str = default_capacity
+    booking_status: str
+
+    @field_validator('capacity', mode='before')
+    def ensure_capacity_str(cls, v):
+        # If capacity comes in as dict, serialize to JSON string
+        if isinstance(v, dict):
+            return json.dumps(v)
+        # Otherwise, coerce to string
+        return str(v)
+
+
+# Final output of the marketing task (and the /plan-event response)
+class MarketingBundle(BaseModel):
+    venueDetails: VenueDetails
+    marketingReport: str
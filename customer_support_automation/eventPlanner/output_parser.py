@@ -0,0 +1,218 @@
+"""
+Tolerant parser for the marketing task's final answer.
+
+The agent is asked for a single JSON object with `venueDetails` and
+`marketingReport`, but in practice the output may be wrapped in ```json
+fences, surrounded by prose, contain raw newlines inside strings, or
+unescaped quotes inside the Markdown report. `parse_marketing_bundle` reads
+the first object with json's decoder (raw newlines allowed) and, if that
+fails, with a forward-only recursive-descent reader that accepts all of the
+above. The result is validated with MarketingBundle.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from eventPlanner.models import MarketingBundle
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_WHITESPACE = " \t\r\n"
+_LITERALS = {"true": True, "false": False, "null": None}
+_STRING_SPECIAL = re.compile(r'["\\]')
+# Well-formed JSON (raw control characters allowed) is decoded at C speed; the
+# tolerant reader below only runs when that fails.
+_FAST_DECODER = json.JSONDecoder(strict=False)
+
+
+class AgentOutputError(ValueError):
+    """Raised when the agent output doesn't contain a usable MarketingBundle."""
+
+
+class _Reader:
+    """Lenient JSON reader; `pos` only ever moves forward."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.end = len(text)
+
+    def _skip_ws(self) -> None:
+        text, pos, end = self.text, self.pos, self.end
+        while pos < end and text[pos] in _WHITESPACE:
+            pos += 1
+        self.pos = pos
+
+    def _peek_after_ws(self, pos: int) -> Tuple[str, int]:
+        text, end = self.text, self.end
+        while pos < end and text[pos] in _WHITESPACE:
+            pos += 1
+        return (text[pos] if pos < end else ""), pos
+
+    def value(self) -> Any:
+        self._skip_ws()
+        if self.pos >= self.end:
+            raise AgentOutputError("Unexpected end of agent output")
+        ch = self.text[self.pos]
+        if ch == "{":
+            return self.object()
+        if ch == "[":
+            return self.array()
+        if ch == '"':
+            return self.string()
+        return self.bare()
+
+    def object(self) -> Dict[str, Any]:
+        self.pos += 1  # "{"
+        result: Dict[str, Any] = {}
+        while True:
+            self._skip_ws()
+            if self.pos >= self.end:
+                return result  # truncated output: keep what we have
+            ch = self.text[self.pos]
+            if ch == "}":
+                self.pos += 1
+                return result
+            if ch == ",":
+                self.pos += 1
+                continue
+            key = self.string(is_key=True) if ch == '"' else self.bare_key()
+            self._skip_ws()
+            if self.pos < self.end and self.text[self.pos] == ":":
+                self.pos += 1
+            result[key] = self.value()
+
+    def array(self) -> List[Any]:
+        self.pos += 1  # "["
+        result: List[Any] = []
+        while True:
+            self._skip_ws()
+            if self.pos >= self.end:
+                return result
+            ch = self.text[self.pos]
+            if ch == "]":
+                self.pos += 1
+                return result
+            if ch == ",":
+                self.pos += 1
+                continue
+            result.append(self.value())
+
+    def _closes_string(self, quote_pos: int, is_key: bool) -> bool:
+        # A quote ends the string only if what follows could continue the JSON:
+        # ":" after a key; "}", "]", end of input, or a comma followed by
+        # another key/value after a value.
+        nxt, pos = self._peek_after_ws(quote_pos + 1)
+        if is_key:
+            return nxt == ":"
+        if nxt in ("", "}", "]"):
+            return True
+        if nxt == ",":
+            after, _ = self._peek_after_ws(pos + 1)
+            return after in ('"', "{", "[", "}", "]", "")
+        return False
+
+    def string(self, is_key: bool = False) -> str:
+        text, end = self.text, self.end
+        pos = self.pos + 1  # opening quote
+        parts: List[str] = []
+        chunk_start = pos
+        while pos < end:
+            special = _STRING_SPECIAL.search(text, pos)
+            if special is None:
+                break
+            pos = special.start()
+            ch = text[pos]
+            if ch == "\\":
+                parts.append(text[chunk_start:pos])
+                esc = text[pos + 1] if pos + 1 < end else ""
+                if esc in _ESCAPES:
+                    parts.append(_ESCAPES[esc])
+                    pos += 2
+                elif esc == "u" and pos + 6 <= end:
+                    try:
+                        parts.append(chr(int(text[pos + 2 : pos + 6], 16)))
+                        pos += 6
+                    except ValueError:
+                        parts.append("\\u")
+                        pos += 2
+                else:
+                    parts.append("\\" + esc)  # invalid escape: keep it literally
+                    pos += 2
+                chunk_start = pos
+                continue
+            if ch == '"' and self._closes_string(pos, is_key):
+                parts.append(text[chunk_start:pos])
+                self.pos = pos + 1
+                return "".join(parts)
+            pos += 1  # a stray quote; raw newlines are kept as-is too
+        parts.append(text[chunk_start:end])
+        self.pos = end
+        return "".join(parts)
+
+    def bare_key(self) -> str:
+        start = self.pos
+        while self.pos < self.end and self.text[self.pos] not in ":}" + _WHITESPACE:
+            self.pos += 1
+        return self.text[start : self.pos].strip("'")
+
+    def bare(self) -> Any:
+        start = self.pos
+        while self.pos < self.end and self.text[self.pos] not in ",}]" + _WHITESPACE:
+            self.pos += 1
+        token = self.text[start : self.pos]
+        if token in _LITERALS:
+            return _LITERALS[token]
+        try:
+            return json.loads(token)
+        except ValueError:
+            return token.strip("'")
+
+
+def _strip_fences(text: str) -> str:
+    lines = [line for line in text.strip().splitlines() if not line.strip().startswith("```")]
+    return "\n".join(lines).strip()
+
+
+def extract_json_object(raw: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Read the first JSON object in `raw`.
+
+    Returns the object and the surrounding prose (with code fences removed),
+    which is used as the report when the agent left it outside the JSON.
+    """
+    start = raw.find("{")
+    if start == -1:
+        raise AgentOutputError("No JSON object in agent output")
+    try:
+        data, end = _FAST_DECODER.raw_decode(raw, start)
+    except ValueError:
+        reader = _Reader(raw)
+        reader.pos = start
+        data, end = reader.object(), reader.pos
+    prose = "\n\n".join(part for part in (_strip_fences(raw[:start]), _strip_fences(raw[end:])) if part)
+    return data, prose
+
+
+def parse_marketing_bundle(raw: str) -> MarketingBundle:
+    data, prose = extract_json_object(raw)
+
+    venue: Optional[Any] = data.get("venueDetails")
+    if isinstance(venue, str):
+        venue, _ = extract_json_object(venue)
+    if venue is None and "name" in data:
+        venue = data  # the agent returned the venue object on its own
+    if not isinstance(venue, dict):
+        raise AgentOutputError("Agent output has no venueDetails object")
+
+    report = data.get("marketingReport")
+    if report is None:
+        report = prose
+    elif not isinstance(report, str):
+        report = json.dumps(report, indent=2)
+
+    try:
+        return MarketingBundle(venueDetails=venue, marketingReport=report.strip())
+    except ValidationError as e:
+        raise AgentOutputError(f"Agent output failed validation: {e.errors()[0]['msg']}") from e
@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class JobQueueFull(Exception):
+    """Raised by JobManager.submit when `max_queued` jobs are already waiting."""
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "queued"  # queued -> running -> succeeded | failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    _finished: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobManager:
+    """
+    Runs long crew kickoffs in the background so the HTTP request returns at once.
+
+    At most `max_workers` jobs run concurrently and at most `max_queued` wait
+    for a worker; finished jobs are kept for `ttl_seconds` for polling.
+    """
+
+    def __init__(self, max_workers: int, max_queued: int, ttl_seconds: float):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.ttl_seconds = ttl_seconds
+        self._workers = asyncio.Semaphore(max_workers)
+        self._jobs: Dict[str, Job] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._submitted = 0
+        self._rejected = 0
+
+    def _purge_expired(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        for job_id in [j.id for j in self._jobs.values() if j.done and j.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def _count(self, status: str) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == status)
+
+    def submit(self, kind: str, run: Callable[[], Awaitable[Any]]) -> Job:
+        self._purge_expired()
+        if self._count("queued") >= self.max_queued:
+            self._rejected += 1
+            raise JobQueueFull(f"{self.max_queued} jobs already queued")
+        job = Job(id=uuid.uuid4().hex, kind=kind)
+        self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.ensure_future(self._run(job, run))
+        self._submitted += 1
+        return job
+
+    async def _run(self, job: Job, run: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            async with self._workers:
+                job.status = "running"
+                job.started_at = time.time()
+                try:
+                    job.result = jsonable_encoder(await run())
+                    job.status = "succeeded"
+                except HTTPException as e:
+                    job.error = str(e.detail)
+                    job.status = "failed"
+                except Exception as e:
+                    logger.error("Job %s (%s) failed", job.id, job.kind, exc_info=e)
+                    job.error = "Upstream AI service error"
+                    job.status = "failed"
+        finally:
+            if not job.done:
+                job.error = "Job cancelled"
+                job.status = "failed"
+            job.finished_at = time.time()
+            job._finished.set()
+            self._tasks.pop(job.id, None)
+
+    async def get(self, job_id: str, wait: float = 0) -> Optional[Job]:
+        """Look up a job, optionally long-polling up to `wait` seconds for it to finish."""
+        self._purge_expired()
+        job = self._jobs.get(job_id)
+        if job is not None and wait > 0 and not job.done:
+            try:
+                await asyncio.wait_for(job._finished.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def shutdown(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        self._purge_expired()
+        return {
+            "max_workers": self.max_workers,
+            "max_queued": self.max_queued,
+            "ttl_seconds": self.ttl_seconds,
+            "queued": self._count("queued"),
+            "running": self._count("running"),
+            "retained": len(self._jobs),
+            "submitted": self._submitted,
+            "rejected": self._rejected,
+        }
@@ -0,0 +1,204 @@
+"""
+Content-addressed cache of LLM completions, shared by every crew in the process.
+
+Keys are a SHA-256 of the model's LangChain "llm string" (model name and
+parameters) plus the serialized messages, so any change to the prompt, model,
+temperature or stop words is a different entry. Entries live in SQLite with a
+TTL and are evicted least-recently-used past `max_entries` / `max_bytes`.
+
+Modes (LLM_CACHE_MODE):
+  off           no cache (default)
+  read-through  serve hits, call the LLM on a miss and store the result
+  record        always call the LLM, store every result (refreshes the cache)
+  replay        serve hits only; a miss raises CacheMissError (CI, benchmarks)
+
+crewai's agents stream their completions, and LangChain's `stream()` skips
+the global cache, so crews must use `CachedChatOpenAI` (via `chat_model`)
+for their calls to be cached.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache, set_llm_cache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk
+from langchain_openai import ChatOpenAI
+
+MODES = ("off", "read-through", "record", "replay")
+
+
+class CacheMissError(RuntimeError):
+    """Raised in replay mode when a completion isn't in the cache."""
+
+
+def completion_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class CompletionCache(BaseCache):
+    """LangChain cache backed by SQLite (see the module docstring for the modes)."""
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "read-through",
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10_000,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        if mode not in MODES or mode == "off":
+            raise ValueError(f"Unknown LLM cache mode {mode!r} (expected read-through, record or replay)")
+        self.path = path
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.writes = 0
+        self.evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                " key TEXT PRIMARY KEY, stored_at REAL, accessed_at REAL, size INTEGER, value TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS completions_lru ON completions (accessed_at)")
+
+    # ── BaseCache ──────────────────────────────────────────────────
+    def lookup(self, prompt: str, llm_string: str) -> Optional[List[Any]]:
+        if self.mode == "record":
+            return None
+        key = completion_key(prompt, llm_string)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT stored_at, value FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[0] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+        if row is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise CacheMissError(f"No cached completion for key {key[:12]}… (LLM_CACHE_MODE=replay)")
+            return None
+        self.hits += 1
+        return loads(row[1])
+
+    def update(self, prompt: str, llm_string: str, return_val: List[Any]) -> None:
+        if self.mode == "replay":
+            return
+        value = dumps(return_val)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?)",
+                (completion_key(prompt, llm_string), now, now, len(value), value),
+            )
+            self.writes += 1
+            self.evictions += self._evict()
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM completions")
+
+    # ── Housekeeping ───────────────────────────────────────────────
+    def _evict(self) -> int:
+        evicted = self._conn.execute(
+            "DELETE FROM completions WHERE key IN ("
+            " SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        while total > self.max_bytes:
+            key, size = self._conn.execute(
+                "SELECT key, size FROM completions ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "path": self.path,
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ── Streaming-aware chat model ─────────────────────────────────────
+class CachedChatOpenAI(ChatOpenAI):
+    """ChatOpenAI whose streamed completions also go through the global LLM cache."""
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        cache = self.cache if isinstance(self.cache, BaseCache) else get_llm_cache()
+        if cache is None or self.cache is False:
+            yield from super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        llm_string = self._get_llm_string(stop=stop, **kwargs)
+        prompt = dumps(messages)
+        cached = cache.lookup(prompt, llm_string)
+        if cached:
+            # stream() reports the chunk to the callbacks like any streamed token
+            yield ChatGenerationChunk(message=AIMessageChunk(content=cached[0].message.content))
+            return
+        text: List[str] = []
+        for chunk in super()._stream(messages, stop=stop, run_manager=run_manager, **kwargs):
+            text.append(chunk.text)
+            yield chunk
+        cache.update(prompt, llm_string, [ChatGeneration(message=AIMessage(content="".join(text)))])
+
+
+def chat_model(**kwargs: Any) -> ChatOpenAI:
+    """A ChatOpenAI for crew agents; cached whenever an LLM cache is installed."""
+    return CachedChatOpenAI(**kwargs)
+
+
+def install_llm_cache() -> Optional[CompletionCache]:
+    """
+    Install the process-wide cache from LLM_CACHE_MODE / LLM_CACHE_PATH /
+    LLM_CACHE_TTL_SECONDS (0 = never expire) / LLM_CACHE_MAX_ENTRIES /
+    LLM_CACHE_MAX_MB. Returns None when the mode is "off". Safe to call more
+    than once.
+    """
+    current = get_llm_cache()
+    if isinstance(current, CompletionCache):
+        return current
+    mode = os.getenv("LLM_CACHE_MODE", "off").strip().lower() or "off"
+    if mode not in MODES:
+        raise RuntimeError(f"Unknown LLM_CACHE_MODE {mode!r} (expected one of {', '.join(MODES)})")
+    if mode == "off":
+        return None
+    cache = CompletionCache(
+        path=os.getenv("LLM_CACHE_PATH", ".cache/llm_completions.sqlite3"),
+        mode=mode,
+        ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10_000)),
+        max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", 256)) * 1024 * 1024),
+    )
+    set_llm_cache(cache)
+    return cache
@@ -1,17 +1,33 @@
+import asyncio
+import importlib
 import json
-import re
 import logging
-from typing import Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, List, Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 from starlette.concurrency import run_in_threadpool
 
-from customer_support import crew, inquiry_resolution
-from linkedin.linkedin_crew import crew as linked_in_crew
-from eventPlanner.planner_crew import event_management_crew, VenueDetails
-from outreach.outreach_crew import outreach_crew
+from answer_cache import build_answer_cache
+from crew_events import answer_tokens, format_sse, install_relay, relay_for
+from crew_pool import CrewPool, PoolSaturated, PoolUnavailable
+from dag_runner import recorder as dag_recorder
+from http_client import http_stats
+from jobs import JobManager, JobQueueFull
+from model_routing import llm_cache_stats, routes as model_routes
+from metrics import current_labels, instrument_crew, registry, render_stats, timed_kickoff
+from search_cache import search_cache_stats
+from session_cache import SessionCache, current_session
+from token_budget import compact, ledger as token_ledger
+from vector_memory import memory_stats
+from sikka_site import qa_gate, sikka_index, sikka_pages
+from eventPlanner.models import MarketingBundle
+from eventPlanner.output_parser import AgentOutputError, parse_marketing_bundle
+from utils import get_int_setting, get_setting
 
 # —───────────── Logging Setup ─────────────—
 logger = logging.getLogger("uvicorn.error")
@@ -21,9 +37,18 @@ logger = logging.getLogger("uvicorn.error")
 class InquiryRequest(BaseModel):
     customer: str = Field(..., example="Maple Grove Dental")
     inquiry: str = Field(..., example="I'd love to learn more about your pricing tiers.")
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description=(
+            "Returned by the first reply; send it back to continue the conversation. "
+            "An unknown or expired ID starts a new conversation under a new ID."
+        ),
+    )
 
 class InquiryResponse(BaseModel):
     response: str
+    session_id: Optional[str] = None
 
 
 class GeneratePostRequest(BaseModel):
@@ -42,11 +67,6 @@ class EventRequest(BaseModel):
     budget: float
     venue_type: str
 
-class MarketingBundle(BaseModel):
-    venueDetails: VenueDetails
-    marketingReport: str
-
-
 class OutreachEmailRequest(BaseModel):
     lead_name: str
     industry: str
@@ -60,9 +80,141 @@ class OutreachEmailRequest(BaseModel):
 class OutreachEmailResponse(BaseModel):
     email: str
 
+class OutreachBatchRequest(BaseModel):
+    leads: List[OutreachEmailRequest] = Field(..., min_length=1)
+
+
+class JobSubmitted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+
+# —───────────── Crew Pools ─────────────—
+# One pool of independent crews per route. The pool size is the route's
+# concurrency limit and CREW_QUEUE_LIMIT how many requests may wait for a crew
+# before the route answers 429; CREW_POOL_SIZE_<ROUTE> / CREW_QUEUE_LIMIT_<ROUTE>
+# override either per route.
+def _lazy(target: str):
+    """
+    Factory for a `module:function` crew builder, imported on first build.
+
+    The crew modules pull in crewai/crewai_tools and build their tools at
+    import time; deferring that keeps the API's own import fast.
+    """
+    module_name, attr = target.split(":")
+
+    def factory():
+        return getattr(importlib.import_module(module_name), attr)()
+
+    return factory
+
+
+def _make_pool(name: str, factory) -> CrewPool:
+    size = get_int_setting(f"CREW_POOL_SIZE_{name.upper()}", get_int_setting("CREW_POOL_SIZE", 2))
+    max_waiting = get_int_setting(f"CREW_QUEUE_LIMIT_{name.upper()}", get_int_setting("CREW_QUEUE_LIMIT", 8))
+    # Every pooled crew reports its steps through an EventRelay (see /chat/stream),
+    # which also feeds the task/LLM/tool metrics on /metrics
+    def build():
+        crew = install_relay(factory())
+        return instrument_crew(crew, name, relay_for(crew))
+
+    return CrewPool(name, build, size=size, max_waiting=max_waiting)
+
+pools = {
+    "chat": _make_pool("chat", _lazy("customer_support:build_crew")),
+    "post": _make_pool("post", _lazy("linkedin.linkedin_crew:build_crew")),
+    "event": _make_pool("event", _lazy("eventPlanner.planner_crew:build_crew")),
+    "outreach": _make_pool("outreach", _lazy("outreach.outreach_crew:build_crew")),
+    # /outreach-email/batch: one Sikka analysis per batch, then per-lead crews
+    "outreach_analysis": _make_pool("outreach_analysis", _lazy("outreach.outreach_crew:build_analysis_crew")),
+    "outreach_lead": _make_pool("outreach_lead", _lazy("outreach.outreach_crew:build_lead_crew")),
+}
+
+# CREW_WARMUP: "background" builds every pool after the server starts
+# accepting requests, "startup" before it does, "lazy" only on first use
+CREW_WARMUP = get_setting("CREW_WARMUP", "background").lower()
+if CREW_WARMUP not in ("background", "startup", "lazy"):
+    raise RuntimeError(f"Unknown CREW_WARMUP {CREW_WARMUP!r} (expected background, startup or lazy)")
+
+# Answers for repeated /chat inquiries, per customer; CHAT_CACHE_BACKEND is memory, disk or off
+chat_cache = build_answer_cache(
+    backend=get_setting("CHAT_CACHE_BACKEND", "memory"),
+    ttl_seconds=get_int_setting("CHAT_CACHE_TTL_SECONDS", 3600),
+    max_entries=get_int_setting("CHAT_CACHE_MAX_ENTRIES", 256),
+    path=get_setting("CHAT_CACHE_PATH", ".cache/chat_answers.sqlite3"),
+)
+
+# Recent turns and retrieved passages per /chat conversation (see session_cache.py)
+chat_sessions = SessionCache(
+    max_sessions=get_int_setting("CHAT_SESSION_MAX_SESSIONS", 1000),
+    ttl_seconds=get_int_setting("CHAT_SESSION_TTL_SECONDS", 1800),
+    max_turns=get_int_setting("CHAT_SESSION_MAX_TURNS", 4),
+    max_bytes=get_int_setting("CHAT_SESSION_MAX_KB", 64) * 1024,
+)
+CHAT_SESSION_CONTEXT_TOKENS = get_int_setting("CHAT_SESSION_CONTEXT_TOKENS", 800)
+
+STREAM_HEARTBEAT_SECONDS = get_int_setting("STREAM_HEARTBEAT_SECONDS", 15)
+
+OUTREACH_BATCH_MAX_LEADS = get_int_setting("OUTREACH_BATCH_MAX_LEADS", 50)
+OUTREACH_BATCH_CONCURRENCY = get_int_setting("OUTREACH_BATCH_CONCURRENCY", 4)
+# Same setting outreach_crew.py uses for its task context budget
+OUTREACH_CONTEXT_BUDGET = get_int_setting("OUTREACH_CONTEXT_BUDGET", 1500)
+
+# Background runner for the /jobs/* variants of the long-running routes
+jobs = JobManager(
+    max_workers=get_int_setting("JOB_WORKERS", 4),
+    max_queued=get_int_setting("JOB_MAX_QUEUED", 32),
+    ttl_seconds=get_int_setting("JOB_RESULT_TTL_SECONDS", 3600),
+)
+
 
 # —───────────── FastAPI App & CORS ─────────────—
-app = FastAPI()
+startup = {"warmup": CREW_WARMUP, "pages_seconds": None, "warm_seconds": None}
+
+
+async def warm_up() -> None:
+    # Snapshot the Sikka pages first so /chat rarely has to fetch live
+    started = time.perf_counter()
+    await run_in_threadpool(sikka_pages.refresh)
+    sikka_pages.start()
+    startup["pages_seconds"] = round(time.perf_counter() - started, 3)
+    if CREW_WARMUP != "lazy":
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(pool.warm() for pool in pools.values()))
+        except Exception as e:
+            if CREW_WARMUP == "startup":
+                raise
+            # Pools that didn't warm build their crews on first use instead
+            logger.error("Background crew warm-up failed", exc_info=e)
+        startup["warm_seconds"] = round(time.perf_counter() - started, 3)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warming = None
+    if CREW_WARMUP == "startup":
+        await warm_up()
+    else:
+        warming = asyncio.ensure_future(warm_up())
+    yield
+    if warming is not None and not warming.done():
+        warming.cancel()
+    await jobs.shutdown()
+    sikka_pages.stop()
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -74,90 +226,318 @@ app.add_middleware(
 def read_root():
     return {"message": "Hello World"}
 
+@app.get("/stats")
+def read_stats():
+    return {
+        "pools": {name: pool.stats() for name, pool in pools.items()},
+        "chat_cache": chat_cache.stats() if chat_cache else None,
+        "chat_sessions": chat_sessions.stats(),
+        "pages": sikka_pages.stats(),
+        "page_index": sikka_index.stats(),
+        "qa_gate": qa_gate.stats(),
+        "jobs": jobs.stats(),
+        "models": model_routes(),
+        "llm_cache": llm_cache_stats(),
+        "search_cache": search_cache_stats(),
+        "http": http_stats(),
+        "token_budget": token_ledger.stats(),
+        "task_dag": dag_recorder.stats(),
+        "crew_memory": memory_stats(),
+        "startup": startup,
+    }
+
+@app.middleware("http")
+async def label_route(request: Request, call_next):
+    # Crew, LLM and tool metrics recorded for this request carry its path
+    current_labels.set({"route": request.url.path})
+    return await call_next(request)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    """Prometheus text format: crew/task/LLM/tool latencies plus the /stats gauges."""
+    return PlainTextResponse(
+        registry.render()
+        + render_stats("crew_pool", "Crew pool state", (({"pool": name}, pool.stats()) for name, pool in pools.items()))
+        + render_stats("chat_cache", "Chat answer cache", [({}, chat_cache.stats())] if chat_cache else [])
+        + render_stats("chat_sessions", "Chat session context cache", [({}, chat_sessions.stats())])
+        + render_stats("sikka_page_index", "Sikka page passage index", [({}, sikka_index.stats())])
+        + render_stats("support_qa_gate", "Support QA gate decisions", [({}, qa_gate.stats())])
+        + render_stats("llm_cache", "LLM completion cache", [({}, llm_cache_stats())] if llm_cache_stats() else [])
+        + render_stats("search_cache", "Web search cache", [({}, search_cache_stats())] if search_cache_stats() else [])
+        + render_stats(
+            "task_tokens", "Per-task token accounting", (({"task": task}, row) for task, row in token_ledger.stats().items())
+        )
+        + render_stats("crew_dag", "Crews run as task graphs", [({}, dag_recorder.stats())])
+        + render_stats("crew_memory", "Crew vector memory", [({}, memory_stats())] if memory_stats() else [])
+        + render_stats("http", "Outbound HTTP fetches", (({"host": host}, row) for host, row in http_stats().items()))
+        + render_stats("jobs", "Background jobs", [({}, jobs.stats())]),
+        media_type="text/plain; version=0.0.4",
+    )
+
 # —───────────── Helpers ─────────────—
-async def kickoff_crew(crew, payload: dict) -> str:
+def saturated(e: PoolSaturated) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def unavailable(e: PoolUnavailable) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def admit(pool: CrewPool) -> None:
+    """Reject up front (429) when the route's wait queue is already full."""
     try:
-        return await run_in_threadpool(crew.kickoff, payload)
+        pool.check_admission()
+    except PoolSaturated as e:
+        raise saturated(e)
+
+
+def run_kickoff(pool: CrewPool, crew, payload: dict):
+    """Kickoff body for the worker thread: announces the first task, then runs and times the crew."""
+    relay_for(crew).begin()
+    return timed_kickoff(crew, pool.name, payload)
+
+
+async def kickoff_crew(pool: CrewPool, payload: dict) -> str:
+    try:
+        async with pool.lease() as crew:
+            return await pool.run(run_kickoff, pool, crew, payload)
+    except PoolSaturated as e:
+        raise saturated(e)
+    except PoolUnavailable as e:
+        raise unavailable(e)
     except Exception as e:
         logger.error("Crew kickoff failed", exc_info=e)
         raise HTTPException(status_code=502, detail="Upstream AI service error")
 
 
-# —───────────── Routes ─────────────—
-@app.post("/chat", response_model=InquiryResponse)
-async def chat(req: InquiryRequest):
-    # Render the prompt
-    template = inquiry_resolution.description
+async def stream_crew(pool: CrewPool, payload: dict):
+    """
+    Kick off a pooled crew and yield its progress events as they happen.
+
+    The last event is {"type": "result", "output": <crew output>}; kickoff
+    errors propagate to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    async with pool.lease() as crew:
+        relay = relay_for(crew)
+        unsubscribe = relay.subscribe(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+
+        kickoff = asyncio.ensure_future(pool.run(run_kickoff, pool, crew, payload))
+        getter = None
+        try:
+            while not kickoff.done() or not events.empty():
+                getter = getter or asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait(
+                    {getter, kickoff}, timeout=STREAM_HEARTBEAT_SECONDS, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    yield getter.result()
+                    getter = None
+                elif not done:
+                    # Long LLM calls emit nothing; keep proxies and client read timeouts alive
+                    yield {"type": "heartbeat"}
+        finally:
+            if getter is not None:
+                getter.cancel()
+            unsubscribe()
+        output = await kickoff
+    yield {"type": "result", "output": output}
+
+
+def chat_payload(req: "InquiryRequest", session) -> dict:
+    """Crew inputs for a chat turn: the request plus the session's conversation so far."""
+    return {
+        "customer": req.customer,
+        "inquiry": req.inquiry,
+        "conversation": session.context(req.inquiry, CHAT_SESSION_CONTEXT_TOKENS),
+    }
+
+
+def validate_chat_prompt(payload: dict) -> None:
+    # Imported here so startup doesn't load crewai (it's cached after the first call)
+    from customer_support import INQUIRY_RESOLUTION_DESCRIPTION
+
+    template = INQUIRY_RESOLUTION_DESCRIPTION
     try:
-        rendered = template.format(**req.dict())
+        rendered = template.format(**payload)
     except KeyError as e:
         msg = f"Missing template key: {e}"
         logger.error(msg)
         raise HTTPException(status_code=400, detail=msg)
-
     logger.debug("Rendered chat prompt: %s", rendered)
-    ai_response = await kickoff_crew(crew, req.dict())
-    return {"response": ai_response}
+
+
+# —───────────── Routes ─────────────—
+@app.post("/chat", response_model=InquiryResponse)
+async def chat(req: InquiryRequest):
+    session = chat_sessions.session(req.session_id)
+    # A follow-up depends on the turns before it, so only first messages use the answer cache
+    answers = chat_cache if chat_cache and not session.turns else None
+    # Render the prompt
+    payload = chat_payload(req, session)
+    validate_chat_prompt(payload)
+    # DiskBackend hits SQLite, so cache lookups stay off the event loop
+    ai_response = await run_in_threadpool(answers.get, req.inquiry, req.customer) if answers else None
+    if ai_response is None:
+        # The page search tool reads the session through this (the worker thread copies the context)
+        current_session.set(session)
+        ai_response = await kickoff_crew(pools["chat"], payload)
+        if answers:
+            await run_in_threadpool(answers.set, req.inquiry, ai_response, req.customer)
+    session.add_turn(req.inquiry, str(ai_response))
+    return {"response": ai_response, "session_id": session.id}
+
+
+@app.post("/chat/stream")
+async def chat_stream(req: InquiryRequest):
+    """
+    Server-sent events for one chat turn: `start` right away, then
+    `task_start`/`step`/`task_end` while the crew works, then the answer as
+    `token` events and a final `done` (or a single `error`). `heartbeat`
+    events fill long silences and carry no data.
+    """
+    session = chat_sessions.session(req.session_id)
+    answers = chat_cache if chat_cache and not session.turns else None
+    payload = chat_payload(req, session)
+    validate_chat_prompt(payload)
+    cached = await run_in_threadpool(answers.get, req.inquiry, req.customer) if answers else None
+    if cached is None:
+        admit(pools["chat"])
+
+    async def events():
+        answer = cached
+        yield format_sse({"type": "start", "cached": answer is not None, "session_id": session.id})
+        try:
+            if answer is None:
+                current_session.set(session)
+                async for event in stream_crew(pools["chat"], payload):
+                    if event["type"] == "result":
+                        answer = str(event["output"])
+                    else:
+                        yield format_sse(event)
+                if answers:
+                    await run_in_threadpool(answers.set, req.inquiry, answer, req.customer)
+        except (PoolSaturated, PoolUnavailable) as e:
+            yield format_sse({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+            return
+        except Exception as e:
+            logger.error("Crew kickoff failed", exc_info=e)
+            yield format_sse({"type": "error", "detail": "Upstream AI service error"})
+            return
+        session.add_turn(req.inquiry, answer)
+        for token in answer_tokens(answer):
+            yield format_sse({"type": "token", "text": token})
+        yield format_sse({"type": "done", "response": answer, "session_id": session.id})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/generate-post", response_model=GeneratePostResponse)
 async def generate_post(req: GeneratePostRequest):
-    ai_response = await kickoff_crew(linked_in_crew, {"topic": req.topic})
+    ai_response = await kickoff_crew(pools["post"], {"topic": req.topic})
     return {"response": ai_response}
 
 
 @app.post("/plan-event", response_model=MarketingBundle)
 async def plan_event(req: EventRequest):
     # 1) Kick off the crew
-    raw = await kickoff_crew(event_management_crew, req.dict())
-
-    # 2) Extract JSON from first “{” to last “}”
-    start = raw.find("{")
-    end = raw.rfind("}")
-    if start == -1 or end == -1:
-        logger.error("No JSON object in plan-event output:\n%s", raw)
-        raise HTTPException(500, "Invalid agent response format")
-
-    body = raw[start : end + 1]
-
-    # 3) Strip ```json fences if the agent used them
-    if body.startswith("```"):
-        lines = body.splitlines()[1:-1]
-        body = "\n".join(lines)
-
-    # 4) Escape control chars inside the marketingReport value
-    def _escape_report(match):
-        prefix, report, suffix = match.group(1), match.group(2), match.group(3)
-        # escape backslashes and quotes
-        report = report.replace("\\", "\\\\").replace('"', '\\"')
-        # escape newlines
-        report = report.replace("\r\n", "\\n").replace("\n", "\\n")
-        return f'{prefix}{report}{suffix}'
-
-    body = re.sub(
-        r'("marketingReport"\s*:\s*")([\s\S]*?)(")',
-        _escape_report,
-        body,
-        flags=re.MULTILINE,
-    )
+    raw = await kickoff_crew(pools["event"], req.dict())
 
-    # 5) Parse JSON
+    # 2) Parse and validate the JSON answer in one pass (fences, prose and
+    #    unescaped report text are tolerated)
     try:
-        data = json.loads(body)
-    except json.JSONDecodeError as e:
-        logger.error("Failed to parse JSON:\n%s\nError: %s", body, e)
-        raise HTTPException(500, "Error parsing AI output")
-
-    # 6) Wrap the Markdown in fences (so frontend can strip them cleanly)
-    report = data.get("marketingReport", "")
-    data["marketingReport"] = f"```\n{report}\n```"
+        bundle = parse_marketing_bundle(raw)
+    except AgentOutputError as e:
+        logger.error("Unusable plan-event output (%s):\n%s", e, raw)
+        raise HTTPException(502, "Invalid agent response format")
 
-    # 7) Return validated Pydantic model
-    return MarketingBundle(**data)
+    # 3) Wrap the Markdown in fences (so frontend can strip them cleanly)
+    bundle.marketingReport = f"```\n{bundle.marketingReport}\n```"
+    return bundle
 
 
 @app.post("/outreach-email", response_model=OutreachEmailResponse)
 async def outreach_email(req: OutreachEmailRequest):
-    email = await kickoff_crew(outreach_crew, req.dict())
+    email = await kickoff_crew(pools["outreach"], req.dict())
 
     return {"email": email}
+
+
+@app.post("/outreach-email/batch")
+async def outreach_email_batch(req: OutreachBatchRequest):
+    """
+    Draft emails for many leads, sharing a single Sikka.ai analysis.
+
+    Streams newline-delimited JSON: {"index", "lead_name", "email"} (or
+    "error") per lead in completion order, then {"done": true, ...}.
+    """
+    if len(req.leads) > OUTREACH_BATCH_MAX_LEADS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {OUTREACH_BATCH_MAX_LEADS} leads per batch",
+        )
+    # The summary doesn't depend on the lead, so compute it before fanning out
+    sikka_summary = str(await kickoff_crew(pools["outreach_analysis"], {}))
+    # It goes into every lead's prompt, so hold it to the same budget as task context
+    sikka_summary = compact(sikka_summary, OUTREACH_CONTEXT_BUDGET)
+    limit = asyncio.Semaphore(OUTREACH_BATCH_CONCURRENCY)
+
+    async def draft(index: int, lead: OutreachEmailRequest) -> dict:
+        async with limit:
+            try:
+                email = await kickoff_crew(
+                    pools["outreach_lead"], {**lead.dict(), "sikka_summary": sikka_summary}
+                )
+            except HTTPException as e:
+                return {"index": index, "lead_name": lead.lead_name, "error": e.detail}
+        return {"index": index, "lead_name": lead.lead_name, "email": str(email)}
+
+    async def results():
+        drafts = [asyncio.ensure_future(draft(i, lead)) for i, lead in enumerate(req.leads)]
+        failed = 0
+        try:
+            for next_done in asyncio.as_completed(drafts):
+                result = await next_done
+                failed += "error" in result
+                yield json.dumps(result) + "\n"
+        finally:
+            for pending in drafts:
+                pending.cancel()
+        yield json.dumps({"done": True, "total": len(drafts), "failed": failed}) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+# —───────────── Job Routes ─────────────—
+# Same work as /plan-event and /outreach-email, but the POST returns a job ID
+# immediately and the result is fetched from GET /jobs/{job_id}.
+def submit_job(kind: str, run) -> JobSubmitted:
+    try:
+        job = jobs.submit(kind, run)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    return JobSubmitted(job_id=job.id, status=job.status, status_url=f"/jobs/{job.id}")
+
+
+@app.post("/jobs/plan-event", response_model=JobSubmitted, status_code=202)
+async def submit_plan_event(req: EventRequest):
+    return submit_job("plan-event", lambda: plan_event(req))
+
+
+@app.post("/jobs/outreach-email", response_model=JobSubmitted, status_code=202)
+async def submit_outreach_email(req: OutreachEmailRequest):
+    return submit_job("outreach-email", lambda: outreach_email(req))
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def read_job(job_id: str, wait: float = 0):
+    """Job status and, once finished, its result; `wait` long-polls up to 60s."""
+    job = await jobs.get(job_id, wait=min(max(wait, 0), 60))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job.to_dict()
@@ -0,0 +1,299 @@
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from model_routing import cost_usd
+from tool_wrappers import wrap_tool_run
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Labels of whatever is running on the current kickoff thread. main.py sets
+# "route" per request; the task listener below adds crew/task/agent, which the
+# LLM handler and wrapped tools read from the same (thread-copied) context.
+current_labels: contextvars.ContextVar = contextvars.ContextVar("metrics_labels", default={})
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ── Metric types ───────────────────────────────────────────────────
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        for key, series in items:
+            bucket_labels = self.label_names + ("le",)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels, key + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels, key + ('+Inf',))} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {series[-1]}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def render_stats(prefix: str, help_text: str, rows: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> str:
+    """
+    Expose existing `stats()` dicts as gauges: every numeric value becomes
+    `<prefix>_<key>`, labelled with the row's labels.
+    """
+    samples: Dict[str, List[str]] = {}
+    for labels, stats in rows:
+        for key, value in stats.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = f"{prefix}_{key}"
+            samples.setdefault(name, []).append(
+                f"{name}{_format_labels(tuple(labels), tuple(labels.values()))} {_format_value(value)}"
+            )
+    lines: List[str] = []
+    for name, rows_for_name in samples.items():
+        lines += [f"# HELP {name} {help_text} ({name[len(prefix) + 1:]})", f"# TYPE {name} gauge"] + rows_for_name
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+# ── Crew metrics ───────────────────────────────────────────────────
+registry = Registry()
+
+CREW_SECONDS = registry.histogram("crew_kickoff_seconds", "Wall time of a crew kickoff", ("route", "crew"))
+CREW_ERRORS = registry.counter("crew_kickoff_errors_total", "Crew kickoffs that raised", ("route", "crew"))
+TASK_SECONDS = registry.histogram(
+    "crew_task_seconds", "Wall time of one task inside a kickoff", ("route", "crew", "task", "agent")
+)
+STEPS = registry.counter(
+    "crew_agent_steps_total", "Agent steps (tool uses and final answers)", ("route", "crew", "agent", "kind")
+)
+LLM_SECONDS = registry.histogram("llm_call_seconds", "Latency of one LLM call", ("route", "crew", "agent", "model"))
+LLM_ERRORS = registry.counter("llm_call_errors_total", "LLM calls that raised", ("route", "crew", "agent", "model"))
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens used, per crewai's token counter", ("route", "crew", "task", "agent", "model", "kind")
+)
+LLM_COST = registry.counter(
+    "llm_cost_usd_total", "Estimated LLM spend from token counts and model_routing prices",
+    ("route", "crew", "task", "agent", "model"),
+)
+TOOL_SECONDS = registry.histogram("tool_call_seconds", "Latency of one tool call", ("route", "crew", "agent", "tool"))
+TOOL_ERRORS = registry.counter("tool_call_errors_total", "Tool calls that raised", ("route", "crew", "agent", "tool"))
+
+
+def _labels(*names: str, **extra: Any) -> Dict[str, Any]:
+    """The current context's values for `names`, plus `extra`."""
+    labels = current_labels.get()
+    return {**{name: labels.get(name, "") for name in names}, **extra}
+
+
+@functools.lru_cache(maxsize=None)
+def _llm_handler_class():
+    # langchain_core is only imported once a crew is built, not with main.py
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class LLMMetricsHandler(BaseCallbackHandler):
+        """Times every LLM call of one agent (appended to `agent.llm.callbacks`)."""
+
+        def __init__(self, model: str):
+            self.model = model
+            self._started: Dict[UUID, Tuple[float, Dict[str, Any]]] = {}
+
+        def _start(self, run_id: UUID) -> None:
+            self._started[run_id] = (time.perf_counter(), _labels("route", "crew", "agent", model=self.model))
+
+        def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs: Any) -> None:
+            self._start(run_id)
+
+        def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs: Any) -> None:
+            self._start(run_id)
+
+        def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+            started = self._started.pop(run_id, None)
+            if started:
+                LLM_SECONDS.observe(time.perf_counter() - started[0], **started[1])
+
+        def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+            started = self._started.pop(run_id, None)
+            LLM_ERRORS.inc(**(started[1] if started else _labels("route", "crew", "agent", model=self.model)))
+
+    return LLMMetricsHandler
+
+
+def _instrument_tool(tool) -> None:
+    """Time a crewai tool's `_run` once; shared tool instances are wrapped for every crew."""
+    name = getattr(tool, "name", type(tool).__name__)
+
+    def timed(run):
+        def timed_run(*args, **kwargs):
+            labels = _labels("route", "crew", "agent", tool=name)
+            started = time.perf_counter()
+            try:
+                return run(*args, **kwargs)
+            except Exception:
+                TOOL_ERRORS.inc(**labels)
+                raise
+            finally:
+                TOOL_SECONDS.observe(time.perf_counter() - started, **labels)
+
+        return timed_run
+
+    wrap_tool_run(tool, timed, "_metrics_wrapped")
+
+
+class _TaskTimer:
+    """Relay listener: sets the task/agent labels and records task latency and tokens."""
+
+    def __init__(self, crew, name: str):
+        self.crew = crew
+        self.name = name
+        # Keyed by task index: a parallel DagCrew runs several tasks at once
+        self._started: Dict[int, float] = {}
+        self._tokens: Dict[int, Dict[str, int]] = {}
+
+    def _token_summary(self, agent) -> Dict[str, int]:
+        process = getattr(agent, "_token_process", None)
+        return process.get_summary() if process is not None else {}
+
+    def __call__(self, event: Dict[str, Any]) -> None:
+        kind = event["type"]
+        if kind == "task_start":
+            task = self.crew.tasks[event["task"]]
+            current_labels.set({**current_labels.get(), "crew": self.name, "task": event["task"], "agent": event["agent"]})
+            self._started[event["task"]] = time.perf_counter()
+            self._tokens[event["task"]] = self._token_summary(task.agent)
+        elif kind == "step":
+            STEPS.inc(**_labels("route", "crew", "agent", kind="final" if event.get("final") else "tool"))
+        elif kind == "task_end":
+            labels = _labels("route", "crew", "task", "agent")
+            started = self._started.pop(event["task"], None)
+            if started is not None:
+                TASK_SECONDS.observe(time.perf_counter() - started, **labels)
+            agent = self.crew.tasks[event["task"]].agent
+            model = getattr(getattr(agent, "llm", None), "model_name", "")
+            before = self._tokens.pop(event["task"], {})
+            after = self._token_summary(agent)
+            used = {kind: after.get(kind, 0) - before.get(kind, 0) for kind in ("prompt_tokens", "completion_tokens")}
+            for kind, count in used.items():
+                if count > 0:
+                    LLM_TOKENS.inc(count, **labels, model=model, kind=kind.split("_")[0])
+            cost = cost_usd(model, used["prompt_tokens"], used["completion_tokens"])
+            if cost:
+                LLM_COST.inc(cost, **labels, model=model)
+
+
+def instrument_crew(crew, name: str, relay) -> Any:
+    """Attach task, LLM and tool instrumentation to a freshly built crew."""
+    relay.subscribe(_TaskTimer(crew, name))
+    for agent in crew.agents:
+        llm = getattr(agent, "llm", None)
+        if llm is not None:
+            handler = _llm_handler_class()(getattr(llm, "model_name", type(llm).__name__))
+            llm.callbacks = (llm.callbacks or []) + [handler]
+        for tool in agent.tools or []:
+            _instrument_tool(tool)
+    for task in crew.tasks:
+        for tool in task.tools or []:
+            _instrument_tool(tool)
+    return crew
+
+
+def timed_kickoff(crew, name: str, payload: dict):
+    """Run `crew.kickoff(payload)` on the current thread, recording its latency."""
+    current_labels.set({**current_labels.get(), "crew": name})
+    labels = _labels("route", "crew")
+    started = time.perf_counter()
+    try:
+        return crew.kickoff(payload)
+    except Exception:
+        CREW_ERRORS.inc(**labels)
+        raise
+    finally:
+        CREW_SECONDS.observe(time.perf_counter() - started, **labels)
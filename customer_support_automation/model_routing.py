@@ -0,0 +1,86 @@
+from typing import Any, Dict, Optional
+
+from utils import get_setting
+
+# ── Routing table ──────────────────────────────────────────────────
+# Model per crew agent. Each agent runs exactly one task, so this is also the
+# model per task. Cheap/fast models by default; the outreach crew writes
+# customer-facing copy from thin research and keeps the larger model.
+#
+# Overrides, most specific first:
+#   LLM_MODEL_<CREW>_<AGENT>   e.g. LLM_MODEL_SUPPORT_QA=gpt-4o-mini
+#   LLM_MODEL_<CREW>           e.g. LLM_MODEL_OUTREACH=gpt-4o
+#   this table
+#   LLM_MODEL_DEFAULT          for agents missing from the table
+DEFAULT_MODEL = "gpt-3.5-turbo"
+MODEL_ROUTES: Dict[str, Dict[str, str]] = {
+    "support": {
+        "agent": "gpt-3.5-turbo",  # inquiry_resolution
+        "qa": "gpt-3.5-turbo",  # quality_assurance_review (often skipped by the QA gate)
+    },
+    "linkedin": {
+        "planner": "gpt-3.5-turbo",
+        "writer": "gpt-3.5-turbo",
+        "editor": "gpt-3.5-turbo",
+    },
+    "event": {
+        "venue": "gpt-3.5-turbo",
+        "logistics": "gpt-3.5-turbo",
+        "marketing": "gpt-3.5-turbo",
+    },
+    "outreach": {
+        "profiling": "gpt-4-turbo",
+        "analysis": "gpt-4-turbo",
+        "email": "gpt-4-turbo",
+    },
+}
+
+# USD per 1K tokens (prompt, completion), used for the llm_cost_usd_total metric.
+# Unknown models are counted in tokens only.
+MODEL_PRICES: Dict[str, tuple] = {
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-4o": (0.0025, 0.01),
+    "gpt-4o-mini": (0.00015, 0.0006),
+    "gpt-4": (0.03, 0.06),
+}
+
+
+def resolve_model(crew: str, agent: str) -> str:
+    """The configured model for `agent` in `crew` (see the override order above)."""
+    for name in (f"LLM_MODEL_{crew}_{agent}", f"LLM_MODEL_{crew}"):
+        model = get_setting(name.upper(), "")
+        if model:
+            return model
+    return MODEL_ROUTES.get(crew, {}).get(agent) or get_setting("LLM_MODEL_DEFAULT", DEFAULT_MODEL)
+
+
+_llm_cache = None
+
+
+def llm_for(crew: str, agent: str, **kwargs: Any):
+    """A chat model for one agent, instead of crewai's OPENAI_MODEL_NAME default."""
+    global _llm_cache
+    # Imported here: only crew modules (which already load langchain) call this
+    from llm_cache import chat_model, install_llm_cache
+
+    # LLM_CACHE_MODE opts every crew into the shared completion cache
+    _llm_cache = install_llm_cache()
+    return chat_model(model=resolve_model(crew, agent), **kwargs)
+
+
+def llm_cache_stats() -> Optional[Dict[str, Any]]:
+    """Completion cache stats, once a crew has been built with the cache on."""
+    return _llm_cache.stats() if _llm_cache is not None else None
+
+
+def routes() -> Dict[str, Dict[str, str]]:
+    """Resolved table for /stats."""
+    return {crew: {agent: resolve_model(crew, agent) for agent in agents} for crew, agents in MODEL_ROUTES.items()}
+
+
+def cost_usd(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return prompt_tokens / 1000 * prices[0] + completion_tokens / 1000 * prices[1]
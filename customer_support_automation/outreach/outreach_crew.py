@@ -1,183 +1,273 @@
-from crewai import Agent, Task, Crew
+from crewai import Agent, Crew
 from crewai_tools import BaseTool
-from crewai_tools import DirectoryReadTool, FileReadTool, SerperDevTool, ScrapeWebsiteTool
+from crewai_tools import SerperDevTool
 import os
-from pathlib import Path
-from utils import get_openai_api_key, get_serper_api_key
+from model_routing import llm_for
+from scrape_tools import PooledScrapeWebsiteTool
+from search_cache import cached_search
+from sikka_site import SIKKA_BASE_URL
+from budgeted_task import BudgetedTask
+from crew_memory import MEMORY_BACKEND, with_memory
+from dag_crew import DagCrew
+from outreach.templates import TEMPLATES, classify_practice_size, with_template
+from tone import score
+from utils import get_int_setting, get_openai_api_key, get_serper_api_key, get_setting
 
 openai_api_key = get_openai_api_key()
-os.environ["OPENAI_MODEL_NAME"] = 'gpt-4-turbo'
 os.environ["SERPER_API_KEY"] = get_serper_api_key()
 
 # —───────────── Define Custom Tools ─────────────—
 class SentimentAnalysisTool(BaseTool):
   name: str ="Sentiment Analysis Tool"
   description: str = ("Checks tone to ensure the email is "
-        "positive, professional, and engaging.")
+        "positive, professional, and engaging. Pass the full email text; returns positivity, "
+        "professionalism and pushiness scores, a pass/revise verdict and the sentences to rework.")
   
   def _run(self, text: str) -> str:
-      # Your custom code tool goes here
-      return "positive"
+      # Local lexicon scoring (tone.py), no extra LLM or network call
+      return score(text).summary()
     
 sentiment_tool = SentimentAnalysisTool()
 
-# Tools to read your instruction files and templates
-# directory_read_tool = DirectoryReadTool(directory='./instructions')
-
-HERE = Path(__file__).parent
-directory_read_tool = DirectoryReadTool(
-    directory=str(HERE / "instructions")
-)
-file_read_tool = FileReadTool()
-
-# Scraper that pulls content from all the relevant Sikka pages
-scrape_tool = ScrapeWebsiteTool(
+# Scraper that pulls content from all the relevant Sikka pages, fetched
+# concurrently over the shared HTTP client
+scrape_tool = PooledScrapeWebsiteTool(
     name="Sikka Website Scraper",
     description="Fetches and summarizes content from Sikka’s key pages to inform email personalization.",
     urls=[
-        "https://www.sikka.ai/",
-        "https://www.sikka.ai/about-us",
-        "https://www.sikka.ai/oneapi",
+        f"{SIKKA_BASE_URL}/",
+        f"{SIKKA_BASE_URL}/about-us",
+        f"{SIKKA_BASE_URL}/oneapi",
         "https://www.sikkasoft.com/optimizer",
-        "https://www.sikka.ai/fee-survey",
-        "https://www.sikka.ai/sikka-prime"
+        f"{SIKKA_BASE_URL}/fee-survey",
+        f"{SIKKA_BASE_URL}/sikka-prime"
     ]
 )
 
-search_tool = SerperDevTool()
+# SERPER_SEARCH_URL points the tool at a stand-in (see bench/fake_web.py);
+# results are shared with the other crews through the search cache
+search_tool = cached_search(
+    SerperDevTool(search_url=get_setting("SERPER_SEARCH_URL", "https://google.serper.dev/search"))
+)
+
+# Token budget for the context handed to the email task (see token_budget.py)
+OUTREACH_CONTEXT_BUDGET = get_int_setting("OUTREACH_CONTEXT_BUDGET", 1500)
+
+# "dag" runs the profiling and Sikka analysis tasks concurrently (see dag_runner.py)
+OUTREACH_TASK_MODE = get_setting("OUTREACH_TASK_MODE", "dag").lower()
+if OUTREACH_TASK_MODE not in ("dag", "sequential"):
+    raise RuntimeError(f"Unknown OUTREACH_TASK_MODE {OUTREACH_TASK_MODE!r} (expected dag or sequential)")
+OUTREACH_MAX_PARALLEL_TASKS = get_int_setting("OUTREACH_MAX_PARALLEL_TASKS", 2)
 
 # ────────────── Agents ──────────────
-prospect_profiling_agent = Agent(
-    role="Business Development Intelligence Analyst",
-    goal=(
-        "Identify and validate key company and decision-maker information "
-        "for targeted outreach; when specifics are unavailable, "
-        "provide relevant industry context without guessing."
-    ),
-    backstory=(
-        "You are a Business Development Intelligence Analyst on Sikka.ai’s Growth team. "
-        "Your mission is to find and verify client company data, recent news, "
-        "and leadership backgrounds using only trusted public sources and premium databases. "
-        "You rigorously cross-check multiple sources to ensure every detail is accurate—no assumptions. "
-        "If a specific data point cannot be confirmed, you default to providing general industry "
-        "insights or benchmarks to maintain credibility."
-    ),
-
-    allow_delegation=False,
-    verbose=True
-)
+def _prospect_profiling_agent():
+    return Agent(
+        role="Business Development Intelligence Analyst",
+        llm=llm_for("outreach", "profiling"),
+        goal=(
+            "Identify and validate key company and decision-maker information "
+            "for targeted outreach; when specifics are unavailable, "
+            "provide relevant industry context without guessing."
+        ),
+        backstory=(
+            "You are a Business Development Intelligence Analyst on Sikka.ai’s Growth team. "
+            "Your mission is to find and verify client company data, recent news, "
+            "and leadership backgrounds using only trusted public sources and premium databases. "
+            "You rigorously cross-check multiple sources to ensure every detail is accurate—no assumptions. "
+            "If a specific data point cannot be confirmed, you default to providing general industry "
+            "insights or benchmarks to maintain credibility."
+        ),
 
-sikka_web_analysis_agent = Agent(
-    role="Market Intelligence Analyst",
-    goal="Extract, validate, and structure Sikka.ai’s online product and brand intelligence to inform our outreach strategy.",
-    backstory=(
-        "You are a Senior Market Intelligence Analyst on the Strategy & Insights team at Sikka.ai. "
-        "Charged with deep-diving into our digital footprint, you leverage advanced web‐scraping tools and research "
-        "methodologies to compile authoritative summaries of our product offerings, customer value propositions, "
-        "and competitive differentiators. Your work ensures every customer-facing message is grounded in the "
-        "latest, most accurate intelligence."
-    ),
-    allow_delegation=False,
-    verbose=True
-)
+        allow_delegation=False,
+        verbose=True
+    )
+
+
+def _sikka_web_analysis_agent():
+    return Agent(
+        role="Market Intelligence Analyst",
+        llm=llm_for("outreach", "analysis"),
+        goal="Extract, validate, and structure Sikka.ai’s online product and brand intelligence to inform our outreach strategy.",
+        backstory=(
+            "You are a Senior Market Intelligence Analyst on the Strategy & Insights team at Sikka.ai. "
+            "Charged with deep-diving into our digital footprint, you leverage advanced web‐scraping tools and research "
+            "methodologies to compile authoritative summaries of our product offerings, customer value propositions, "
+            "and competitive differentiators. Your work ensures every customer-facing message is grounded in the "
+            "latest, most accurate intelligence."
+        ),
+        allow_delegation=False,
+        verbose=True
+    )
+
+
+def _email_agent():
+    return Agent(
+        role="Marketing Communications Manager",
+        llm=llm_for("outreach", "email"),
+        goal="Craft data-driven, personalized email campaigns that align Sikka.ai’s value proposition with each prospect’s needs.",
+        backstory=(
+            "As Marketing Communications Manager at Sikka.ai, you translate strategic insights into compelling narratives. "
+            "Partnering closely with Market Intelligence and Sales teams, you use our official email templates and the "
+            "latest prospect profiles to write messages that resonate—balancing technical detail with a human touch. "
+            "You uphold brand consistency, apply best‐practice frameworks, and optimize for engagement and conversion."
+        ),
+        allow_delegation=False,
+        verbose=True
+    )
 
-email_agent = Agent(
-    role="Marketing Communications Manager",
-    goal="Craft data-driven, personalized email campaigns that align Sikka.ai’s value proposition with each prospect’s needs.",
-    backstory=(
-        "As Marketing Communications Manager at Sikka.ai, you translate strategic insights into compelling narratives. "
-        "Partnering closely with Market Intelligence and Sales teams, you use our official email templates and the "
-        "latest prospect profiles to write messages that resonate—balancing technical detail with a human touch. "
-        "You uphold brand consistency, apply best‐practice frameworks, and optimize for engagement and conversion."
-    ),
-    allow_delegation=False,
-    verbose=True
-)
 
 # ────────────── Tasks ──────────────
 
 # 1) Profile the prospect via search
-customer_profiling_task = Task(
-    description=(
-        "Conduct a comprehensive research dossier on {lead_name}, a {industry} organization evaluating dental technology solutions. "
-        "Use SerperDevTool to verify company fundamentals, leadership bios, recent news or milestones, and market positioning. "
-        "Determine the practice’s scale—classify as `solo`, `group`, or `enterprise`—based on number of providers, locations, or other available metrics. "
-        "This dossier will underpin our personalized outreach strategy.\n"
-        "Do not speculate—only include details you can confirm from trusted sources; if a fact isn’t verifiable, provide general industry context instead."
-    ),
-    expected_output=(
-        "A detailed prospect dossier for {lead_name}, including:\n"
-        "• Company overview and mission statement\n"
-        "• Key decision-makers’ names, roles, and backgrounds\n"
-        "• Recent initiatives, news, or growth milestones\n"
-        "• Identified pain-points or challenges in the {industry}\n"
-        "• Classification of practice size (`solo`, `group`, or `enterprise`) with supporting rationale\n"
-        "• Opportunities where Sikka.ai’s OneAPI, Optimizer, or Fee Survey can add value\n"
-        "• Recommended initial messaging angles"
-    ),
-    tools=[search_tool],
-    agent=prospect_profiling_agent,
-)
+def _customer_profiling_task(agent):
+    return BudgetedTask(
+        name="customer_profiling",
+        description=(
+            "Conduct a comprehensive research dossier on {lead_name}, a {industry} organization evaluating dental technology solutions. "
+            "Use SerperDevTool to verify company fundamentals, leadership bios, recent news or milestones, and market positioning. "
+            "Determine the practice’s scale—classify as `solo`, `group`, or `enterprise`—based on number of providers, locations, or other available metrics. "
+            "This dossier will underpin our personalized outreach strategy.\n"
+            "Do not speculate—only include details you can confirm from trusted sources; if a fact isn’t verifiable, provide general industry context instead."
+        ),
+        expected_output=(
+            "A detailed prospect dossier for {lead_name}, including:\n"
+            "• Company overview and mission statement\n"
+            "• Key decision-makers’ names, roles, and backgrounds\n"
+            "• Recent initiatives, news, or growth milestones\n"
+            "• Identified pain-points or challenges in the {industry}\n"
+            "• Classification of practice size (`solo`, `group`, or `enterprise`) with supporting rationale\n"
+            "• Opportunities where Sikka.ai’s OneAPI, Optimizer, or Fee Survey can add value\n"
+            "• Recommended initial messaging angles"
+        ),
+        tools=[search_tool],
+        agent=agent,
+    )
+
 
 # 2) Summarize Sikka.ai
-sikka_analysis_task = Task(
-    description=(
-        "Compile a detailed profile of Sikka.ai by scraping their key pages. "
-        "Focus on product features, target customers, brand values, and recent initiatives."
-    ),
-    expected_output=(
-        "A structured Sikka.ai summary:\n"
-        "• Core offerings & features\n"
-        "• Customer pain-points addressed\n"
-        "• Brand & culture highlights\n"
-        "• Mapping of each URL to its key insights"
-    ),
-    tools=[scrape_tool],
-    agent=sikka_web_analysis_agent
-)
+def _sikka_analysis_task(agent):
+    return BudgetedTask(
+        name="sikka_analysis",
+        description=(
+            "Compile a detailed profile of Sikka.ai by scraping their key pages. "
+            "Focus on product features, target customers, brand values, and recent initiatives."
+        ),
+        expected_output=(
+            "A structured Sikka.ai summary:\n"
+            "• Core offerings & features\n"
+            "• Customer pain-points addressed\n"
+            "• Brand & culture highlights\n"
+            "• Mapping of each URL to its key insights"
+        ),
+        tools=[scrape_tool],
+        agent=agent
+    )
+
 
 # 3) Generate the actual outreach emails
-sikka_outreach_task = Task(
-    description=(
-        "Based on the prospect dossier and inferred practice size (`solo`, `group`, or `enterprise`):\n"
-        "1. Load the matching template file from `./instructions`:\n"
-        "   - `solo_practice.txt` for `solo`\n"
-        "   - `group_practice.txt` for `group`\n"
-        "   - `enterprise_practice.txt` for `enterprise`\n"
-        "2. Then, using that template plus:\n"
-        "  • Prospect dossier (company overview, key decision-makers, recent milestones)\n"
-        "  • Sikka.ai summary (from sikka_analysis_task)\n"
-        "  • Inputs: {lead_name}, {industry}, {recipient_name}, {recipient_position}, {recent_event}, {core_feature}\n"
-        "3. Populate every placeholder in the template. Ensure each draft:\n"
-        "  - Opens with a personalized reference to {recent_event} or a dossier insight\n"
-        "  - Weaves in Sikka’s core value proposition in context of the inferred practice size\n"
-        "  - Preserves all section headings and structure from the template file\n"
-        "  - Concludes with a clear, role-appropriate call to action\n"
-        "  - Passes through SentimentAnalysisTool for a positive, on-brand tone"
-        "**Return** exactly one Markdown string (no JSON, no code fences, no triple backticks, not in a code block) "
-        "containing the fully populated email."
-    ),
-    expected_output=(
-        "1 fully populated email drafts, matching the selected template’s structure, including:\n"
-        "• A customized subject line\n"
-        "• All template sections filled with tailored content\n"
-        "• Confirmation that tone checks passed"
-    ),
-    tools=[directory_read_tool, file_read_tool, sentiment_tool],
-    agent=email_agent,
-)
+class OutreachEmailTask(BudgetedTask):
+    """The email task, with the template for the dossier's practice size attached to its context."""
+
+    practice_size: str = ""
+
+    def _execute(self, agent, task, context, tools):
+        # Classify on the full dossier, before compaction can drop the rationale
+        self.practice_size = classify_practice_size(context or "")
+        return super()._execute(agent, task, context, tools)
+
+    def extend_context(self, context):
+        return with_template(context or "", TEMPLATES[self.practice_size])
+
+
+def _sikka_outreach_task(agent, context, summary_as_input: bool = False):
+    # In the per-lead crews the Sikka summary is computed once per batch and
+    # passed in as the `sikka_summary` input instead of coming from task 2.
+    summary_source = "below" if summary_as_input else "from sikka_analysis_task"
+    summary_appendix = "\n\nSikka.ai summary:\n{sikka_summary}" if summary_as_input else ""
+    return OutreachEmailTask(
+        name="sikka_outreach",
+        # Upstream dossier/summary text beyond this is compacted before the email is drafted
+        context_budget=OUTREACH_CONTEXT_BUDGET,
+        description=(
+            "Write the outreach email from the selected outreach template, which is given with the context below "
+            "and already matches the prospect's practice size (`solo`, `group`, or `enterprise`).\n"
+            "1. Use that template plus:\n"
+            "  • Prospect dossier (company overview, key decision-makers, recent milestones)\n"
+            f"  • Sikka.ai summary ({summary_source})\n"
+            "  • Inputs: {lead_name}, {industry}, {recipient_name}, {recipient_position}, {recent_event}, {core_feature}\n"
+            "2. Populate every placeholder in the template. Ensure each draft:\n"
+            "  - Opens with a personalized reference to {recent_event} or a dossier insight\n"
+            "  - Weaves in Sikka’s core value proposition in context of the inferred practice size\n"
+            "  - Preserves all section headings and structure from the template\n"
+            "  - Concludes with a clear, role-appropriate call to action\n"
+            "  - Passes through SentimentAnalysisTool for a positive, on-brand tone\n"
+            "**Return** exactly one Markdown string (no JSON, no code fences, no triple backticks, not in a code block) "
+            "containing the fully populated email."
+            + summary_appendix
+        ),
+        expected_output=(
+            "1 fully populated email drafts, matching the selected template’s structure, including:\n"
+            "• A customized subject line\n"
+            "• All template sections filled with tailored content\n"
+            "• Confirmation that tone checks passed"
+        ),
+        tools=[sentiment_tool],
+        context=context,
+        agent=agent,
+    )
+
+
+# ────────────── Crews ──────────────
+def build_crew() -> Crew:
+    """Build an independent profiling/analysis/email crew for one lead."""
+    prospect_profiling_agent = _prospect_profiling_agent()
+    sikka_web_analysis_agent = _sikka_web_analysis_agent()
+    email_agent = _email_agent()
+    profiling = _customer_profiling_task(prospect_profiling_agent)
+    analysis = _sikka_analysis_task(sikka_web_analysis_agent)
+    return with_memory(DagCrew(
+        agents=[
+            prospect_profiling_agent,
+            sikka_web_analysis_agent,
+            email_agent
+        ],
+        tasks=[
+            profiling,
+            analysis,
+            _sikka_outreach_task(email_agent, context=[profiling, analysis]),
+        ],
+        parallel=OUTREACH_TASK_MODE == "dag",
+        max_parallel_tasks=OUTREACH_MAX_PARALLEL_TASKS,
+        verbose=True,
+        memory=MEMORY_BACKEND == "crewai",
+    ))
+
+
+def build_analysis_crew() -> Crew:
+    """Build a crew that only produces the lead-independent Sikka.ai summary."""
+    sikka_web_analysis_agent = _sikka_web_analysis_agent()
+    return Crew(
+        agents=[sikka_web_analysis_agent],
+        tasks=[_sikka_analysis_task(sikka_web_analysis_agent)],
+        verbose=True,
+    )
+
+
+def build_lead_crew() -> Crew:
+    """Build a profiling/email crew that takes the Sikka.ai summary as the `sikka_summary` input."""
+    prospect_profiling_agent = _prospect_profiling_agent()
+    email_agent = _email_agent()
+    profiling = _customer_profiling_task(prospect_profiling_agent)
+    return with_memory(Crew(
+        agents=[prospect_profiling_agent, email_agent],
+        tasks=[
+            profiling,
+            _sikka_outreach_task(email_agent, context=[profiling], summary_as_input=True),
+        ],
+        verbose=True,
+        memory=MEMORY_BACKEND == "crewai",
+    ))
 
-# ────────────── Crew & Helper ──────────────
-outreach_crew = Crew(
-    agents=[
-        prospect_profiling_agent,
-        sikka_web_analysis_agent,
-        email_agent
-    ],
-    tasks=[customer_profiling_task, sikka_analysis_task, sikka_outreach_task],
-    verbose=True,
-    memory=True
-)
 
 # def generate_personalized_email(
 #     lead_name: str,
@@ -202,7 +292,7 @@ outreach_crew = Crew(
 #         "recent_event": recent_event,
 #         "core_feature": core_feature or "OneAPI data integration"
 #     }
-#     result = crew.kickoff(inputs=inputs)
+#     result = build_crew().kickoff(inputs=inputs)
 #     return result.raw
 
 # ────────────── Example Usage ──────────────
@@ -0,0 +1,180 @@
+"""
+BM25 passage index over a PageSnapshotStore.
+
+Pages are split into passages (a line of page text, or a sentence of a long
+line), kept verbatim so answers can quote them. The index is rebuilt whenever
+the store reports a changed page and saved to an .npz file. A restart then
+serves the last index even if the first page fetch fails.
+"""
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger("uvicorn.error")
+
+_TOKEN = re.compile(r"\w+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9“\"])")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+def split_passages(text: str, min_words: int = 4, max_words: int = 60) -> List[str]:
+    """Lines of page text; lines longer than `max_words` are split into sentences."""
+    passages = []
+    for line in text.split("\n"):
+        line = line.strip()
+        parts = _SENTENCE_END.split(line) if len(line.split()) > max_words else [line]
+        passages += [part for part in parts if len(part.split()) >= min_words]
+    return passages
+
+
+@dataclass
+class Passage:
+    text: str
+    page: str
+    url: str
+    score: float = 0.0
+
+
+class PassageIndex:
+    """BM25 over the passages of every page in `store`, rebuilt when pages change."""
+
+    def __init__(self, store, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.store = store
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.builds = 0
+        self.searches = 0
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+        self._fingerprint = ""
+        self._passages: List[Passage] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._weights = np.zeros((0, 0), dtype=np.float32)
+        if path and os.path.exists(path):
+            try:
+                self._load(path)
+            except Exception as e:
+                logger.warning("Ignoring unreadable page index %s: %s", path, e)
+        store.add_listener(self.rebuild)
+
+    # ── Build ──────────────────────────────────────────────────────
+    def _fingerprint_of(self, snapshots) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(snapshots):
+            digest.update(f"{name}\x00{snapshots[name].url}\x00{snapshots[name].text}\x00".encode("utf-8"))
+        return digest.hexdigest()
+
+    def rebuild(self, store=None) -> bool:
+        """Re-index the store's current snapshots; a no-op if no page text changed."""
+        snapshots = self.store.snapshots()
+        fingerprint = self._fingerprint_of(snapshots)
+        if not snapshots or fingerprint == self._fingerprint:
+            return False
+        started = time.perf_counter()
+        passages = [
+            Passage(text=text, page=name, url=snapshot.url)
+            for name, snapshot in snapshots.items()
+            for text in split_passages(snapshot.text)
+        ]
+        vocabulary: Dict[str, int] = {}
+        rows = [[vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(p.text)] for p in passages]
+        weights = self._bm25(rows, len(vocabulary))
+        with self._lock:
+            self._fingerprint = fingerprint
+            self._passages = passages
+            self._vocabulary = vocabulary
+            self._weights = weights
+            self.builds += 1
+            self.built_at = time.time()
+            self.build_seconds = round(time.perf_counter() - started, 4)
+        if self.path:
+            self._save(self.path)
+        return True
+
+    def _bm25(self, rows: List[List[int]], terms: int) -> np.ndarray:
+        """Per-(passage, term) BM25 weights, so a query's score is a column sum."""
+        tf = np.zeros((len(rows), terms), dtype=np.float32)
+        for i, row in enumerate(rows):
+            np.add.at(tf[i], row, 1)
+        lengths = tf.sum(axis=1, keepdims=True)
+        average = float(lengths.mean()) if len(rows) else 1.0
+        df = (tf > 0).sum(axis=0)
+        idf = np.log1p((len(rows) - df + 0.5) / (df + 0.5)).astype(np.float32)
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(average, 1e-9))
+        return (tf * (self.k1 + 1) / (tf + norm) * idf).astype(np.float32)
+
+    # ── Persistence ────────────────────────────────────────────────
+    def _save(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            arrays = {
+                "fingerprint": np.array(self._fingerprint),
+                "texts": np.array([p.text for p in self._passages]),
+                "pages": np.array([p.page for p in self._passages]),
+                "urls": np.array([p.url for p in self._passages]),
+                "terms": np.array(sorted(self._vocabulary, key=self._vocabulary.get)),
+                "weights": self._weights,
+            }
+        # Write-then-rename so a crash never leaves a half-written index
+        partial = f"{path}.partial.npz"
+        np.savez_compressed(partial, **arrays)
+        os.replace(partial, path)
+
+    def _load(self, path: str) -> None:
+        with np.load(path, allow_pickle=False) as data:
+            passages = [
+                Passage(text=str(text), page=str(page), url=str(url))
+                for text, page, url in zip(data["texts"], data["pages"], data["urls"])
+            ]
+            vocabulary = {str(term): i for i, term in enumerate(data["terms"])}
+            with self._lock:
+                self._fingerprint = str(data["fingerprint"])
+                self._passages = passages
+                self._vocabulary = vocabulary
+                self._weights = data["weights"].astype(np.float32)
+                self.built_at = os.path.getmtime(path)
+
+    # ── Search ─────────────────────────────────────────────────────
+    def search(self, query: str, k: int = 5) -> List[Passage]:
+        """The `k` best-matching passages, best first; passages matching no query term are left out."""
+        with self._lock:
+            passages, vocabulary, weights = self._passages, self._vocabulary, self._weights
+            self.searches += 1
+        columns = sorted({vocabulary[token] for token in tokenize(query) if token in vocabulary})
+        if not columns or not passages:
+            return []
+        scores = weights[:, columns].sum(axis=1)
+        k = min(k, len(passages))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            Passage(text=passages[i].text, page=passages[i].page, url=passages[i].url, score=float(scores[i]))
+            for i in top
+            if scores[i] > 0
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "path": self.path,
+                "passages": len(self._passages),
+                "terms": len(self._vocabulary),
+                "builds": self.builds,
+                "searches": self.searches,
+                "build_seconds": self.build_seconds,
+                "age_seconds": round(time.time() - self.built_at, 3) if self.built_at else None,
+            }
@@ -0,0 +1,142 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from http_client import html_to_text, shared_client
+
+logger = logging.getLogger("uvicorn.error")
+
+
+@dataclass
+class PageSnapshot:
+    url: str
+    text: str
+    size_bytes: int
+    fetched_at: float
+
+
+class PageSnapshotStore:
+    """
+    In-memory copies of a fixed set of pages.
+
+    `refresh()` fetches every page once (call it at startup), `start()` keeps
+    them fresh from a daemon thread, and tools read the last good snapshot so
+    no fetch happens on the request path. A page that failed to refresh keeps
+    serving its previous snapshot.
+    """
+
+    def __init__(self, pages: Dict[str, str], refresh_seconds: float, timeout: float = 15):
+        self.pages = dict(pages)
+        self.refresh_seconds = refresh_seconds
+        self.timeout = timeout
+        self._snapshots: Dict[str, PageSnapshot] = {}
+        self._errors: Dict[str, str] = {}
+        self._failures: Dict[str, int] = {}
+        self._refreshes = 0
+        self._listeners: List[Callable[["PageSnapshotStore"], None]] = []
+        self._lock = threading.Lock()
+        self._client = shared_client()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, callback: Callable[["PageSnapshotStore"], None]) -> None:
+        """Call `callback(store)` after every refresh that changed a page's text."""
+        self._listeners.append(callback)
+
+    def _store(self, name: str, response) -> bool:
+        """Keep a fetched page (or record why it failed); returns True if its text changed."""
+        url = self.pages[name]
+        try:
+            if isinstance(response, Exception):
+                raise response
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning("Refreshing page %r (%s) failed: %s", name, url, e)
+            with self._lock:
+                self._errors[name] = str(e)
+                self._failures[name] = self._failures.get(name, 0) + 1
+            return False
+        snapshot = PageSnapshot(
+            url=url,
+            text=html_to_text(response.content),
+            size_bytes=len(response.content),
+            fetched_at=time.time(),
+        )
+        with self._lock:
+            previous = self._snapshots.get(name)
+            self._snapshots[name] = snapshot
+            self._errors.pop(name, None)
+        return previous is None or previous.text != snapshot.text
+
+    def refresh_page(self, name: str) -> bool:
+        """Fetch one page; returns True if its text changed."""
+        try:
+            response = self._client.get(self.pages[name], timeout=self.timeout)
+        except Exception as e:
+            response = e
+        return self._store(name, response)
+
+    def refresh(self) -> None:
+        # All pages at once, over the shared pooled client
+        names = list(self.pages)
+        responses = self._client.fetch_many([self.pages[name] for name in names], timeout=self.timeout)
+        changed = [self._store(name, response) for name, response in zip(names, responses)]
+        self._refreshes += 1
+        if any(changed):
+            for callback in self._listeners:
+                try:
+                    callback(self)
+                except Exception as e:
+                    logger.error("Page store listener failed", exc_info=e)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            self.refresh()
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="page-store-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def snapshot(self, name: str) -> Optional[PageSnapshot]:
+        with self._lock:
+            snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            # Startup fetch failed or hasn't run yet; fall back to a live fetch
+            self.refresh_page(name)
+            with self._lock:
+                snapshot = self._snapshots.get(name)
+        return snapshot
+
+    def snapshots(self) -> Dict[str, PageSnapshot]:
+        with self._lock:
+            return dict(self._snapshots)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            pages = {
+                name: {
+                    "url": url,
+                    "age_seconds": round(now - self._snapshots[name].fetched_at, 3)
+                    if name in self._snapshots else None,
+                    "size_bytes": self._snapshots[name].size_bytes if name in self._snapshots else 0,
+                    "text_chars": len(self._snapshots[name].text) if name in self._snapshots else 0,
+                    "last_error": self._errors.get(name),
+                    "failures": self._failures.get(name, 0),
+                }
+                for name, url in self.pages.items()
+            }
+        return {
+            "refresh_seconds": self.refresh_seconds,
+            "refreshes": self._refreshes,
+            "total_bytes": sum(page["size_bytes"] for page in pages.values()),
+            "failures": sum(page["failures"] for page in pages.values()),
+            "pages": pages,
+        }
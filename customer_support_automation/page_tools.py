@@ -0,0 +1,55 @@
+from typing import Any, Type
+
+from crewai_tools import BaseTool
+from pydantic.v1 import BaseModel as V1BaseModel, Field
+
+from session_cache import current_session
+
+
+class _NoArgsSchema(V1BaseModel):
+    """The page is fixed per tool, so the agent passes nothing."""
+
+
+class SnapshotPageTool(BaseTool):
+    """Drop-in for a fixed-URL ScrapeWebsiteTool that reads from a PageSnapshotStore."""
+
+    name: str = "Read website content"
+    description: str = "A tool that can be used to read a website content."
+    args_schema: Type[V1BaseModel] = _NoArgsSchema
+    store: Any = None
+    page: str = ""
+
+    def _run(self, **kwargs: Any) -> Any:
+        snapshot = self.store.snapshot(self.page)
+        if snapshot is None:
+            return f"Could not read {self.store.pages[self.page]}."
+        return snapshot.text
+
+
+class _QuerySchema(V1BaseModel):
+    query: str = Field(..., description="What to look for, in a few words")
+
+
+class PageSearchTool(BaseTool):
+    """Top-k verbatim passages from a PassageIndex, instead of whole pages."""
+
+    name: str = "Search the website content"
+    description: str = "A tool that returns the passages of the website that best match a query."
+    args_schema: Type[V1BaseModel] = _QuerySchema
+    index: Any = None
+    top_k: int = 5
+
+    def _run(self, query: str = "", **kwargs: Any) -> Any:
+        # A chat session answers queries its conversation already searched (see session_cache.py)
+        session = current_session.get()
+        if session is not None:
+            earlier = session.search_result(query)
+            if earlier is not None:
+                return earlier
+        passages = self.index.search(query, k=self.top_k)
+        if not passages:
+            return f"No passages match {query!r}; try other words."
+        result = "\n\n".join(f"{passage.text}\nSource: {passage.url}" for passage in passages)
+        if session is not None:
+            session.remember_search(query, result)
+        return result
@@ -0,0 +1,198 @@
+"""
+Per-conversation context for /chat: recent turns and the passages already retrieved.
+
+A /chat request that carries a `session_id` gets the session's last few
+turns and the Sikka passages its earlier turns retrieved in the prompt
+(`ChatSession.context`). So a follow-up such as "and how much does that
+cost?" knows what "that" is, and the agent can quote passages it already
+has instead of searching again. While the session's crew runs,
+`current_session` points the page search tool at the session. A query the
+conversation already searched is then answered from the session without
+going back to the index.
+
+Session IDs are issued here (`secrets.token_urlsafe`), never taken from
+the client: an ID that isn't live starts a new session under a fresh ID,
+so nobody can open a conversation by guessing or choosing its ID.
+
+Sessions are evicted least-recently-used past `max_sessions` and expire
+`ttl_seconds` after their last turn. Each session is capped at `max_bytes`:
+the oldest passages go first, then the oldest turns. Nothing here imports
+crewai, so main.py can report the cache.
+"""
+import contextvars
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from search_cache import normalize_query
+from token_budget import compact
+
+# The session whose crew is running on this thread (see PageSearchTool)
+current_session: contextvars.ContextVar = contextvars.ContextVar("chat_session", default=None)
+
+
+@dataclass
+class Turn:
+    inquiry: str
+    answer: str
+
+    def nbytes(self) -> int:
+        return len(self.inquiry.encode("utf-8")) + len(self.answer.encode("utf-8"))
+
+
+class ChatSession:
+    """One conversation's recent turns and retrieved passages."""
+
+    def __init__(self, session_id: str, max_turns: int, max_bytes: int):
+        self.id = session_id
+        self.max_bytes = max_bytes
+        self.created_at = self.touched_at = time.time()
+        self.turns: deque = deque(maxlen=max_turns)
+        # Normalized search query -> the search tool's output for it
+        self.searches: "OrderedDict[str, str]" = OrderedDict()
+        self.search_hits = 0
+        self.trimmed = 0
+        self._lock = threading.Lock()
+
+    def nbytes(self) -> int:
+        with self._lock:
+            return self._nbytes()
+
+    def _nbytes(self) -> int:
+        return sum(turn.nbytes() for turn in self.turns) + sum(
+            len(key.encode("utf-8")) + len(value.encode("utf-8")) for key, value in self.searches.items()
+        )
+
+    def _trim(self) -> None:
+        while self._nbytes() > self.max_bytes and (self.searches or len(self.turns) > 1):
+            if self.searches:
+                self.searches.popitem(last=False)
+            else:
+                self.turns.popleft()
+            self.trimmed += 1
+
+    # ── Turns ──────────────────────────────────────────────────────
+    def add_turn(self, inquiry: str, answer: str) -> None:
+        with self._lock:
+            self.turns.append(Turn(inquiry, answer))
+            self._trim()
+
+    # ── Retrieved passages ─────────────────────────────────────────
+    def search_result(self, query: str) -> Optional[str]:
+        """The search tool's earlier output for `query` in this conversation, if any."""
+        with self._lock:
+            result = self.searches.get(normalize_query(query))
+            if result is not None:
+                self.searches.move_to_end(normalize_query(query))
+                self.search_hits += 1
+            return result
+
+    def remember_search(self, query: str, result: str) -> None:
+        with self._lock:
+            self.searches[normalize_query(query)] = result
+            self.searches.move_to_end(normalize_query(query))
+            self._trim()
+
+    def passages(self) -> List[str]:
+        """Distinct passage blocks ("text\\nSource: url") retrieved so far, oldest first."""
+        with self._lock:
+            blocks = [block for result in self.searches.values() for block in result.split("\n\n")]
+        return list(dict.fromkeys(block.strip() for block in blocks if block.strip()))
+
+    # ── Prompt ─────────────────────────────────────────────────────
+    def context(self, inquiry: str = "", budget: int = 800) -> str:
+        """The conversation so far, compacted to about `budget` tokens around `inquiry`."""
+        with self._lock:
+            turns = list(self.turns)
+        if not turns:
+            return "(first message)"
+        lines = ["Earlier in this conversation:"]
+        for turn in turns:
+            lines += [f"- Customer asked: {turn.inquiry}", f"  We answered: {turn.answer}"]
+        passages = self.passages()
+        if passages:
+            lines += ["", "Passages already retrieved (quote these; search only for what they don't cover):", *passages]
+        return compact("\n".join(lines), budget, query=inquiry)
+
+
+class SessionCache:
+    """LRU + TTL map of session ID -> ChatSession (see the module docstring)."""
+
+    def __init__(
+        self, max_sessions: int = 1000, ttl_seconds: float = 1800, max_turns: int = 4, max_bytes: int = 64 * 1024
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_turns = max_turns
+        self.max_bytes = max_bytes
+        self.created = 0
+        self.resumed = 0
+        self.expired = 0
+        self.evictions = 0
+        # Counters of sessions that are gone, so the totals never go down
+        self._retired = {"search_hits": 0, "trimmed": 0}
+        self._sessions: "OrderedDict[str, ChatSession]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def session(self, session_id: Optional[str] = None) -> ChatSession:
+        """The live session `session_id`, or a new one under a freshly issued ID."""
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            existing = self._sessions.get(session_id) if session_id else None
+            if existing is not None:
+                existing.touched_at = now
+                self._sessions.move_to_end(session_id)
+                self.resumed += 1
+                return existing
+            created = ChatSession(secrets.token_urlsafe(18), self.max_turns, self.max_bytes)
+            self._sessions[created.id] = created
+            self.created += 1
+            while len(self._sessions) > self.max_sessions:
+                self._retire(self._sessions.popitem(last=False)[1])
+                self.evictions += 1
+            return created
+
+    def _expire(self, now: float) -> None:
+        # Oldest-touched first, so stop at the first live one
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.touched_at <= self.ttl_seconds:
+                break
+            self._retire(self._sessions.popitem(last=False)[1])
+            self.expired += 1
+
+    def _retire(self, session: ChatSession) -> None:
+        self._retired["search_hits"] += session.search_hits
+        self._retired["trimmed"] += session.trimmed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._expire(time.time())
+            sessions = list(self._sessions.values())
+            counted = self.created + self.resumed
+            resumed_ratio = self.resumed / counted if counted else 0.0
+            retired = dict(self._retired)
+            stats = {
+                "sessions": len(sessions),
+                "created": self.created,
+                "resumed": self.resumed,
+                "resumed_ratio": round(resumed_ratio, 4),
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+        sizes = [session.nbytes() for session in sessions]
+        stats.update(
+            {
+                "bytes": sum(sizes),
+                "max_session_bytes": max(sizes, default=0),
+                "session_byte_cap": self.max_bytes,
+                "turns": sum(len(session.turns) for session in sessions),
+                "search_hits": retired["search_hits"] + sum(session.search_hits for session in sessions),
+                "trimmed": retired["trimmed"] + sum(session.trimmed for session in sessions),
+            }
+        )
+        return stats
@@ -0,0 +1,30 @@
+from answer_validator import QAGate
+from page_index import PassageIndex
+from page_store import PageSnapshotStore
+from utils import get_int_setting, get_setting
+
+# The four pages the support crew answers from. They are fetched once at
+# startup and refreshed in the background (see main.py); the crew's tools and
+# the QA gate only read the in-memory snapshots. Nothing here imports crewai,
+# so main.py can serve /stats and start up before any crew is built.
+SIKKA_BASE_URL = get_setting("SIKKA_BASE_URL", "https://www.sikka.ai").rstrip("/")
+sikka_pages = PageSnapshotStore(
+    {
+        "landing": f"{SIKKA_BASE_URL}/",
+        "about": f"{SIKKA_BASE_URL}/about-us",
+        "oneapi": f"{SIKKA_BASE_URL}/oneapi",
+        "prime": f"{SIKKA_BASE_URL}/sikka-prime",
+    },
+    refresh_seconds=get_int_setting("SIKKA_PAGE_REFRESH_SECONDS", 900),
+)
+
+# BM25 index over the snapshots, rebuilt when a page changes. With
+# SUPPORT_RETRIEVAL on (the default) the support agent searches it for the
+# top-k passages instead of reading whole pages into its prompt.
+sikka_index = PassageIndex(sikka_pages, path=get_setting("SIKKA_INDEX_PATH", ".cache/sikka_index.npz"))
+SUPPORT_RETRIEVAL = get_setting("SUPPORT_RETRIEVAL", "on").lower() != "off"
+SUPPORT_RETRIEVAL_TOP_K = get_int_setting("SUPPORT_RETRIEVAL_TOP_K", 5)
+
+# Drafts that already follow the template and quote the pages verbatim skip the
+# QA agent; set SUPPORT_QA_GATE=off to always run the review.
+qa_gate = QAGate(sikka_pages, enabled=get_setting("SUPPORT_QA_GATE", "on").lower() != "off")
@@ -1,19 +1,88 @@
+import os
+import time
+
 import streamlit as st
 import requests
 
+from chat_client import ChatClient
+
+# Progress labels for the SSE events emitted by /chat/stream
+STEP_LABELS = {
+    "task_start": "🧠 {agent} is working…",
+    "step": "🔎 {agent} used {tool}",
+    "task_end": "✅ {agent} finished",
+}
+ERROR_REPLY = "Sorry, something went wrong."
+
+# Only the latest messages are drawn on each turn; older ones on request
+HISTORY_WINDOW = int(os.getenv("CHAT_HISTORY_WINDOW", 20))
+# Redraw the streaming reply at most this often (each redraw re-renders its Markdown)
+RENDER_INTERVAL_SECONDS = float(os.getenv("CHAT_RENDER_INTERVAL_SECONDS", 0.05))
+
+
 # ── Session state initialization ──────────────────────────────────
 if "step" not in st.session_state:
     st.session_state.step = 0
     st.session_state.practice_name = ""
     st.session_state.user_name = ""
+    # Issued by the server on the first reply; keeps follow-ups in one conversation
+    st.session_state.chat_session_id = None
     st.session_state.messages = [
         {"sender": "bot", "content": "Welcome! What is your practice name?"}
     ]
+if "chat_client" not in st.session_state:
+    # One pooled HTTP session per browser session, reused on every turn
+    st.session_state.chat_client = ChatClient.from_env()
 
 st.set_page_config(page_title="Sikka Chatbot Assistant")
 
+
+def say(sender: str, content: str) -> None:
+    """Add a message to the history and draw it now (no rerun needed)."""
+    st.session_state.messages.append({"sender": sender, "content": content})
+    st.chat_message(sender).markdown(content)
+
+
+def stream_reply(inquiry: str) -> str:
+    """Draw the crew's progress and the reply as it streams in; returns the full reply."""
+    status = st.empty()
+    reply = st.empty()
+    status.caption("Sikka is typing…")
+    bot_reply = ""
+    drawn_at = 0.0
+    try:
+        for event in st.session_state.chat_client.stream(
+            st.session_state.practice_name, inquiry, st.session_state.chat_session_id
+        ):
+            kind = event["type"]
+            if event.get("session_id"):
+                st.session_state.chat_session_id = event["session_id"]
+            if kind in STEP_LABELS and (kind != "step" or event.get("tool")):
+                status.caption(STEP_LABELS[kind].format(**event))
+            elif kind == "token":
+                bot_reply += event["text"]
+                if time.monotonic() - drawn_at >= RENDER_INTERVAL_SECONDS:
+                    reply.markdown(bot_reply + "▌")
+                    drawn_at = time.monotonic()
+            elif kind == "done":
+                bot_reply = event["response"]
+            elif kind == "error":
+                bot_reply = ERROR_REPLY
+    except requests.RequestException:
+        bot_reply = ERROR_REPLY
+    status.empty()
+    bot_reply = bot_reply or ERROR_REPLY
+    reply.markdown(bot_reply)
+    return bot_reply
+
+
 # ── Display past messages ─────────────────────────────────────────
-for msg in st.session_state.messages:
+messages = st.session_state.messages
+hidden = max(0, len(messages) - HISTORY_WINDOW)
+if hidden and st.checkbox(f"Show {hidden} earlier messages", key="show_earlier"):
+    for msg in messages[:hidden]:
+        st.chat_message(msg["sender"]).markdown(msg["content"])
+for msg in messages[hidden:]:
     st.chat_message(msg["sender"]).markdown(msg["content"])
 
 # ── Input handling ────────────────────────────────────────────────
@@ -22,10 +91,8 @@ if st.session_state.step == 0:
     practice = st.chat_input("Practice name…")
     if practice:
         st.session_state.practice_name = practice
-        st.session_state.messages.append({"sender": "user", "content": practice})
-        st.session_state.messages.append(
-            {"sender": "bot", "content": "Great! What is your name?"}
-        )
+        say("user", practice)
+        say("bot", "Great! What is your name?")
         st.session_state.step = 1
 
 elif st.session_state.step == 1:
@@ -33,34 +100,16 @@ elif st.session_state.step == 1:
     name = st.chat_input("Your name…")
     if name:
         st.session_state.user_name = name
-        st.session_state.messages.append({"sender": "user", "content": name})
-        st.session_state.messages.append(
-            {"sender": "bot", "content": "How can I help you today?"}
-        )
+        say("user", name)
+        say("bot", "How can I help you today?")
         st.session_state.step = 2
 
 else:
     # main chat loop
     user_input = st.chat_input("Type your message…")
     if user_input:
-        st.session_state.messages.append({"sender": "user", "content": user_input})
-        # show a loading spinner
-        with st.spinner("Sikka is typing…"):
-            res = requests.post(
-                "http://localhost:8000/chat",
-                json={
-                    "customer": st.session_state.practice_name,
-                    "person": st.session_state.user_name,
-                    "inquiry": user_input,
-                },
-                timeout=20,
-            )
-        if res.status_code == 200:
-            bot_reply = res.json().get("response", "Sorry, something went wrong.")
-        else:
-            bot_reply = "Sorry, something went wrong."
-        st.session_state.messages.append(
-            {"sender": "bot", "content": bot_reply}
-        )
-        # Rerun so that messages appear immediately
-        st.experimental_rerun()
+        say("user", user_input)
+        # stream progress, then the reply, as the crew works
+        with st.chat_message("bot"):
+            bot_reply = stream_reply(user_input)
+        st.session_state.messages.append({"sender": "bot", "content": bot_reply})
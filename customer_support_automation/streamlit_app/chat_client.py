@@ -0,0 +1,87 @@
+"""
+HTTP client for the chat API: one pooled `requests.Session`, timeouts and retries.
+
+The Streamlit app keeps one `ChatClient` per browser session (in
+`st.session_state`), so every turn reuses the same kept-alive connection
+instead of opening a new one. `stream()` yields /chat/stream's events as
+they arrive.
+
+Only failures that happen before the crew starts are retried: the
+connection could not be opened, or the server answered 429 (its queue is
+full) or 503. The retry waits for the server's Retry-After when there is
+one, else backs off exponentially. A 502 or a dropped stream is not
+retried, since the crew may have done the work already.
+
+Settings:
+  CHAT_API_URL              http://localhost:8000
+  CHAT_CONNECT_TIMEOUT      5 seconds
+  CHAT_READ_TIMEOUT         60 seconds between bytes (the stream's heartbeats reset it)
+  CHAT_RETRIES              2
+  CHAT_RETRY_BACKOFF        0.5 seconds, doubled each retry
+"""
+import json
+import os
+from typing import Any, Dict, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class ChatClient:
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        connect_timeout: float = 5,
+        read_timeout: float = 60,
+        retries: int = 2,
+        backoff: float = 0.5,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            status_forcelist=(429, 503),
+            # The chat routes are POSTs; only the failures above are retried
+            allowed_methods=frozenset({"GET", "POST"}),
+            backoff_factor=backoff,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_env(cls) -> "ChatClient":
+        return cls(
+            base_url=os.getenv("CHAT_API_URL", "http://localhost:8000"),
+            connect_timeout=float(os.getenv("CHAT_CONNECT_TIMEOUT", 5)),
+            read_timeout=float(os.getenv("CHAT_READ_TIMEOUT", 60)),
+            retries=int(os.getenv("CHAT_RETRIES", 2)),
+            backoff=float(os.getenv("CHAT_RETRY_BACKOFF", 0.5)),
+        )
+
+    def stream(self, customer: str, inquiry: str, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the JSON payload of each /chat/stream event. Raises
+        requests.RequestException when the request fails or the server
+        answers with an error status.
+        """
+        with self.session.post(
+            f"{self.base_url}/chat/stream",
+            json={"customer": customer, "inquiry": inquiry, "session_id": session_id},
+            stream=True,
+            timeout=self.timeout,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if line and line.startswith("data:"):
+                    yield json.loads(line[len("data:"):].strip())
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,70 @@
+import pytest
+
+import answer_cache
+from answer_cache import AnswerCache, DiskBackend, MemoryBackend, answer_key, build_answer_cache, normalize_inquiry
+
+
+@pytest.fixture(params=["memory", "disk"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(max_entries=2)
+    return DiskBackend(str(tmp_path / "answers.sqlite3"), max_entries=2)
+
+
+def test_normalize_folds_case_punctuation_and_whitespace():
+    assert normalize_inquiry("  What is   OneAPI?? ") == "what is oneapi"
+    assert normalize_inquiry("what is OneAPI") == normalize_inquiry("What  is oneapi!")
+    # Words are never dropped, so questions that differ by a word stay apart
+    assert normalize_inquiry("what is oneapi") != normalize_inquiry("is oneapi")
+
+
+def test_key_does_not_collide_across_customers(backend):
+    cache = AnswerCache(backend, ttl_seconds=60)
+    cache.set("What does Sikka Prime cost?", "Hi Acme, ...", customer="Acme Dental")
+    assert cache.get("what does sikka prime cost", customer="acme  dental") == "Hi Acme, ..."
+    assert cache.get("What does Sikka Prime cost?", customer="Maple Grove Dental") is None
+    assert answer_key("a b", "c") != answer_key("b", "c a")
+
+
+def test_expired_entries_miss_and_are_dropped(backend, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = AnswerCache(backend, ttl_seconds=60)
+    cache.set("pricing", "answer", customer="Acme")
+    now[0] += 59
+    assert cache.get("pricing", customer="Acme") == "answer"
+    now[0] += 2
+    assert cache.get("pricing", customer="Acme") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"], stats["entries"]) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted(backend, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = AnswerCache(backend, ttl_seconds=3600)
+    for inquiry in ("pricing", "oneapi"):
+        now[0] += 1
+        cache.set(inquiry, inquiry.upper())
+    now[0] += 1
+    assert cache.get("pricing") == "PRICING"
+    now[0] += 1
+    cache.set("prime", "PRIME")
+
+    assert cache.get("oneapi") is None
+    assert cache.get("pricing") == "PRICING"
+    assert cache.get("prime") == "PRIME"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_disk_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "answers.sqlite3")
+    build_answer_cache("disk", 60, 10, path).set("pricing", "answer", customer="Acme")
+    assert build_answer_cache("disk", 60, 10, path).get("pricing", customer="Acme") == "answer"
+
+
+def test_unknown_backend_is_rejected():
+    assert build_answer_cache("off", 60, 10, "") is None
+    with pytest.raises(RuntimeError):
+        build_answer_cache("redis", 60, 10, "")
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from crew_pool import CrewPool, PoolUnavailable
+
+
+class Factory:
+    """Builds numbered stand-in crews; `failures` builds fail first once `fail_after` have succeeded."""
+
+    def __init__(self, fail_after=1, failures=0):
+        self.built = 0
+        self.fail_after = fail_after
+        self.failures = failures
+
+    def __call__(self):
+        if self.built >= self.fail_after and self.failures:
+            self.failures -= 1
+            raise RuntimeError("crew build failed")
+        self.built += 1
+        return f"crew-{self.built}"
+
+
+async def end_lease_while_waiting(pool, error):
+    """
+    Lease the only crew, queue a second request behind it, then end the first
+    lease by raising `error`. Returns (the first request's error, the crew the
+    second request got, or the error it got).
+    """
+    holding = asyncio.Event()
+
+    async def first_request():
+        async with pool.lease():
+            holding.set()
+            await asyncio.sleep(0.01)
+            raise error
+
+    async def waiting():
+        await holding.wait()
+        async with pool.lease() as crew:
+            return crew
+
+    first = asyncio.ensure_future(first_request())
+    second = asyncio.ensure_future(waiting())
+    first_result, second_result = await asyncio.wait_for(
+        asyncio.gather(first, second, return_exceptions=True), timeout=5
+    )
+    return first_result, second_result
+
+
+def test_ordinary_kickoff_error_returns_crew_to_pool():
+    factory = Factory()
+    pool = CrewPool("chat", factory, size=1)
+
+    error, crew = asyncio.run(end_lease_while_waiting(pool, RuntimeError("LLM call failed")))
+    assert isinstance(error, RuntimeError)
+    assert crew == "crew-1"
+    assert factory.built == 1
+    stats = pool.stats()
+    assert stats["discarded"] == 0
+    assert stats["idle"] == 1
+
+
+def test_cancelled_kickoff_rebuilds_crew_after_retry():
+    factory = Factory(fail_after=1, failures=2)
+    pool = CrewPool("chat", factory, size=1, rebuild_attempts=3, rebuild_backoff=0.01)
+
+    error, crew = asyncio.run(end_lease_while_waiting(pool, asyncio.CancelledError()))
+    assert isinstance(error, asyncio.CancelledError)
+    assert crew == "crew-2"
+    stats = pool.stats()
+    assert stats["discarded"] == 1
+    assert stats["rebuild_failures"] == 2
+    assert stats["created"] == 1
+
+
+def test_waiter_fails_instead_of_hanging_when_rebuild_keeps_failing():
+    factory = Factory(fail_after=1, failures=10)
+    pool = CrewPool("chat", factory, size=1, rebuild_attempts=2, rebuild_backoff=0.01)
+
+    _, error = asyncio.run(end_lease_while_waiting(pool, asyncio.CancelledError()))
+    assert isinstance(error, PoolUnavailable)
+    assert error.retry_after >= 1
+    stats = pool.stats()
+    assert stats["rebuild_failures"] == 2
+    assert stats["waiting"] == 0
+    assert stats["created"] == 0
+
+
+def test_pool_recovers_after_rebuild_failures():
+    factory = Factory(fail_after=1, failures=2)
+    pool = CrewPool("chat", factory, size=1, rebuild_attempts=2, rebuild_backoff=0.01)
+
+    async def scenario():
+        _, error = await end_lease_while_waiting(pool, asyncio.CancelledError())
+        assert isinstance(error, PoolUnavailable)
+        # The slot is free again, so the next request builds a fresh crew
+        async with pool.lease() as crew:
+            return crew
+
+    assert asyncio.run(scenario()) == "crew-2"
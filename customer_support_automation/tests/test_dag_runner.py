@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from dag_runner import critical_path, dependencies, run_dag
+
+
+class FakeTask:
+    """Just enough of a crewai Task for run_dag: `context`, `agent`, `execute`, `output`."""
+
+    def __init__(self, name, context=None, seconds=0.0, fails=False, agent=None):
+        self.name = name
+        self.description = name
+        self.context = context or []
+        self.seconds = seconds
+        self.fails = fails
+        self.agent = agent or object()
+        self.tools = []
+        self.output = None
+        self.seen_context = None
+        self.async_execution = False
+
+    def execute(self, agent=None, context=None, tools=None):
+        self.seen_context = context
+        time.sleep(self.seconds)
+        if self.fails:
+            raise RuntimeError(f"{self.name} failed")
+        self.output = type("Output", (), {"raw_output": f"{self.name} done"})()
+        return self.output.raw_output
+
+
+def test_dependencies_follow_context_inside_the_crew():
+    outside = FakeTask("outside")
+    a = FakeTask("a")
+    b = FakeTask("b", context=[a, outside])
+    c = FakeTask("c", context=[b, a])
+    assert dependencies([a, b, c]) == [[], [0], [0, 1]]
+
+
+def test_dependencies_reject_cycles():
+    a, b = FakeTask("a"), FakeTask("b")
+    a.context, b.context = [b], [a]
+    with pytest.raises(ValueError, match="cycle"):
+        dependencies([a, b, FakeTask("c")])
+
+
+def test_critical_path_is_the_longest_dependent_chain():
+    #   0 (1s) -> 2 (1s)
+    #   1 (3s) -> 3 (1s) -> 4 (1s)
+    graph = [[], [], [0], [1], [3, 2]]
+    assert critical_path(graph, [1, 3, 1, 1, 1]) == [1, 3, 4]
+    assert critical_path(graph, [5, 3, 1, 1, 1]) == [0, 2, 4]
+    assert critical_path([], []) == []
+
+
+def test_independent_tasks_overlap_and_context_is_joined():
+    a, b = FakeTask("a", seconds=0.2), FakeTask("b", seconds=0.2)
+    c = FakeTask("c", context=[a, b])
+    run = run_dag([a, b, c], max_workers=2)
+    assert c.seen_context == "a done\nb done"
+    assert a.seen_context is None
+    assert run.wall_seconds < run.serial_seconds
+    assert run.critical_path[-1] == 2
+
+
+def test_tasks_sharing_an_agent_never_overlap():
+    agent = object()
+    a, b = FakeTask("a", seconds=0.1, agent=agent), FakeTask("b", seconds=0.1, agent=agent)
+    run = run_dag([a, b], max_workers=2)
+    first, second = sorted(range(2), key=lambda i: run.started[i])
+    assert run.started[second] >= run.started[first] + run.seconds[first]
+
+
+def test_failure_stops_dependents_and_is_reraised():
+    a = FakeTask("a", fails=True)
+    slow = FakeTask("slow", seconds=0.1)
+    after_a = FakeTask("after_a", context=[a])
+    with pytest.raises(RuntimeError, match="a failed"):
+        run_dag([a, slow, after_a], max_workers=2)
+    # The running task finishes, but nothing new starts after the failure
+    assert slow.output is not None
+    assert after_a.seen_context is None and after_a.output is None
+
+
+def test_execute_overrides_apply():
+    class SkippingTask(FakeTask):
+        def execute(self, agent=None, context=None, tools=None):
+            self.output = type("Output", (), {"raw_output": context})()
+            return context
+
+        def _execute(self, *args, **kwargs):
+            raise AssertionError("run_dag must go through execute()")
+
+    draft = FakeTask("draft")
+    review = SkippingTask("review", context=[draft])
+    run_dag([draft, review])
+    assert review.output.raw_output == "draft done"
+
+
+def test_async_execution_tasks_are_joined():
+    class AsyncTask(FakeTask):
+        # crewai's execute() returns None and leaves the work to `self.thread`
+        def execute(self, agent=None, context=None, tools=None):
+            self.thread = threading.Thread(target=super().execute, args=(agent, context, tools))
+            self.thread.start()
+
+    a = AsyncTask("a", seconds=0.1)
+    a.async_execution = True
+    b = FakeTask("b", context=[a])
+    run_dag([a, b])
+    assert b.seen_context == "a done"
+    assert a.output.raw_output == "a done"
@@ -0,0 +1,122 @@
+import pytest
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+import llm_cache
+from llm_cache import CacheMissError, CompletionCache
+
+LLM = "model=gpt-4o-mini temperature=0.7"
+
+
+def completion(text):
+    return [ChatGeneration(message=AIMessage(content=text))]
+
+
+def text_of(generations):
+    return generations[0].message.content
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "completions.sqlite3")
+
+
+def test_read_through_stores_misses_and_serves_hits(path):
+    cache = CompletionCache(path, mode="read-through")
+    assert cache.lookup("prompt", LLM) is None
+    cache.update("prompt", LLM, completion("answer"))
+    assert text_of(cache.lookup("prompt", LLM)) == "answer"
+    # Any change to the prompt or the model parameters is a different entry
+    assert cache.lookup("prompt ", LLM) is None
+    assert cache.lookup("prompt", LLM.replace("0.7", "0.2")) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 3, 1)
+
+
+def test_record_always_calls_the_llm_and_refreshes(path):
+    CompletionCache(path, mode="read-through").update("prompt", LLM, completion("old"))
+    recorder = CompletionCache(path, mode="record")
+    assert recorder.lookup("prompt", LLM) is None
+    recorder.update("prompt", LLM, completion("new"))
+    assert text_of(CompletionCache(path, mode="replay").lookup("prompt", LLM)) == "new"
+
+
+def test_replay_serves_hits_and_fails_on_a_miss(path):
+    CompletionCache(path, mode="record").update("prompt", LLM, completion("answer"))
+    replay = CompletionCache(path, mode="replay")
+    assert text_of(replay.lookup("prompt", LLM)) == "answer"
+    with pytest.raises(CacheMissError):
+        replay.lookup("another prompt", LLM)
+    # Replay never writes
+    replay.update("another prompt", LLM, completion("answer"))
+    assert replay.stats()["entries"] == 1
+
+
+def test_entries_expire_after_ttl(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = CompletionCache(path, ttl_seconds=60)
+    cache.update("prompt", LLM, completion("answer"))
+    now[0] += 59
+    assert cache.lookup("prompt", LLM) is not None
+    now[0] += 2
+    assert cache.lookup("prompt", LLM) is None
+    assert cache.stats()["expired"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_go_past_max_entries(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    cache = CompletionCache(path, max_entries=2)
+    for prompt in ("a", "b"):
+        now[0] += 1
+        cache.update(prompt, LLM, completion(prompt))
+    now[0] += 1
+    cache.lookup("a", LLM)
+    now[0] += 1
+    cache.update("c", LLM, completion("c"))
+
+    assert cache.lookup("b", LLM) is None
+    assert cache.lookup("a", LLM) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_go_past_max_bytes(path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    probe = CompletionCache(str(path) + ".probe")
+    probe.update("x", LLM, completion("y" * 1000))
+    size = probe.stats()["bytes"]
+
+    cache = CompletionCache(path, max_bytes=int(size * 2.5))
+    for prompt in ("a", "b", "c"):
+        now[0] += 1
+        cache.update(prompt, LLM, completion(prompt * 1000))
+    stats = cache.stats()
+    assert stats["bytes"] <= size * 2.5
+    assert (stats["entries"], stats["evictions"]) == (2, 1)
+    assert cache.lookup("a", LLM) is None
+
+
+def test_install_is_off_by_default_and_rejects_unknown_modes(monkeypatch):
+    monkeypatch.setattr(llm_cache, "get_llm_cache", lambda: None)
+    monkeypatch.delenv("LLM_CACHE_MODE", raising=False)
+    assert llm_cache.install_llm_cache() is None
+    monkeypatch.setenv("LLM_CACHE_MODE", "sometimes")
+    with pytest.raises(RuntimeError):
+        llm_cache.install_llm_cache()
+
+
+def test_streamed_agent_calls_replay_from_the_cache(path):
+    from langchain_core.load import dumps
+    from langchain_core.messages import HumanMessage
+
+    cache = CompletionCache(path, mode="replay")
+    model = llm_cache.chat_model(model="gpt-4o-mini", api_key="unused", cache=cache)
+    messages = [HumanMessage(content="What is OneAPI?")]
+    CompletionCache(path, mode="record").update(dumps(messages), model._get_llm_string(), completion("An API."))
+
+    assert "".join(chunk.content for chunk in model.stream(messages)) == "An API."
+    with pytest.raises(CacheMissError):
+        list(model.stream([HumanMessage(content="Something new")]))
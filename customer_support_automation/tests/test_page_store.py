@@ -0,0 +1,130 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bench.fake_web import FIXTURES, PAGES
+from page_index import PassageIndex
+from page_store import PageSnapshotStore
+
+FIXTURE_BYTES = {path: (FIXTURES / name).read_bytes() for path, name in PAGES.items()}
+
+
+class FixtureSite:
+    """The Sikka fixture pages on an ephemeral port; `status` and `bodies` override them per path."""
+
+    def __init__(self):
+        self.status = {}
+        self.bodies = {}
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status = site.status.get(self.path, 200)
+                body = site.bodies.get(self.path, FIXTURE_BYTES.get(self.path, b"not found"))
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def pages(self):
+        return {name.rsplit(".", 1)[0]: self.url + path for path, name in PAGES.items()}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def site():
+    site = FixtureSite()
+    yield site
+    site.close()
+
+
+@pytest.fixture
+def store(site):
+    store = PageSnapshotStore(site.pages(), refresh_seconds=3600, timeout=5)
+    store.refresh()
+    return store
+
+
+def test_initial_refresh_fills_every_snapshot(store):
+    snapshots = store.snapshots()
+    assert set(snapshots) == set(store.pages)
+    for name, snapshot in snapshots.items():
+        assert snapshot.url == store.pages[name]
+        assert snapshot.text.strip()
+    assert store.stats()["failures"] == 0
+
+
+def test_server_error_keeps_last_good_snapshot(site, store):
+    before = store.snapshots()["oneapi"]
+    site.status["/oneapi"] = 500
+    store.refresh()
+
+    assert store.snapshots()["oneapi"] == before
+    page = store.stats()["pages"]["oneapi"]
+    assert page["failures"] == 1
+    assert "500" in page["last_error"]
+    assert store.stats()["failures"] == 1
+
+    # The next good fetch clears the error but the count stays
+    del site.status["/oneapi"]
+    store.refresh()
+    page = store.stats()["pages"]["oneapi"]
+    assert page["last_error"] is None
+    assert page["failures"] == 1
+
+
+def test_stopped_server_keeps_every_snapshot(site, store):
+    before = store.snapshots()
+    site.close()
+    store.refresh()
+
+    assert store.snapshots() == before
+    stats = store.stats()
+    assert stats["failures"] == len(before)
+    assert all(page["last_error"] for page in stats["pages"].values())
+
+
+def test_changed_page_notifies_listeners_and_rebuilds_index(site, store):
+    calls = []
+    store.add_listener(calls.append)
+    index = PassageIndex(store)
+    index.rebuild()
+    builds = index.builds
+
+    # Nothing changed: no callbacks, no rebuild
+    store.refresh()
+    assert calls == []
+    assert index.builds == builds
+
+    site.bodies["/about-us"] = b"<html><body><p>Sikka now answers the phone in under four seconds.</p></body></html>"
+    store.refresh()
+    assert calls == [store]
+    assert index.builds == builds + 1
+    assert "four seconds" in index.search("how fast is the phone answered", k=1)[0].text
+
+
+def test_stats_report_age_and_size(store):
+    stats = store.stats()
+    sizes = {name.rsplit(".", 1)[0]: len(FIXTURE_BYTES[path]) for path, name in PAGES.items()}
+    assert {name: page["size_bytes"] for name, page in stats["pages"].items()} == sizes
+    assert stats["total_bytes"] == sum(sizes.values())
+    assert stats["refreshes"] == 1
+
+    ages = [page["age_seconds"] for page in stats["pages"].values()]
+    assert all(0 <= age < 5 for age in ages)
+    time.sleep(0.2)
+    later = [page["age_seconds"] for page in store.stats()["pages"].values()]
+    assert all(new >= old + 0.15 for old, new in zip(ages, later))
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+import search_cache
+from search_cache import SearchCache, cached_search, normalize_query
+
+
+def test_normalize_folds_case_punctuation_and_whitespace_only():
+    assert normalize_query("  What is the AAPL stock price?? ") == "what is the aapl stock price"
+    assert normalize_query("$AAPL up 3.5%") == "$aapl up 3.5%"
+    # Every word counts, in order
+    assert normalize_query("which plans include OneAPI") != normalize_query("plans include OneAPI")
+    assert normalize_query("show Sikka Prime pricing") != normalize_query("Sikka Prime pricing")
+    assert normalize_query("flights NYC to LA") != normalize_query("flights LA to NYC")
+
+
+def test_hit_after_first_search():
+    cache = SearchCache()
+    calls = []
+    search = lambda: calls.append(1) or "results"
+    assert cache.fetch("serper", "Sikka OneAPI", search) == "results"
+    assert cache.fetch("serper", "sikka  oneapi!", search) == "results"
+    assert cache.fetch("other-endpoint", "Sikka OneAPI", search) == "results"
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_concurrent_identical_queries_share_one_search():
+    cache = SearchCache()
+    release = threading.Event()
+    calls = []
+
+    def search():
+        calls.append(1)
+        release.wait(5)
+        return "results"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.fetch("serper", "sikka prime", search)))
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    while cache.stats()["in_flight"] == 0 or cache.coalesced < 4:
+        release.wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["results"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_failures_and_error_payloads_are_not_cached():
+    cache = SearchCache()
+
+    def failing():
+        raise RuntimeError("serper down")
+
+    with pytest.raises(RuntimeError):
+        cache.fetch("serper", "sikka", failing)
+    assert cache.fetch("serper", "sikka", lambda: {"message": "quota"}) == {"message": "quota"}
+    assert cache.fetch("serper", "sikka", lambda: "results") == "results"
+    assert cache.errors == 1
+    assert cache.misses == 3
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache = SearchCache(ttl_seconds=60)
+    cache.fetch("serper", "sikka", lambda: "old")
+    now[0] += 59
+    assert cache.fetch("serper", "sikka", lambda: "new") == "old"
+    now[0] += 2
+    assert cache.fetch("serper", "sikka", lambda: "new") == "new"
+    assert cache.expired == 1
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(search_cache.time, "time", lambda: now[0])
+    cache = SearchCache(max_entries=2)
+    for query in ("a", "b"):
+        now[0] += 1
+        cache.fetch("serper", query, lambda: query)
+    now[0] += 1
+    cache.fetch("serper", "a", lambda: "miss")
+    now[0] += 1
+    cache.fetch("serper", "c", lambda: "c")
+
+    assert cache.fetch("serper", "b", lambda: "refetched") == "refetched"
+    assert cache.evictions >= 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_cached_search_wraps_a_tool_once(monkeypatch):
+    monkeypatch.setattr(search_cache, "_search_cache", SearchCache())
+
+    class Tool:
+        search_url = "https://google.serper.dev/search"
+        calls = 0
+
+        def _run(self, search_query):
+            Tool.calls += 1
+            return f"results for {search_query}"
+
+    tool = cached_search(cached_search(Tool()))
+    assert tool._run(search_query="Sikka Prime") == "results for Sikka Prime"
+    assert tool._run(search_query="sikka prime?") == "results for Sikka Prime"
+    assert Tool.calls == 1
@@ -0,0 +1,69 @@
+import session_cache
+from session_cache import SessionCache
+
+
+def test_ids_are_issued_by_the_server():
+    cache = SessionCache()
+    first = cache.session()
+    assert len(first.id) >= 24
+    assert cache.session(first.id) is first
+
+    # A client-chosen or stale ID never names a session
+    guessed = cache.session("alice")
+    assert guessed.id != "alice"
+    assert not guessed.turns
+    assert cache.session("alice") is not guessed
+    assert cache.stats()["resumed"] == 1
+
+
+def test_least_recently_used_session_is_evicted():
+    cache = SessionCache(max_sessions=2)
+    a, b = cache.session(), cache.session()
+    assert cache.session(a.id) is a
+    cache.session()
+
+    assert cache.session(a.id) is a
+    assert cache.session(b.id) is not b
+    assert cache.stats()["evictions"] == 2
+
+
+def test_sessions_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_cache.time, "time", lambda: now[0])
+    cache = SessionCache(ttl_seconds=60)
+    session = cache.session()
+    session.add_turn("What is OneAPI?", "An API for practice data.")
+
+    now[0] += 59
+    assert cache.session(session.id) is session
+    now[0] += 61
+    assert cache.stats()["sessions"] == 0
+    fresh = cache.session(session.id)
+    assert fresh is not session and fresh.id != session.id
+    assert cache.stats()["expired"] == 1
+
+
+def test_session_is_held_to_its_byte_cap():
+    cache = SessionCache(max_bytes=2000, max_turns=10)
+    session = cache.session()
+    session.remember_search("oneapi", "OneAPI passage. " * 40)
+    session.remember_search("prime", "Sikka Prime passage. " * 40)
+    for i in range(5):
+        session.add_turn(f"question {i} " * 10, f"answer {i} " * 20)
+
+    assert session.nbytes() <= 2000
+    # Passages go before turns, and the newest turn is kept
+    assert not session.searches
+    assert session.turns[-1].inquiry.startswith("question 4")
+    stats = cache.stats()
+    assert stats["trimmed"] == session.trimmed > 0
+    assert stats["max_session_bytes"] <= stats["session_byte_cap"] == 2000
+
+
+def test_repeated_search_is_answered_from_the_session():
+    session = SessionCache().session()
+    session.remember_search("How much is Sikka Prime?", "Prime pricing passage\nSource: https://www.sikka.ai/sikka-prime")
+    assert session.search_result("how much is sikka prime") is not None
+    assert session.search_hits == 1
+    session.add_turn("How much is Sikka Prime?", "See the Prime page.")
+    assert "Prime pricing passage" in session.context("and the API?")
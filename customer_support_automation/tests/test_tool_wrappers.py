@@ -0,0 +1,41 @@
+from tool_wrappers import wrap_tool_run
+
+
+class Tool:
+    name = "search"
+
+    def _run(self, search_query):
+        return f"results for {search_query}"
+
+
+def tagging(tag, calls):
+    def wrapper(run):
+        def tagged_run(*args, **kwargs):
+            calls.append(tag)
+            return run(*args, **kwargs)
+
+        return tagged_run
+
+    return wrapper
+
+
+def test_wraps_once_per_marker():
+    tool, calls = Tool(), []
+    assert wrap_tool_run(tool, tagging("cache", calls), "_cached")
+    assert not wrap_tool_run(tool, tagging("cache", calls), "_cached")
+    assert tool._run("dental billing") == "results for dental billing"
+    assert calls == ["cache"]
+    assert tool._run.__name__ == "_run"
+
+
+def test_last_wrapper_applied_runs_outermost():
+    tool, calls = Tool(), []
+    wrap_tool_run(tool, tagging("cache", calls), "_cached")
+    wrap_tool_run(tool, tagging("timer", calls), "_timed")
+    wrap_tool_run(tool, tagging("budget", calls), "_counted")
+    tool._run(search_query="sikka")
+    assert calls == ["budget", "timer", "cache"]
+
+
+def test_skips_objects_without_run():
+    assert not wrap_tool_run(object(), tagging("cache", []), "_cached")
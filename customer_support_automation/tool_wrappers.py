@@ -0,0 +1,38 @@
+"""
+Wrapping a crewai tool's `_run` in place.
+
+Up to three things wrap the same tool instances, each once, at a different
+time (customer_support_automation's crews get all three):
+
+  search_cache.cached_search     when the tool is built (module import)
+  metrics.instrument_crew        when a crew using it is built
+  budgeted_task.BudgetedTask     when a task using it starts
+
+Wrappers nest in the order they are applied: the last one applied runs
+outermost. So a search goes budget counter -> metrics timer -> cache lookup
+-> the real search, and the timer records cache hits as well as live calls.
+Nothing here imports crewai, so crewai-free modules can use it.
+"""
+import functools
+from typing import Any, Callable
+
+Run = Callable[..., Any]
+
+
+def wrap_tool_run(tool: Any, wrapper: Callable[[Run], Run], marker: str) -> bool:
+    """
+    Replace `tool._run` with `wrapper(tool._run)` and set the `marker` attribute.
+
+    A tool that already has `marker` (or has no `_run`) is left alone, so
+    shared tool instances are wrapped once however many crews use them.
+    The new `_run` wraps whatever `_run` was before, so it runs outside
+    every wrapper applied earlier. Returns True if the tool was wrapped.
+    """
+    if getattr(tool, marker, False) or not hasattr(tool, "_run"):
+        return False
+    run = tool._run
+    wrapped = functools.wraps(run)(wrapper(run))
+    # crewai_tools tools are pydantic models; bypass field validation
+    object.__setattr__(tool, "_run", wrapped)
+    object.__setattr__(tool, marker, True)
+    return True
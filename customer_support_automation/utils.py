@@ -14,3 +14,20 @@ def get_serper_api_key() -> str:
     if not key:
         raise RuntimeError("SERPER_API_KEY not set in .env")
     return key
+
+
+def get_int_setting(name: str, default: int) -> int:
+    load_dotenv()
+    value = os.getenv(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise RuntimeError(f"{name} must be an integer, got {value!r}")
+
+
+def get_setting(name: str, default: str) -> str:
+    load_dotenv()
+    value = os.getenv(name)
+    return default if value is None or value.strip() == "" else value.strip()
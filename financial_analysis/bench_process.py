@@ -0,0 +1,117 @@
+"""
+Compare the hierarchical manager with the static plan (main.build_crew).
+
+Each mode runs the trading crew `--runs` times and reports LLM calls, prompt
+and completion tokens and wall time. crewai streams completions, so the API's
+usage field never arrives: tokens are counted from the text with tiktoken, or
+estimated at four characters per token without it.
+
+Against the real API this costs money, so point it at the fake servers in
+customer_support_automation/bench first:
+
+    (cd ../customer_support_automation && python -m bench.fake_openai --port 8767 --tool-rate 0.5) &
+    (cd ../customer_support_automation && python -m bench.fake_web --port 8765) &
+    OPENAI_API_KEY=bench SERPER_API_KEY=bench \\
+    OPENAI_API_BASE=http://127.0.0.1:8767/v1 SERPER_SEARCH_URL=http://127.0.0.1:8765/search \\
+    python bench_process.py --runs 3
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from statistics import mean
+from typing import Any, Dict, List
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from main import PROCESSES, build_crew, financial_trading_inputs
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    return len(encoding.encode(text, disallowed_special=())) if encoding else math.ceil(len(text) / 4)
+
+
+class UsageCounter(BaseCallbackHandler):
+    """Counts LLM calls and the tokens of their prompts and completions."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, **kwargs: Any) -> None:
+        tokens = sum(count_tokens(str(message.content)) for batch in messages for message in batch)
+        with self._lock:
+            self.prompt_tokens += tokens
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        tokens = sum(count_tokens(generation.text) for batch in response.generations for generation in batch)
+        with self._lock:
+            self.calls += 1
+            self.completion_tokens += tokens
+
+
+def run_once(process: str) -> Dict[str, Any]:
+    crew = build_crew(process)
+    counter = UsageCounter()
+    llms = [agent.llm for agent in crew.agents] + ([crew.manager_llm] if crew.manager_llm else [])
+    for llm in llms:
+        llm.callbacks = (llm.callbacks or []) + [counter]
+    started = time.perf_counter()
+    # The crew is verbose; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        crew.kickoff(inputs=financial_trading_inputs)
+    return {
+        "llm_calls": counter.calls,
+        "prompt_tokens": counter.prompt_tokens,
+        "completion_tokens": counter.completion_tokens,
+        "wall_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, float]:
+    return {key: round(mean(run[key] for run in runs), 3) for key in runs[0]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--processes", default=",".join(PROCESSES))
+    parser.add_argument("--out", help="write the results as JSON here")
+    args = parser.parse_args()
+    if not os.getenv("OPENAI_API_BASE"):
+        print("OPENAI_API_BASE is not set: this benchmark will call (and bill) the real API", file=sys.stderr)
+
+    results = {}
+    for process in args.processes.split(","):
+        runs = [run_once(process) for _ in range(args.runs)]
+        results[process] = {"runs": runs, "mean": summarize(runs)}
+
+    print(f"{'process':<14}{'llm calls':>10}{'prompt tok':>12}{'compl. tok':>12}{'wall s':>9}")
+    for process, result in results.items():
+        m = result["mean"]
+        print(
+            f"{process:<14}{m['llm_calls']:>10}{m['prompt_tokens']:>12}"
+            f"{m['completion_tokens']:>12}{m['wall_seconds']:>9}"
+        )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"runs_per_process": args.runs, "results": results}, f, indent=2)
@@ -0,0 +1,165 @@
+"""
+Shared HTTP client for page fetches and scrape tools.
+
+One keep-alive `requests.Session` per process. Its connection pools are sized
+to a per-host limit, which a semaphore also enforces, so a crew can't open
+dozens of sockets to one site. Every request gets a connect/read timeout.
+`fetch_many` fetches a list of URLs concurrently. Per-host timings are kept
+for /stats and /metrics.
+
+Settings (read once, by `shared_client`):
+  HTTP_MAX_PER_HOST              concurrent requests per host (default 6, like browsers)
+  HTTP_MAX_CONCURRENCY           worker threads for fetch_many (default 16)
+  HTTP_CONNECT_TIMEOUT_SECONDS   default 5
+  HTTP_READ_TIMEOUT_SECONDS      default 15
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def html_to_text(html: bytes) -> str:
+    """Same flattening ScrapeWebsiteTool applies, so agents see identical page text."""
+    text = BeautifulSoup(html, "html.parser").get_text()
+    text = "\n".join(line for line in text.split("\n") if line.strip() != "")
+    return " ".join(word for word in text.split(" ") if word.strip() != "")
+
+
+class _HostStats:
+    __slots__ = ("requests", "errors", "in_flight", "seconds_total", "seconds_max", "bytes_total")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.seconds_total = 0.0
+        self.seconds_max = 0.0
+        self.bytes_total = 0
+
+
+class HttpClient:
+    """Pooled, per-host-limited HTTP client (see the module docstring)."""
+
+    def __init__(
+        self,
+        max_per_host: int = 6,
+        max_concurrency: int = 16,
+        connect_timeout: float = 5,
+        read_timeout: float = 15,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.max_per_host = max_per_host
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        self.session.headers.update(headers or DEFAULT_HEADERS)
+        # pool_maxsize matches the semaphore, so every request reuses a pooled connection
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max_per_host)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="http-fetch")
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats: Dict[str, _HostStats] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> Tuple[str, threading.BoundedSemaphore, _HostStats]:
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._stats[host] = _HostStats()
+            return host, self._hosts[host], self._stats[host]
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """`session.request` under the host's limit, with the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        _, limit, stats = self._host(url)
+        with limit:
+            with self._lock:
+                stats.in_flight += 1
+            started = time.perf_counter()
+            response = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                return response
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    stats.in_flight -= 1
+                    stats.requests += 1
+                    stats.seconds_total += elapsed
+                    stats.seconds_max = max(stats.seconds_max, elapsed)
+                    if response is None or response.status_code >= 400:
+                        stats.errors += 1
+                    else:
+                        stats.bytes_total += len(response.content)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def fetch_many(self, urls: Iterable[str], **kwargs: Any) -> List[Union[requests.Response, Exception]]:
+        """GET every URL concurrently; results (a response or the exception) in input order."""
+
+        def fetch(url: str) -> Union[requests.Response, Exception]:
+            try:
+                return self.get(url, **kwargs)
+            except Exception as e:
+                return e
+
+        return list(self._executor.map(fetch, list(urls)))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host request counts and timings."""
+        with self._lock:
+            return {
+                host: {
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "in_flight": s.in_flight,
+                    "seconds_total": round(s.seconds_total, 4),
+                    "seconds_max": round(s.seconds_max, 4),
+                    "seconds_avg": round(s.seconds_total / s.requests, 4) if s.requests else 0.0,
+                    "bytes_total": s.bytes_total,
+                }
+                for host, s in self._stats.items()
+            }
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def shared_client() -> HttpClient:
+    """The process-wide client, built from the HTTP_* settings on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                max_per_host=int(os.getenv("HTTP_MAX_PER_HOST", 6)),
+                max_concurrency=int(os.getenv("HTTP_MAX_CONCURRENCY", 16)),
+                connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", 5)),
+                read_timeout=float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", 15)),
+            )
+        return _client
+
+
+def http_stats() -> Dict[str, Dict[str, Any]]:
+    return _client.stats() if _client is not None else {}
@@ -1,151 +1,177 @@
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task, Crew, Process
 import os
 from utils import get_openai_api_key, get_serper_api_key
+from llm_cache import chat_model, install_llm_cache
+from search_cache import cached_search, search_cache_stats
 
 openai_api_key = get_openai_api_key()
 os.environ["OPENAI_MODEL_NAME"] = 'gpt-3.5-turbo'
 os.environ["SERPER_API_KEY"] = get_serper_api_key()
+# Opt-in completion cache (LLM_CACHE_MODE=read-through / record / replay)
+install_llm_cache()
+
+from crewai_tools import SerperDevTool
+from scrape_tools import PooledScrapeWebsiteTool
+
+# One search tool for all four agents; repeated queries (same ticker, same
+# market) are served from the search cache instead of calling Serper again
+search_tool = cached_search(SerperDevTool(search_url=os.getenv("SERPER_SEARCH_URL", "https://google.serper.dev/search")))
+scrape_tool = PooledScrapeWebsiteTool()
+
+# "hierarchical" (a manager LLM delegates every task) or "static" (see build_crew)
+FINANCIAL_PROCESS = os.getenv("FINANCIAL_PROCESS", "hierarchical").strip().lower()
+PROCESSES = ("hierarchical", "static")
+
+def build_crew(process: str = FINANCIAL_PROCESS) -> Crew:
+    """
+    The trading crew in one of two modes:
+
+      hierarchical  a manager LLM assigns the four tasks and agents may delegate
+                    to each other, at the cost of extra LLM calls per task
+      static        data analysis -> strategy -> execution plan -> risk
+                    assessment as a fixed plan; each task gets the outputs it
+                    builds on as context, with no manager and no delegation
+    """
+    if process not in PROCESSES:
+        raise RuntimeError(f"Unknown FINANCIAL_PROCESS {process!r} (expected hierarchical or static)")
+    static = process == "static"
+    delegation = not static
+
+    data_analyst_agent = Agent(
+        role="Data Analyst",
+        llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
+        goal="Monitor and analyze market data in real-time "
+             "to identify trends and predict market movements.",
+        backstory="Specializing in financial markets, this agent "
+                  "uses statistical modeling and machine learning "
+                  "to provide crucial insights. With a knack for data, "
+                  "the Data Analyst Agent is the cornerstone for "
+                  "informing trading decisions.",
+        verbose=True,
+        allow_delegation=delegation,
+        tools = [scrape_tool, search_tool]
+    )
+
+    trading_strategy_agent = Agent(
+        role="Trading Strategy Developer",
+        llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
+        goal="Develop and test various trading strategies based "
+             "on insights from the Data Analyst Agent.",
+        backstory="Equipped with a deep understanding of financial "
+                  "markets and quantitative analysis, this agent "
+                  "devises and refines trading strategies. It evaluates "
+                  "the performance of different approaches to determine "
+                  "the most profitable and risk-averse options.",
+        verbose=True,
+        allow_delegation=delegation,
+        tools = [scrape_tool, search_tool]
+    )
+
+    execution_agent = Agent(
+        role="Trade Advisor",
+        llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
+        goal="Suggest optimal trade execution strategies "
+             "based on approved trading strategies.",
+        backstory="This agent specializes in analyzing the timing, price, "
+                  "and logistical details of potential trades. By evaluating "
+                  "these factors, it provides well-founded suggestions for "
+                  "when and how trades should be executed to maximize "
+                  "efficiency and adherence to strategy.",
+        verbose=True,
+        allow_delegation=delegation,
+        tools = [scrape_tool, search_tool]
+    )
+
+    risk_management_agent = Agent(
+        role="Risk Advisor",
+        llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
+        goal="Evaluate and provide insights on the risks "
+             "associated with potential trading activities.",
+        backstory="Armed with a deep understanding of risk assessment models "
+                  "and market dynamics, this agent scrutinizes the potential "
+                  "risks of proposed trades. It offers a detailed analysis of "
+                  "risk exposure and suggests safeguards to ensure that "
+                  "trading activities align with the firm’s risk tolerance.",
+        verbose=True,
+        allow_delegation=delegation,
+        tools = [scrape_tool, search_tool]
+    )
+
+    # Task for Data Analyst Agent: Analyze Market Data
+    data_analysis_task = Task(
+        description=(
+            "Continuously monitor and analyze market data for "
+            "the selected stock ({stock_selection}). "
+            "Use statistical modeling and machine learning to "
+            "identify trends and predict market movements."
+        ),
+        expected_output=(
+            "Insights and alerts about significant market "
+            "opportunities or threats for {stock_selection}."
+        ),
+        agent=data_analyst_agent,
+    )
+
+    # Task for Trading Strategy Agent: Develop Trading Strategies
+    strategy_development_task = Task(
+        description=(
+            "Develop and refine trading strategies based on "
+            "the insights from the Data Analyst and "
+            "user-defined risk tolerance ({risk_tolerance}). "
+            "Consider trading preferences ({trading_strategy_preference})."
+        ),
+        expected_output=(
+            "A set of potential trading strategies for {stock_selection} "
+            "that align with the user's risk tolerance."
+        ),
+        agent=trading_strategy_agent,
+        context=[data_analysis_task] if static else None,
+    )
+
+    # Task for Trade Advisor Agent: Plan Trade Execution
+    execution_planning_task = Task(
+        description=(
+            "Analyze approved trading strategies to determine the "
+            "best execution methods for {stock_selection}, "
+            "considering current market conditions and optimal pricing."
+        ),
+        expected_output=(
+            "Detailed execution plans suggesting how and when to "
+            "execute trades for {stock_selection}."
+        ),
+        agent=execution_agent,
+        context=[strategy_development_task] if static else None,
+    )
+
+    # Task for Risk Advisor Agent: Assess Trading Risks
+    risk_assessment_task = Task(
+        description=(
+            "Evaluate the risks associated with the proposed trading "
+            "strategies and execution plans for {stock_selection}. "
+            "Provide a detailed analysis of potential risks "
+            "and suggest mitigation strategies."
+        ),
+        expected_output=(
+            "A comprehensive risk analysis report detailing potential "
+            "risks and mitigation recommendations for {stock_selection}."
+        ),
+        agent=risk_management_agent,
+        context=[strategy_development_task, execution_planning_task] if static else None,
+    )
+
+    agents = [data_analyst_agent, trading_strategy_agent, execution_agent, risk_management_agent]
+    tasks = [data_analysis_task, strategy_development_task, execution_planning_task, risk_assessment_task]
+    if static:
+        return Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+    return Crew(
+        agents=agents,
+        tasks=tasks,
+        manager_llm=chat_model(model="gpt-3.5-turbo",
+                               temperature=0.7),
+        process=Process.hierarchical,
+        verbose=True
+    )
 
-from crewai_tools import ScrapeWebsiteTool, SerperDevTool
-
-search_tool = SerperDevTool()
-scrape_tool = ScrapeWebsiteTool()
-
-data_analyst_agent = Agent(
-    role="Data Analyst",
-    goal="Monitor and analyze market data in real-time "
-         "to identify trends and predict market movements.",
-    backstory="Specializing in financial markets, this agent "
-              "uses statistical modeling and machine learning "
-              "to provide crucial insights. With a knack for data, "
-              "the Data Analyst Agent is the cornerstone for "
-              "informing trading decisions.",
-    verbose=True,
-    allow_delegation=True,
-    tools = [scrape_tool, search_tool]
-)
-
-trading_strategy_agent = Agent(
-    role="Trading Strategy Developer",
-    goal="Develop and test various trading strategies based "
-         "on insights from the Data Analyst Agent.",
-    backstory="Equipped with a deep understanding of financial "
-              "markets and quantitative analysis, this agent "
-              "devises and refines trading strategies. It evaluates "
-              "the performance of different approaches to determine "
-              "the most profitable and risk-averse options.",
-    verbose=True,
-    allow_delegation=True,
-    tools = [scrape_tool, search_tool]
-)
-
-execution_agent = Agent(
-    role="Trade Advisor",
-    goal="Suggest optimal trade execution strategies "
-         "based on approved trading strategies.",
-    backstory="This agent specializes in analyzing the timing, price, "
-              "and logistical details of potential trades. By evaluating "
-              "these factors, it provides well-founded suggestions for "
-              "when and how trades should be executed to maximize "
-              "efficiency and adherence to strategy.",
-    verbose=True,
-    allow_delegation=True,
-    tools = [scrape_tool, search_tool]
-)
-
-risk_management_agent = Agent(
-    role="Risk Advisor",
-    goal="Evaluate and provide insights on the risks "
-         "associated with potential trading activities.",
-    backstory="Armed with a deep understanding of risk assessment models "
-              "and market dynamics, this agent scrutinizes the potential "
-              "risks of proposed trades. It offers a detailed analysis of "
-              "risk exposure and suggests safeguards to ensure that "
-              "trading activities align with the firm’s risk tolerance.",
-    verbose=True,
-    allow_delegation=True,
-    tools = [scrape_tool, search_tool]
-)
-
-# Task for Data Analyst Agent: Analyze Market Data
-data_analysis_task = Task(
-    description=(
-        "Continuously monitor and analyze market data for "
-        "the selected stock ({stock_selection}). "
-        "Use statistical modeling and machine learning to "
-        "identify trends and predict market movements."
-    ),
-    expected_output=(
-        "Insights and alerts about significant market "
-        "opportunities or threats for {stock_selection}."
-    ),
-    agent=data_analyst_agent,
-)
-
-# Task for Trading Strategy Agent: Develop Trading Strategies
-strategy_development_task = Task(
-    description=(
-        "Develop and refine trading strategies based on "
-        "the insights from the Data Analyst and "
-        "user-defined risk tolerance ({risk_tolerance}). "
-        "Consider trading preferences ({trading_strategy_preference})."
-    ),
-    expected_output=(
-        "A set of potential trading strategies for {stock_selection} "
-        "that align with the user's risk tolerance."
-    ),
-    agent=trading_strategy_agent,
-)
-
-# Task for Trade Advisor Agent: Plan Trade Execution
-execution_planning_task = Task(
-    description=(
-        "Analyze approved trading strategies to determine the "
-        "best execution methods for {stock_selection}, "
-        "considering current market conditions and optimal pricing."
-    ),
-    expected_output=(
-        "Detailed execution plans suggesting how and when to "
-        "execute trades for {stock_selection}."
-    ),
-    agent=execution_agent,
-)
-
-# Task for Risk Advisor Agent: Assess Trading Risks
-risk_assessment_task = Task(
-    description=(
-        "Evaluate the risks associated with the proposed trading "
-        "strategies and execution plans for {stock_selection}. "
-        "Provide a detailed analysis of potential risks "
-        "and suggest mitigation strategies."
-    ),
-    expected_output=(
-        "A comprehensive risk analysis report detailing potential "
-        "risks and mitigation recommendations for {stock_selection}."
-    ),
-    agent=risk_management_agent,
-)
-
-from crewai import Crew, Process
-from langchain_openai import ChatOpenAI
-
-# Define the crew with agents and tasks
-financial_trading_crew = Crew(
-    agents=[data_analyst_agent, 
-            trading_strategy_agent, 
-            execution_agent, 
-            risk_management_agent],
-    
-    tasks=[data_analysis_task, 
-           strategy_development_task, 
-           execution_planning_task, 
-           risk_assessment_task],
-    
-    manager_llm=ChatOpenAI(model="gpt-3.5-turbo", 
-                           temperature=0.7),
-    process=Process.hierarchical,
-    verbose=True
-)
 
 # Example data for kicking off the process
 financial_trading_inputs = {
@@ -156,8 +182,11 @@ financial_trading_inputs = {
     'news_impact_consideration': True
 }
 
-### this execution will take some time to run
-result = financial_trading_crew.kickoff(inputs=financial_trading_inputs)
+if __name__ == "__main__":
+    ### this execution will take some time to run
+    financial_trading_crew = build_crew()
+    result = financial_trading_crew.kickoff(inputs=financial_trading_inputs)
+    print("Search cache:", search_cache_stats())
 
-from IPython.display import Markdown
-Markdown(result)
\ No newline at end of file
+    from IPython.display import Markdown
+    Markdown(result)
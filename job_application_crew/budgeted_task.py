@@ -0,0 +1,86 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from crewai import Task
+
+from token_budget import compact, count_tokens, current_entry, ledger
+from tool_wrappers import wrap_tool_run
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _count_tool_output(tool) -> None:
+    """Wrap a tool's `_run` once so its output counts toward the running task's record."""
+
+    def counted(run):
+        def counted_run(*args, **kwargs):
+            output = run(*args, **kwargs)
+            entry = current_entry.get()
+            if entry is not None:
+                entry["tool_output_tokens"] += count_tokens(str(output))
+            return output
+
+        return counted_run
+
+    wrap_tool_run(tool, counted, "_budget_wrapped")
+
+
+def _llm_usage(agent) -> Dict[str, int]:
+    process = getattr(agent, "_token_process", None)
+    return process.get_summary() if process is not None else {}
+
+
+class BudgetedTask(Task):
+    """A Task that accounts its tokens and compacts its context to `context_budget` (see token_budget.py)."""
+
+    name: str = ""
+    context_budget: Optional[int] = None
+
+    def extend_context(self, context: Optional[str]) -> Optional[str]:
+        """Hook for subclasses: material added after compaction, so it's never compacted away."""
+        return context
+
+    def _execute(self, agent, task, context, tools):
+        started = time.perf_counter()
+        entry: Dict[str, Any] = {
+            "task": self.name or self.description[:40],
+            "agent": getattr(agent, "role", None),
+            "budget": self.context_budget,
+            "prompt_tokens": count_tokens(
+                "\n".join([self.description, self.expected_output, agent.role, agent.goal, agent.backstory])
+            ),
+            "context_tokens_before": count_tokens(context),
+            "tool_output_tokens": 0,
+            "compacted": False,
+        }
+        if context and self.context_budget and entry["context_tokens_before"] > self.context_budget:
+            context = compact(context, self.context_budget, query=self.description)
+            entry["compacted"] = True
+            logger.info(
+                "Compacted context for task %r: %d -> %d tokens",
+                entry["task"], entry["context_tokens_before"], count_tokens(context),
+            )
+        entry["context_tokens"] = count_tokens(context)
+        extended = self.extend_context(context)
+        if extended != context:
+            # Added instructions, not upstream output: they count as prompt
+            entry["prompt_tokens"] += count_tokens(extended) - entry["context_tokens"]
+            context = extended
+        for tool in tools or []:
+            _count_tool_output(tool)
+        usage_before = _llm_usage(agent)
+        token = current_entry.set(entry)
+        try:
+            result = super()._execute(agent, task, context, tools)
+        finally:
+            current_entry.reset(token)
+        usage_after = _llm_usage(agent)
+        entry["completion_tokens"] = count_tokens(str(self.output.raw_output if self.output else result))
+        entry["llm_prompt_tokens"] = usage_after.get("prompt_tokens", 0) - usage_before.get("prompt_tokens", 0)
+        entry["llm_completion_tokens"] = (
+            usage_after.get("completion_tokens", 0) - usage_before.get("completion_tokens", 0)
+        )
+        entry["seconds"] = round(time.perf_counter() - started, 3)
+        ledger.record(entry)
+        return result
@@ -0,0 +1,223 @@
+"""
+Run a crew's tasks as a dependency graph instead of strictly in order.
+
+A task depends on the tasks listed in its `context`. A task without `context`
+depends on nothing. Ready tasks run concurrently on a bounded thread pool, and
+a task starts once everything it depends on has finished. Its context is the
+joined output of those tasks, as with sequential crewai, and it runs through
+`Task.execute` so subclass overrides still apply. Two tasks with the
+same agent never run at once, because an agent's executor isn't thread-safe.
+
+Each run's critical path is logged and recorded in `recorder`, along with its
+wall time and the sum of its task times. The critical path is the chain of
+dependent tasks with the longest total time. A well-shaped crew's wall time
+approaches its critical path, not the sum of all its tasks. This module
+doesn't import crewai, so main.py can report the recorder.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def task_label(task, index: int) -> str:
+    name = getattr(task, "name", "") or " ".join(str(task.description).split()[:6])
+    return f"{index}:{name}"
+
+
+def dependencies(tasks: List[Any]) -> List[List[int]]:
+    """Indices of the tasks each task depends on; context tasks outside `tasks` are ignored."""
+    position = {id(task): i for i, task in enumerate(tasks)}
+    graph = [sorted({position[id(dep)] for dep in (task.context or []) if id(dep) in position}) for task in tasks]
+    # Kahn's algorithm, only to reject cycles before anything runs
+    waiting = [len(deps) for deps in graph]
+    ready = deque(i for i, count in enumerate(waiting) if count == 0)
+    seen = 0
+    while ready:
+        done = ready.popleft()
+        seen += 1
+        for i, deps in enumerate(graph):
+            if done in deps:
+                waiting[i] -= 1
+                if waiting[i] == 0:
+                    ready.append(i)
+    if seen != len(tasks):
+        raise ValueError("Task context declarations form a cycle")
+    return graph
+
+
+def critical_path(graph: List[List[int]], seconds: List[float]) -> List[int]:
+    """The chain of dependent tasks with the longest total time, first task first."""
+    finish: Dict[int, float] = {}
+    previous: Dict[int, Optional[int]] = {}
+
+    def visit(i: int) -> float:
+        if i not in finish:
+            best = max(graph[i], key=visit, default=None)
+            previous[i] = best
+            finish[i] = seconds[i] + (finish[best] if best is not None else 0.0)
+        return finish[i]
+
+    if not graph:
+        return []
+    node: Optional[int] = max(range(len(graph)), key=visit)
+    path = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    return path[::-1]
+
+
+@dataclass
+class DagRun:
+    tasks: List[str]
+    graph: List[List[int]]
+    started: List[float]
+    seconds: List[float]
+    wall_seconds: float
+    critical_path: List[int] = field(default_factory=list)
+
+    @property
+    def serial_seconds(self) -> float:
+        return sum(self.seconds)
+
+    @property
+    def critical_path_seconds(self) -> float:
+        return sum(self.seconds[i] for i in self.critical_path)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "serial_seconds": round(self.serial_seconds, 3),
+            "critical_path_seconds": round(self.critical_path_seconds, 3),
+            "critical_path": [self.tasks[i] for i in self.critical_path],
+            "tasks": {
+                name: {"started": round(self.started[i], 3), "seconds": round(self.seconds[i], 3)}
+                for i, name in enumerate(self.tasks)
+            },
+        }
+
+
+def run_dag(
+    tasks: List[Any],
+    max_workers: int = 4,
+    on_start: Optional[Callable[[int], None]] = None,
+) -> DagRun:
+    """
+    Execute `tasks` by their `context` dependencies (see the module docstring)
+    and return the timings. Each task runs in a copy of the caller's context,
+    so context variables (metrics labels, token ledger entries) stay per task.
+    The first failure stops new tasks from starting and is re-raised once the
+    running ones finish.
+    """
+    graph = dependencies(tasks)
+    workers = max(1, max_workers)
+    names = [task_label(task, i) for i, task in enumerate(tasks)]
+    outputs: Dict[int, str] = {}
+    started = [0.0] * len(tasks)
+    seconds = [0.0] * len(tasks)
+    busy_agents = set()
+    pending = list(range(len(tasks)))
+    running: Dict[Any, int] = {}
+    failure: Optional[BaseException] = None
+    run_started = time.perf_counter()
+
+    def execute(i: int) -> str:
+        task = tasks[i]
+        context = "\n".join(outputs[dep] for dep in graph[i]) if graph[i] else None
+        if on_start is not None:
+            on_start(i)
+        started[i] = time.perf_counter() - run_started
+        try:
+            # Through `execute`, so subclass overrides (GatedTask) apply as in a sequential crew
+            result = task.execute(agent=task.agent, context=context, tools=task.tools)
+            if getattr(task, "async_execution", False):
+                # crewai started it on a thread of its own; this task is done when that is
+                task.thread.join()
+            return result
+        finally:
+            seconds[i] = time.perf_counter() - run_started - started[i]
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-task") as pool:
+        while pending or running:
+            if failure is None:
+                for i in list(pending):
+                    agent = id(tasks[i].agent)
+                    if len(running) >= workers or agent in busy_agents:
+                        continue
+                    if all(dep in outputs for dep in graph[i]):
+                        pending.remove(i)
+                        busy_agents.add(agent)
+                        running[pool.submit(contextvars.copy_context().run, execute, i)] = i
+            elif not running:
+                break
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                i = running.pop(future)
+                busy_agents.discard(id(tasks[i].agent))
+                try:
+                    result = future.result()
+                except BaseException as e:
+                    failure = failure or e
+                    continue
+                output = getattr(tasks[i], "output", None)
+                outputs[i] = output.raw_output if output is not None else str(result)
+    if failure is not None:
+        raise failure
+
+    run = DagRun(
+        tasks=names,
+        graph=graph,
+        started=started,
+        seconds=seconds,
+        wall_seconds=time.perf_counter() - run_started,
+        critical_path=critical_path(graph, seconds),
+    )
+    logger.info(
+        "Crew DAG finished in %.2fs (tasks %.2fs serial); critical path %.2fs: %s",
+        run.wall_seconds, run.serial_seconds, run.critical_path_seconds,
+        " -> ".join(names[i] for i in run.critical_path),
+    )
+    recorder.record(run)
+    return run
+
+
+class DagRecorder:
+    """Totals over DAG runs plus the most recent run, for /stats."""
+
+    def __init__(self):
+        self.runs = 0
+        self.wall_seconds = 0.0
+        self.serial_seconds = 0.0
+        self.critical_path_seconds = 0.0
+        self.last: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def record(self, run: DagRun) -> None:
+        with self._lock:
+            self.runs += 1
+            self.wall_seconds += run.wall_seconds
+            self.serial_seconds += run.serial_seconds
+            self.critical_path_seconds += run.critical_path_seconds
+            self.last = run.summary()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self.runs,
+                "wall_seconds": round(self.wall_seconds, 3),
+                "serial_seconds": round(self.serial_seconds, 3),
+                "critical_path_seconds": round(self.critical_path_seconds, 3),
+                # How much of the serial time overlapping tasks saved (1.0 = none)
+                "speedup": round(self.serial_seconds / self.wall_seconds, 3) if self.wall_seconds else None,
+                "last": self.last,
+            }
+
+
+recorder = DagRecorder()
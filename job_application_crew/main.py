@@ -1,26 +1,35 @@
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task
 import os
 from utils import get_openai_api_key, get_serper_api_key
+from llm_cache import chat_model, install_llm_cache
+from budgeted_task import BudgetedTask
+from dag_crew import DagCrew
+from token_budget import ledger
 
 openai_api_key = get_openai_api_key()
 os.environ["OPENAI_MODEL_NAME"] = 'gpt-3.5-turbo'
 os.environ["SERPER_API_KEY"] = get_serper_api_key()
+# Opt-in completion cache (LLM_CACHE_MODE=read-through / record / replay)
+install_llm_cache()
 
 from crewai_tools import (
   FileReadTool,
-  ScrapeWebsiteTool,
   MDXSearchTool,
   SerperDevTool
 )
+from scrape_tools import PooledScrapeWebsiteTool
+from search_cache import cached_search
 
-search_tool = SerperDevTool()
-scrape_tool = ScrapeWebsiteTool()
+# Repeated searches (same company, same role) are served from the search cache
+search_tool = cached_search(SerperDevTool())
+scrape_tool = PooledScrapeWebsiteTool()
 read_resume = FileReadTool(file_path='./fake_resume.md')
 semantic_search_resume = MDXSearchTool(mdx='./fake_resume.md')
 
 # Agent 1: Researcher
 researcher = Agent(
     role="Tech Job Researcher",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Make sure to do amazing analysis on "
          "job posting to help job applicants",
     tools = [scrape_tool, search_tool],
@@ -39,6 +48,7 @@ researcher = Agent(
 # Agent 2: Profiler
 profiler = Agent(
     role="Personal Profiler for Engineers",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Do increditble research on job applicants "
          "to help them stand out in the job market",
     tools = [scrape_tool, search_tool,
@@ -56,6 +66,7 @@ profiler = Agent(
 # Agent 3: Resume Strategist
 resume_strategist = Agent(
     role="Resume Strategist for Engineers",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Find all the best ways to make a "
          "resume stand out in the job market.",
     tools = [scrape_tool, search_tool,
@@ -72,6 +83,7 @@ resume_strategist = Agent(
 # Agent 4: Interview Preparer
 interview_preparer = Agent(
     role="Engineering Interview Preparer",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Create interview questions and talking points "
          "based on the resume and job requirements",
     tools = [scrape_tool, search_tool,
@@ -120,7 +132,10 @@ profile_task = Task(
 )
 
 # Task for Resume Strategist Agent: Align Resume with Job Requirements
-resume_strategy_task = Task(
+resume_strategy_task = BudgetedTask(
+    name="resume_strategy",
+    # Research and profile output beyond this is compacted before tailoring
+    context_budget=int(os.getenv("JOB_CONTEXT_BUDGET", 2000)),
     description=(
         "Using the profile and job requirements obtained from "
         "previous tasks, tailor the resume to highlight the most "
@@ -141,7 +156,9 @@ resume_strategy_task = Task(
 )
 
 # Task for Interview Preparer Agent: Develop Interview Materials
-interview_preparation_task = Task(
+interview_preparation_task = BudgetedTask(
+    name="interview_preparation",
+    context_budget=int(os.getenv("JOB_CONTEXT_BUDGET", 2000)),
     description=(
         "Create a set of potential interview questions and talking "
         "points based on the tailored resume and job requirements. "
@@ -159,7 +176,8 @@ interview_preparation_task = Task(
     agent=interview_preparer
 )
 
-job_application_crew = Crew(
+# Research and profiling don't depend on each other, so "dag" runs them together
+job_application_crew = DagCrew(
     agents=[researcher,
             profiler,
             resume_strategist,
@@ -170,6 +188,7 @@ job_application_crew = Crew(
            resume_strategy_task,
            interview_preparation_task],
 
+    parallel=os.getenv("JOB_TASK_MODE", "dag") == "dag",
     verbose=True
 )
 
@@ -188,6 +207,11 @@ job_application_inputs = {
 
 ### this execution will take a few minutes to run
 result = job_application_crew.kickoff(inputs=job_application_inputs)
+# Tokens per task, and how much context compaction saved
+print(ledger.stats())
+if job_application_crew.last_run is not None:
+    # Wall time vs. the critical path (research/profile -> resume -> interview)
+    print(job_application_crew.last_run.summary())
 
 from IPython.display import Markdown, display
 display(Markdown("./tailored_resume.md"))
@@ -0,0 +1,45 @@
+from typing import Any, List, Optional
+
+from crewai_tools import ScrapeWebsiteTool
+from crewai_tools.tools.scrape_website_tool.scrape_website_tool import FixedScrapeWebsiteToolSchema
+
+from http_client import html_to_text, shared_client
+
+
+class PooledScrapeWebsiteTool(ScrapeWebsiteTool):
+    """
+    ScrapeWebsiteTool on the shared pooled client (http_client.py).
+
+    Give it `urls` to read a fixed set of pages in one call: they are fetched
+    concurrently, so the call takes about as long as the slowest page. A page
+    that fails is reported inline instead of failing the whole scrape.
+    """
+
+    urls: Optional[List[str]] = None
+
+    def __init__(self, website_url: Optional[str] = None, urls: Optional[List[str]] = None, **kwargs):
+        super().__init__(website_url=website_url, **kwargs)
+        if urls:
+            self.urls = list(urls)
+            self.description = kwargs.get(
+                "description", f"A tool that can be used to read these pages: {', '.join(self.urls)}."
+            )
+            self.args_schema = FixedScrapeWebsiteToolSchema
+            self._generate_description()
+
+    def _run(self, **kwargs: Any) -> Any:
+        client = shared_client()
+        options = {"headers": self.headers, "cookies": self.cookies or {}}
+        website_url = kwargs.get("website_url", self.website_url)
+        if website_url or not self.urls:
+            return html_to_text(client.get(website_url, **options).content)
+        pages = []
+        for url, response in zip(self.urls, client.fetch_many(self.urls, **options)):
+            if isinstance(response, Exception):
+                body = f"(could not be read: {response})"
+            elif response.status_code >= 400:
+                body = f"(could not be read: HTTP {response.status_code})"
+            else:
+                body = html_to_text(response.content)
+            pages.append(f"## {url}\n{body}")
+        return "\n\n".join(pages)
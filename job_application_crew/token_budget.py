@@ -0,0 +1,168 @@
+"""
+Token counting, extractive context compaction and the per-task token ledger.
+
+`budgeted_task.BudgetedTask` is a drop-in crewai Task that records, for every run:
+
+  prompt       the task description, expected output and agent persona
+  context      upstream task output handed to this task (before and after compaction)
+  tool_output  everything the task's tools returned
+  completion   the task's final answer
+  llm_*        what the LLM calls actually consumed (crewai's token counter)
+
+When `context_budget` is set and the context is over it, the context is
+compacted extractively first: the sentences that best cover the context's
+own key terms and the task description are kept, in their original order,
+until the budget is used. Records go to `ledger`; its stats are in /stats.
+This module doesn't import crewai, so main.py can report the ledger.
+
+Token counts use tiktoken's cl100k_base when it is available locally and
+otherwise estimate four characters per token.
+"""
+import contextvars
+import functools
+import logging
+import math
+import re
+import threading
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9'’-]*")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=\S)")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in into is it its of on or our that the their "
+    "this to was we were will with you your".split()
+)
+
+
+# ── Counting ───────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.info("tiktoken unavailable (%s); estimating tokens from characters", e)
+        return None
+
+
+def count_tokens(text: Optional[str]) -> int:
+    if not text:
+        return 0
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(str(text), disallowed_special=()))
+    return math.ceil(len(str(text)) / 4)
+
+
+# ── Compaction ─────────────────────────────────────────────────────
+def _units(text: str) -> List[tuple]:
+    """(line number, sentence) pairs; headings, bullets and short lines stay whole."""
+    units = []
+    for number, line in enumerate(text.split("\n")):
+        if not line.strip():
+            continue
+        if line.lstrip().startswith(("#", "-", "*", "•")) or len(line) < 200:
+            units.append((number, line))
+        else:
+            units += [(number, sentence) for sentence in _SENTENCE_END.split(line)]
+    return units
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD.findall(text.casefold()) if word not in _STOPWORDS and len(word) > 2]
+
+
+def compact(text: str, budget: int, query: str = "") -> str:
+    """
+    Shrink `text` to about `budget` tokens by keeping its most informative
+    sentences verbatim. Sentences are scored by how many of the text's
+    frequent terms and the `query`'s terms they cover. Headings and the first
+    sentence of each paragraph get a bonus, since they carry its structure.
+    """
+    if count_tokens(text) <= budget:
+        return text
+    units = _units(text)
+    frequency = Counter(term for _, unit in units for term in set(_terms(unit)))
+    wanted = set(_terms(query))
+    first_in_line = {number: i for i, (number, _) in reversed(list(enumerate(units)))}
+
+    def score(i: int) -> float:
+        number, unit = units[i]
+        terms = set(_terms(unit))
+        value = sum(math.log1p(frequency[term]) + (2.0 if term in wanted else 0.0) for term in terms)
+        value /= math.sqrt(len(terms) + 1)
+        if unit.lstrip().startswith("#"):
+            value += 3.0
+        elif first_in_line[number] == i:
+            value += 1.0
+        return value
+
+    kept, used = set(), 0
+    for i in sorted(range(len(units)), key=score, reverse=True):
+        cost = count_tokens(units[i][1]) + 1
+        if used + cost > budget:
+            continue
+        kept.add(i)
+        used += cost
+
+    lines: List[str] = []
+    previous_line = None
+    for i in sorted(kept):
+        number, unit = units[i]
+        if number == previous_line:
+            lines[-1] += " " + unit.strip()
+        else:
+            lines.append(unit)
+        previous_line = number
+    return "\n".join(lines)
+
+
+# ── Ledger ─────────────────────────────────────────────────────────
+class TokenLedger:
+    """Recent per-task token records plus running totals per task name."""
+
+    FIELDS = (
+        "prompt_tokens",
+        "context_tokens_before",
+        "context_tokens",
+        "tool_output_tokens",
+        "completion_tokens",
+        "llm_prompt_tokens",
+        "llm_completion_tokens",
+    )
+
+    def __init__(self, max_records: int = 200):
+        self._records: deque = deque(maxlen=max_records)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._records.append(entry)
+            totals = self._totals.setdefault(entry["task"], {"runs": 0, "compactions": 0, "over_budget": 0})
+            totals["runs"] += 1
+            totals["compactions"] += int(entry["compacted"])
+            totals["over_budget"] += int(bool(entry["budget"]) and entry["context_tokens"] > entry["budget"])
+            for field in self.FIELDS:
+                totals[field] = totals.get(field, 0) + entry[field]
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records)[-limit:]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Totals per task name."""
+        with self._lock:
+            return {task: dict(totals) for task, totals in self._totals.items()}
+
+
+ledger = TokenLedger()
+
+# The record of the task running in this context; tool wrappers add to it
+current_entry: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "token_budget_entry", default=None
+)
@@ -1,12 +1,15 @@
 from crewai import Agent, Task, Crew
 import os
 from utils import get_openai_api_key
+from llm_cache import chat_model, install_llm_cache
 import argparse
 from rich.console import Console
 from rich.markdown import Markdown
 
 openai_api_key = get_openai_api_key()
 os.environ["OPENAI_MODEL_NAME"] = 'gpt-3.5-turbo'
+# Opt-in completion cache (LLM_CACHE_MODE=read-through / record / replay)
+install_llm_cache()
 
 ## ── parse the topic from the CLI ───────────────────────────────
 parser = argparse.ArgumentParser(
@@ -22,6 +25,7 @@ console = Console()
 
 planner = Agent(
   role="LinkedIn Content Planner",
+  llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
   goal=(
       "Outline an engaging LinkedIn post for '{topic}', "
       "including a one-sentence hook, 3–5 mini-paragraphs or bullets, "
@@ -38,6 +42,7 @@ planner = Agent(
 
 writer = Agent(
   role="LinkedIn Content Writer",
+  llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
   goal=(
       "Write a concise, <1300-char LinkedIn post on '{topic}' "
       "with a strong opening hook, 1–2 line paragraphs, "
@@ -54,6 +59,7 @@ writer = Agent(
 
 editor = Agent(
   role="LinkedIn Post Editor",
+  llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
   goal=(
       "Polish the draft to ensure it follows LinkedIn best practices: "
       "hook first, 1–2 line paragraphs, correct emoji placement, "
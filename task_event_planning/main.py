@@ -1,21 +1,27 @@
 from crewai import Agent, Crew, Task
 import os
 from utils import get_openai_api_key, get_serper_api_key
+from llm_cache import chat_model, install_llm_cache
 from crewai_tools import ScrapeWebsiteTool, SerperDevTool
+from search_cache import cached_search
 from pydantic import BaseModel
 
 openai_api_key = get_openai_api_key()
 os.environ["OPENAI_MODEL_NAME"] = 'gpt-3.5-turbo'
 os.environ["SERPER_API_KEY"] = get_serper_api_key()
+# Opt-in completion cache (LLM_CACHE_MODE=read-through / record / replay)
+install_llm_cache()
 
 
 # Initialize the tools
-search_tool = SerperDevTool()
+# Repeated venue/caterer queries are served from the search cache (search_cache.py)
+search_tool = cached_search(SerperDevTool())
 scrape_tool = ScrapeWebsiteTool()
 
 # Agent 1: Venue Coordinator
 venue_coordinator = Agent(
     role="Venue Coordinator",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Identify and book an appropriate venue "
     "based on event requirements",
     tools=[search_tool, scrape_tool],
@@ -32,6 +38,7 @@ venue_coordinator = Agent(
  # Agent 2: Logistics Manager
 logistics_manager = Agent(
     role='Logistics Manager',
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal=(
         "Manage all logistics for the event "
         "including catering and equipment"
@@ -49,6 +56,7 @@ logistics_manager = Agent(
 # Agent 3: Marketing and Communications Agent
 marketing_communications_agent = Agent(
     role="Marketing and Communications Agent",
+    llm=chat_model(model=os.environ["OPENAI_MODEL_NAME"]),
     goal="Effectively market the event and "
          "communicate with participants",
     tools=[search_tool, scrape_tool],
@@ -0,0 +1,210 @@
+"""
+Shared cache for web search tools (SerperDevTool and friends).
+
+Queries are normalized for case, punctuation and whitespace only, so "What
+is the AAPL stock price?" and "what is the  aapl stock price" share one
+entry. Every word is kept, in order: "which plans include OneAPI" and
+"plans include OneAPI" are different searches, as are "flights NYC to LA"
+and "flights LA to NYC".
+Results are stored with a TTL in SQLite, in memory by default or on disk so
+repeated runs of the same crew reuse earlier searches. Identical queries that
+arrive while one is already in flight wait for it instead of calling the
+search API again.
+
+Settings (read by `install_search_cache`):
+  SEARCH_CACHE_BACKEND       memory (default), disk or off
+  SEARCH_CACHE_PATH          .cache/search_results.sqlite3 (disk backend)
+  SEARCH_CACHE_TTL_SECONDS   6 hours by default
+  SEARCH_CACHE_MAX_ENTRIES   5000
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+from tool_wrappers import wrap_tool_run
+
+BACKENDS = ("memory", "disk", "off")
+
+_WORD = re.compile(r"[\w$%.&+'-]+")
+
+
+def normalize_query(query: str) -> str:
+    """Fold case, punctuation and whitespace; keeps tickers like $aapl and figures like 3.5%."""
+    text = unicodedata.normalize("NFKC", str(query)).casefold().replace("’", "'")
+    words = (word.strip(".-'") for word in _WORD.findall(text))
+    return " ".join(word for word in words if word)
+
+
+class SearchCache:
+    """TTL + LRU cache of search results with in-flight deduplication."""
+
+    def __init__(self, path: str = ":memory:", ttl_seconds: float = 6 * 3600, max_entries: int = 5000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.errors = 0
+        self.evictions = 0
+        directory = os.path.dirname(path) if path != ":memory:" else ""
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches ("
+                " key TEXT PRIMARY KEY, query TEXT, stored_at REAL, accessed_at REAL, value TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS searches_lru ON searches (accessed_at)")
+
+    @staticmethod
+    def key(scope: str, query: str) -> str:
+        return hashlib.sha256(f"{scope}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+    def _get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT stored_at, value FROM searches WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.ttl_seconds and now - row[0] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM searches WHERE key = ?", (key,))
+                self.expired += 1
+                row = None
+            if row is not None:
+                self._conn.execute("UPDATE searches SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[1]) if row is not None else None
+
+    def _set(self, key: str, query: str, value: Any) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?)", (key, query, now, now, json.dumps(value))
+            )
+            self.evictions += self._conn.execute(
+                "DELETE FROM searches WHERE key IN ("
+                " SELECT key FROM searches ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+
+    def fetch(self, scope: str, query: str, search) -> Any:
+        """
+        Return the cached result for `query`, or run `search()` once for it.
+        Concurrent callers with the same key share that one call; failures and
+        non-text results (Serper's error payloads) are not cached.
+        """
+        key = self.key(scope, query)
+        value = self._get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        with self._lock:
+            pending = self._inflight.get(key)
+            leader = pending is None
+            if leader:
+                pending = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return pending.result()
+        try:
+            # A previous leader may have stored the result since our lookup
+            value = self._get(key)
+            if value is None:
+                value = search()
+                if isinstance(value, str):
+                    self._set(key, query, value)
+        except BaseException as e:
+            self.errors += 1
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+            inflight = len(self._inflight)
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "path": self.path,
+            "entries": entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "in_flight": inflight,
+            "expired": self.expired,
+            "errors": self.errors,
+            "evictions": self.evictions,
+            # Coalesced lookups didn't call the search API either
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# ── Tool wrapper ───────────────────────────────────────────────────
+_search_cache: Optional[SearchCache] = None
+_install_lock = threading.Lock()
+
+
+def install_search_cache() -> Optional[SearchCache]:
+    """The process-wide cache from the SEARCH_CACHE_* settings; None when "off"."""
+    global _search_cache
+    with _install_lock:
+        if _search_cache is not None:
+            return _search_cache
+        backend = os.getenv("SEARCH_CACHE_BACKEND", "memory").strip().lower() or "memory"
+        if backend not in BACKENDS:
+            raise RuntimeError(f"Unknown SEARCH_CACHE_BACKEND {backend!r} (expected memory, disk or off)")
+        if backend == "off":
+            return None
+        _search_cache = SearchCache(
+            path=os.getenv("SEARCH_CACHE_PATH", ".cache/search_results.sqlite3") if backend == "disk" else ":memory:",
+            ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL_SECONDS", 6 * 3600)),
+            max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 5000)),
+        )
+        return _search_cache
+
+
+def search_cache_stats() -> Optional[Dict[str, Any]]:
+    return _search_cache.stats() if _search_cache is not None else None
+
+
+def cached_search(tool, query_arg: str = "search_query"):
+    """
+    Route a search tool's `_run` through the shared cache and return the tool.
+    Entries are scoped by tool class, endpoint and result count, so two
+    differently configured tools never share results.
+    """
+    cache = install_search_cache()
+    if cache is None or getattr(tool, "_search_cached", False):
+        return tool
+    scope = "|".join(
+        str(part) for part in (type(tool).__name__, getattr(tool, "search_url", ""), getattr(tool, "n_results", ""))
+    )
+
+    def cached(run):
+        def cached_run(*args, **kwargs):
+            query = kwargs.get(query_arg, args[0] if args else None)
+            if not isinstance(query, str) or not normalize_query(query):
+                return run(*args, **kwargs)
+            return cache.fetch(scope, query, lambda: run(*args, **kwargs))
+
+        return cached_run
+
+    wrap_tool_run(tool, cached, "_search_cached")
+    return tool